@@ -0,0 +1,183 @@
+"""
+逐行循环实现，仅作为基准测试的对照组
+
+除 strategy_loop 外，这些函数保留了重构前 add_investment_column.py、add_3x_leverage.py、
+plot_comprehensive_chart.py 和 demo/tools.py 中的循环写法，用来衡量向量化后的加速比。
+strategy_loop 不是原有代码：策略回测没有重构前的版本，它是为了对照
+fincurve.strategy 而按原脚本 groupby + df.loc 的风格新写的逐行实现。
+"""
+from datetime import timedelta
+
+import pandas as pd
+
+
+def dca_loop(df, monthly_investment=1000.0, target_day=26):
+    # add_investment_column.py 原先的 groupby + iterrows + df.loc 定投循环（原样保留，只把参数提出来）
+    df = df.copy()
+
+    # 添加年月列用于分组
+    df['year_month'] = df['date'].dt.to_period('M')
+
+    # 初始化投资相关列
+    df['monthly_investment'] = 0.0  # 当月投资金额
+    df['shares_bought'] = 0.0       # 当月购买股数
+    df['cumulative_investment'] = 0.0  # 累计投资总额
+    df['cumulative_shares'] = 0.0      # 累计持有股数
+    df['portfolio_value'] = 0.0        # 投资组合价值
+
+    # 处理每个月的定投
+    cumulative_investment = 0.0
+    cumulative_shares = 0.0
+
+    # 按年月分组处理
+    for year_month, group in df.groupby('year_month'):
+        # 找到该月26号或之后的第一个交易日
+        month_data = group.sort_values('date')
+
+        # 寻找26号或之后的第一个交易日
+        investment_day = None
+        for _, row in month_data.iterrows():
+            if row['date'].day >= target_day:
+                investment_day = row.name
+                break
+
+        # 如果该月没有26号之后的交易日，取该月最后一个交易日
+        if investment_day is None:
+            investment_day = month_data.index[-1]
+
+        # 在投资日进行定投
+        investment_price = df.loc[investment_day, 'close']
+        shares_to_buy = monthly_investment / investment_price
+
+        # 更新累计数据
+        cumulative_investment += monthly_investment
+        cumulative_shares += shares_to_buy
+
+        # 更新该月投资日的数据
+        df.loc[investment_day, 'monthly_investment'] = monthly_investment
+        df.loc[investment_day, 'shares_bought'] = shares_to_buy
+
+        # 更新该月所有交易日的累计数据和投资组合价值
+        for idx in month_data.index:
+            if idx <= investment_day:
+                # 投资日及之前的日期
+                if idx == investment_day:
+                    df.loc[idx, 'cumulative_investment'] = cumulative_investment
+                    df.loc[idx, 'cumulative_shares'] = cumulative_shares
+                else:
+                    # 投资日之前，使用上月的累计数据
+                    df.loc[idx, 'cumulative_investment'] = cumulative_investment - monthly_investment
+                    df.loc[idx, 'cumulative_shares'] = cumulative_shares - shares_to_buy
+            else:
+                # 投资日之后的日期，使用当月投资后的累计数据
+                df.loc[idx, 'cumulative_investment'] = cumulative_investment
+                df.loc[idx, 'cumulative_shares'] = cumulative_shares
+
+            # 计算投资组合价值
+            df.loc[idx, 'portfolio_value'] = df.loc[idx, 'cumulative_shares'] * df.loc[idx, 'close']
+    return df
+
+
+def leverage_loop(df, leverage=3.0):
+    # add_3x_leverage.py 原先的 3x_close 逐行递推
+    df = df.copy()
+    df['3x_return_pct'] = df['涨跌幅(%)'] * leverage
+    df['3x_close'] = 0.0
+    df.loc[0, '3x_close'] = df.loc[0, 'close']
+    for i in range(1, len(df)):
+        if pd.notna(df.loc[i, '3x_return_pct']):
+            df.loc[i, '3x_close'] = df.loc[i - 1, '3x_close'] * (1 + df.loc[i, '3x_return_pct'] / 100)
+        else:
+            df.loc[i, '3x_close'] = df.loc[i - 1, '3x_close']
+    return df
+
+
+def calculate_max_drawdown(values):
+    # plot_comprehensive_chart.py 原先的 expanding().max() 回撤
+    peak = values.expanding().max()
+    drawdown = (values - peak) / peak
+    return drawdown.min() * 100
+
+
+def date_gaps_loop(dates):
+    # demo/tools.py:check_date_continuity 原先逐对比较并展开每个缺失日期的循环（原样保留）
+    dates = sorted(dates)
+
+    # 检查日期断层
+    missing_dates = []
+    gaps = []
+
+    for i in range(1, len(dates)):
+        current_date = dates[i]
+        previous_date = dates[i-1]
+
+        # 计算日期差
+        date_diff = (current_date - previous_date).days
+
+        # 如果日期差大于1天，说明有断层
+        if date_diff > 1:
+            # 找出缺失的日期
+            missing_start = previous_date + timedelta(days=1)
+            missing_end = current_date - timedelta(days=1)
+
+            gap_info = {
+                'gap_start': previous_date,
+                'gap_end': current_date,
+                'missing_days': date_diff - 1,
+                'missing_dates': []
+            }
+
+            # 生成缺失的日期列表
+            temp_date = missing_start
+            while temp_date <= missing_end:
+                gap_info['missing_dates'].append(temp_date)
+                temp_date += timedelta(days=1)
+
+            gaps.append(gap_info)
+            missing_dates.extend(gap_info['missing_dates'])
+    return gaps, missing_dates
+
+
+def strategy_loop(df, leveraged_close, monthly_investment=1000.0, target_day=26, target_weight=0.5,
+                  stop_drawdown=0.3, defensive_weight=0.0, dip_drawdown=0.2, dip_amount=1000.0):
+    # 为基准测试新写的逐行版本（仿照原脚本 groupby + df.loc 的写法）：再平衡 / 降杠杆 / 下跌加仓策略
+    df = df.copy()
+    df['lev_close'] = leveraged_close
+    df['year_month'] = df['date'].dt.to_period('M')
+    df['portfolio_value'] = 0.0
+    buy_days = set()
+    for year_month, group in df.groupby('year_month'):
+        month_data = group.sort_values('date')
+        investment_day = month_data.index[-1]
+        for idx in month_data.index:
+            if df.loc[idx, 'date'].day >= target_day:
+                investment_day = idx
+                break
+        buy_days.add(investment_day)
+
+    base_shares = lev_shares = 0.0
+    base_peak = lev_peak = 0.0
+    defensive = dipped = False
+    for idx in df.index:
+        b = df.loc[idx, 'close']
+        x = df.loc[idx, 'lev_close']
+        if b > base_peak:
+            base_peak, dipped = b, False
+        lev_peak = max(lev_peak, x)
+        drawdown = 1 - x / lev_peak
+        switched = (not defensive and drawdown >= stop_drawdown) or (defensive and drawdown <= 0)
+        defensive = defensive != switched
+        weight = defensive_weight if defensive else target_weight
+        cash = monthly_investment if idx in buy_days else 0.0
+        if not dipped and 1 - b / base_peak >= dip_drawdown:
+            cash += dip_amount
+            dipped = True
+        if idx in buy_days or switched:
+            total = base_shares * b + lev_shares * x + cash
+            lev_shares = total * weight / x
+            base_shares = total * (1 - weight) / b
+        elif cash > 0:
+            lev_shares += cash * weight / x
+            base_shares += cash * (1 - weight) / b
+        df.loc[idx, 'portfolio_value'] = base_shares * b + lev_shares * x
+    return df
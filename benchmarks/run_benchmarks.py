@@ -0,0 +1,185 @@
+"""
+定投、杠杆、回撤和日期检查热点路径的基准测试
+
+在本地生成 1k / 10k / 100k / 1M 行的合成行情（不访问网络），
+分别记录向量化实现和原逐行实现（benchmarks/legacy.py）的耗时与峰值内存，
+结果写成 JSON，便于在不同提交之间比较。
+
+用法:
+    python benchmarks/run_benchmarks.py
+    python benchmarks/run_benchmarks.py --sizes 1000 10000 --output before.json
+    python benchmarks/run_benchmarks.py --compare before.json
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'demo'))
+
+import legacy  # noqa: E402
+from fincurve.dca import simulate_dca  # noqa: E402
+from fincurve.leverage import leveraged_close  # noqa: E402
+from fincurve.stats import StreamingStats  # noqa: E402
+from fincurve.strategy import NUMBA_AVAILABLE, run_strategy  # noqa: E402
+from fincurve.trading_calendar import find_missing_sessions  # noqa: E402
+from tools import check_date_continuity  # noqa: E402
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000, 1_000_000]
+DEFAULT_OUTPUT = os.path.join(ROOT, 'benchmarks', 'results', 'latest.json')
+
+# 原逐行实现太慢，只在较小的数据量上运行
+LEGACY_MAX_ROWS = {
+    'dca.legacy_loop': 10_000,
+    'leverage.legacy_loop': 10_000,
+    'calendar.legacy_loop': 100_000,
+    'strategy.legacy_loop': 10_000,
+}
+
+
+def synthetic_prices(rows, seed=0):
+    """
+    生成合成日线行情：工作日日期、几何布朗运动收盘价，并随机删掉少量交易日制造断层
+    """
+    rng = np.random.default_rng(seed)
+    start = np.datetime64('2000-01-03')
+    days = np.arange(start, start + int(rows * 1.5) + 10, dtype='datetime64[D]')
+    days = days[np.is_busday(days)]
+    days = np.delete(days, rng.choice(len(days), max(1, len(days) // 1000), replace=False))[:rows]
+
+    # 对数收益率零漂移，1M 行时3倍杠杆路径也不会溢出或下溢
+    log_returns = rng.normal(0.0, 0.013, rows)
+    close = 100 * np.exp(np.cumsum(log_returns))
+    df = pd.DataFrame({'date': pd.to_datetime(days), 'close': close})
+    df['涨跌幅(%)'] = df['close'].pct_change() * 100
+    return df
+
+
+def build_cases(df, csv_path):
+    dates = df['date'].to_numpy().astype('datetime64[D]')
+    close = df['close'].to_numpy()
+    returns = df['涨跌幅(%)'].to_numpy()
+    date_objects = list(pd.DatetimeIndex(df['date']).date)
+    leveraged = leveraged_close(returns, close[0], 3.0)
+    strategy = {'target_weight': 0.5, 'stop_drawdown': 0.3, 'dip_drawdown': 0.2, 'dip_amount': 1000.0}
+
+    def streaming_drawdown():
+        stats = StreamingStats()
+        stats.update_many(close, dates)
+        return stats.max_drawdown
+
+    return {
+        'dca.simulate_dca': lambda: simulate_dca(close, dates),
+        'dca.legacy_loop': lambda: legacy.dca_loop(df),
+        'leverage.leveraged_close': lambda: leveraged_close(returns, close[0], 3.0),
+        'leverage.legacy_loop': lambda: legacy.leverage_loop(df),
+        'drawdown.streaming': streaming_drawdown,
+        'drawdown.legacy_expanding': lambda: legacy.calculate_max_drawdown(df['close']),
+        'calendar.find_missing_sessions': lambda: find_missing_sessions(dates),
+        'calendar.check_date_continuity': lambda: check_date_continuity(csv_path),
+        'calendar.legacy_loop': lambda: legacy.date_gaps_loop(date_objects),
+        'strategy.run_strategy': lambda: run_strategy(close, leveraged, dates, **strategy),
+        'strategy.legacy_loop': lambda: legacy.strategy_loop(df, leveraged),
+    }
+
+
+def measure(func, repeat):
+    # 先单独测一次峰值内存，再多次计时取最小值，避免 tracemalloc 影响计时
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return {'seconds': min(times), 'mean_seconds': float(np.mean(times)),
+            'peak_bytes': peak, 'repeat': repeat}
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(sizes, repeat, only=None):
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in sizes:
+            df = synthetic_prices(rows)
+            csv_path = os.path.join(tmp, f'synthetic_{rows}.csv')
+            df.to_csv(csv_path, index=False)
+            for name, func in build_cases(df, csv_path).items():
+                if only and not any(name.startswith(prefix) for prefix in only):
+                    continue
+                if rows > LEGACY_MAX_ROWS.get(name, rows):
+                    continue
+                # 慢的对照组只跑一次
+                result = measure(func, 1 if name in LEGACY_MAX_ROWS else repeat)
+                result.update({'case': name, 'rows': rows,
+                               'rows_per_second': rows / result['seconds'] if result['seconds'] else None})
+                results.append(result)
+                print(f"{name:36s} {rows:>9,d} 行  {result['seconds'] * 1000:10.2f} ms  "
+                      f"峰值内存 {result['peak_bytes'] / 1e6:8.2f} MB")
+    return results
+
+
+def compare(previous_path, results):
+    with open(previous_path, encoding='utf-8') as f:
+        previous = {(r['case'], r['rows']): r for r in json.load(f)['results']}
+    print(f"\n与 {previous_path} 对比（>1 表示变快）:")
+    for result in results:
+        old = previous.get((result['case'], result['rows']))
+        if old:
+            print(f"{result['case']:36s} {result['rows']:>9,d} 行  "
+                  f"{old['seconds'] / result['seconds']:8.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='热点路径基准测试')
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help='合成数据行数')
+    parser.add_argument('--repeat', type=int, default=5, help='计时重复次数（取最小值）')
+    parser.add_argument('--only', nargs='+', help='只运行名称以这些前缀开头的用例，例如 dca leverage')
+    parser.add_argument('--output', default=DEFAULT_OUTPUT, help='结果 JSON 路径')
+    parser.add_argument('--compare', help='与之前的结果 JSON 对比')
+    args = parser.parse_args()
+
+    results = run(args.sizes, args.repeat, args.only)
+    report = {
+        'created': datetime.datetime.now().isoformat(timespec='seconds'),
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'numba': NUMBA_AVAILABLE,
+        'machine': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'results': results,
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\n结果已保存到 {args.output}")
+
+    if args.compare:
+        compare(args.compare, results)
+
+
+if __name__ == '__main__':
+    main()
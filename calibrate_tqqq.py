@@ -0,0 +1,45 @@
+import time
+
+import numpy as np
+
+from fincurve import calibrate_leverage, leveraged_close
+from fincurve.calibration import align_closes
+from fincurve.data import read_prices
+from fincurve.quality import repair_prices
+
+
+def main():
+    # 读取数据（日期已转换为datetime格式并按升序排列）
+    # TQQQ 文件 2014-04-16 之前的价格有误（出现负价格），先截掉
+    qqq = read_prices('QQQ_daily.csv')
+    tqqq, _ = repair_prices(read_prices('TQQQ_daily.csv'), start_date='2014-04-16')
+
+    start = time.perf_counter()
+    fit = calibrate_leverage(qqq, tqqq, nominal_leverage=3.0)
+    elapsed = time.perf_counter() - start
+
+    print(f"校准区间: {fit['start_date']} 至 {fit['end_date']}，{fit['n_days']} 个交易日"
+          f"（剔除 {fit['outliers']} 个异常日），用时 {elapsed * 1000:.1f} 毫秒")
+    print(f"有效杠杆倍数: {fit['leverage']:.4f}")
+    print(f"每日费用: {fit['daily_drag'] * 100:.5f}%（年化 {fit['annual_drag_pct']:.2f}%）")
+    print(f"年化跟踪误差: {fit['tracking_error_pct']:.2f}%")
+    print(f"R²: {fit['r_squared']:.5f}")
+    print(f"减法复权价格偏移量: {fit['price_offset']:.4f}")
+
+    # 在共同交易日上比较合成价格与真实 TQQQ 的累计涨幅
+    dates, qqq_close, tqqq_close = align_closes(qqq, tqqq)
+    returns = np.r_[np.nan, np.diff(qqq_close) / qqq_close[:-1] * 100]
+    actual = tqqq_close + fit['price_offset']
+    years = (dates[-1] - dates[0]).astype(int) / 365.25
+
+    print(f"\n【{dates[0]} 至 {dates[-1]} 累计涨幅对比】")
+    for label, leverage, daily_drag in [('真实 TQQQ', None, None),
+                                        ('合成3倍（无费用）', 3.0, 0.0),
+                                        ('合成（校准后）', fit['leverage'], fit['daily_drag'])]:
+        path = actual if leverage is None else leveraged_close(returns, actual[0], leverage, daily_drag)
+        growth = path[-1] / path[0]
+        print(f"{label:12s} 累计 {growth:8.2f} 倍，年化 {(growth ** (1 / years) - 1) * 100:6.2f}%")
+
+
+if __name__ == '__main__':
+    main()
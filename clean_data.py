@@ -0,0 +1,40 @@
+import os
+import sys
+
+from fincurve.quality import clean_csv
+from fincurve.runner import expand_paths
+
+
+def main():
+    # 用法:
+    #   python clean_data.py                      修复 QQQ_daily_raw.csv 并生成 QQQ_daily.csv
+    #   python clean_data.py "raw/*.csv" clean/   批量修复，结果写到 clean/ 目录（文件名不变）
+    if len(sys.argv) > 2:
+        files = expand_paths(sys.argv[1])
+        output_dir = sys.argv[2]
+        os.makedirs(output_dir, exist_ok=True)
+        jobs = [(path, os.path.join(output_dir, os.path.basename(path)), {}) for path in files]
+    else:
+        # readme: QQQ 在 2011-04-26 之后数据基本正常（之前有多年的断层）
+        jobs = [('QQQ_daily_raw.csv', 'QQQ_daily.csv', {'start_date': '2011-04-26'})]
+
+    for input_path, output_path, params in jobs:
+        report = clean_csv(input_path, output_path, **params)
+        print(f"{input_path} -> {output_path}: "
+              f"{report['rows_in']} 行 -> {report['rows_out']} 行 (截掉前 {report['trimmed']} 行)")
+        if report['missing']:
+            print(f"   价格缺失已删除: {report['missing']} 行")
+        if report['nonpositive']:
+            print(f"   非正价格: {report['nonpositive']} 行")
+        if report['ohlc_inconsistent']:
+            print(f"   OHLC 不一致已修正: {report['ohlc_inconsistent']} 行")
+        if report['return_mismatch']:
+            print(f"   涨跌幅与收盘价不一致已重算: {report['return_mismatch']} 行")
+        for date, factor in report['splits']:
+            print(f"   拆股/合股: {date} 因子 {factor:g}，之前的价格已复权")
+        if report['extreme_returns']:
+            print(f"   异常涨跌幅（未修改）: {', '.join(report['extreme_returns'][:10])}")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,17 +1,25 @@
-import akshare as ak
-import pandas as pd
+import os
+import sys
+
+# 从 demo 目录运行时也能导入上一级的 fincurve 包
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fincurve.fetch import AkshareETFSource, BulkFetcher, FetchCache
+from fincurve.quality import repair_prices
 
 # 1) 东方财富 ETF 历史行情（支持 period="daily"/"weekly"/"monthly"）
 codes = ["159941", "513100"]  # 深市不带后缀；上证代码同样直接填
-frames = {}
 
-for code in codes:
-    df = ak.fund_etf_hist_em(symbol=code, period="monthly", adjust="qfq")  # 前复权月K
-    df.rename(columns={
-        "日期":"date","开盘":"open","收盘":"close","最高":"high","最低":"low",
-        "成交量":"volume","成交额":"amount"
-    }, inplace=True)
-    df["date"] = pd.to_datetime(df["date"])
+# 并发下载（限速、失败重试），结果缓存在本地，重复运行不会重新请求
+fetcher = BulkFetcher(AkshareETFSource(), FetchCache())
+raw_frames, errors = fetcher.fetch_many(codes, period="monthly", adjust="qfq")  # 前复权月K
+for code, error in errors.items():
+    print(f"{code} 下载失败: {error}")
+
+frames = {}
+for code, df in raw_frames.items():
+    # 数据修复：去掉非正价格、修正 OHLC、按收盘价重算涨跌幅
+    df, report = repair_prices(df)
     df.set_index("date", inplace=True)
     frames[code] = df
 
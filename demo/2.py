@@ -1,8 +1,18 @@
-import akshare as ak
+import os
+import sys
+
 import pandas as pd
 
-# stock_us_daily_df = ak.stock_us_daily(symbol="QQQ", adjust="qfq")
-stock_us_daily_df = ak.stock_us_daily(symbol="QQQ", adjust="")
+# 从 demo 目录运行时也能导入上一级的 fincurve 包
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fincurve.fetch import AkshareUSDailySource, BulkFetcher, FetchCache
+from fincurve.quality import clean_csv
+
+# 下载结果缓存在本地，当天重复运行不会重新请求
+fetcher = BulkFetcher(AkshareUSDailySource(), FetchCache())
+# stock_us_daily_df = fetcher.fetch("QQQ", adjust="qfq")
+stock_us_daily_df = fetcher.fetch("QQQ", adjust="")
 
 print(stock_us_daily_df)
 stock_us_daily_df.set_index("date", inplace=True)
@@ -14,4 +24,9 @@ stock_us_daily_df['涨跌幅(%)'] = stock_us_daily_df['close'].pct_change() * 10
 print("\n添加涨跌幅后的数据:")
 print(stock_us_daily_df)
 
-stock_us_daily_df.to_csv("QQQ_daily.csv", encoding="utf-8-sig")
+# 原始数据单独保存，修复后的数据供分析脚本使用
+stock_us_daily_df.to_csv("QQQ_daily_raw.csv", encoding="utf-8-sig")
+
+# 数据修复：2011-04-26 之前有多年断层，截掉后重新计算涨跌幅（第一行不再按被删掉的历史计算）
+report = clean_csv("QQQ_daily_raw.csv", "QQQ_daily.csv", start_date="2011-04-26")
+print(f"\n数据修复: {report['rows_in']} 行 -> {report['rows_out']} 行")
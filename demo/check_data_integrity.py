@@ -1,12 +1,16 @@
-import pandas as pd
+import os
+import sys
+
 from datetime import datetime, timedelta
-import pandas_market_calendars as mcal
 
-# 读取QQQ数据
-df = pd.read_csv('QQQ_daily.csv')
+# 从 demo 目录运行时也能导入上一级的 fincurve 包
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fincurve.data import read_prices
+from fincurve.trading_calendar import find_missing_sessions
 
-# 确保日期列是datetime格式（注意这里使用'date'而不是'Date'）
-df['date'] = pd.to_datetime(df['date'])
+# 读取QQQ数据（经过二进制缓存，日期列已转换为datetime格式）
+df = read_prices('QQQ_daily.csv')
 
 # 获取数据的起始和结束日期
 start_date = df['date'].min()
@@ -15,19 +19,12 @@ end_date = df['date'].max()
 print(f"数据时间范围: {start_date.date()} 到 {end_date.date()}")
 print(f"总记录数: {len(df)}")
 
-# 获取NYSE交易日历
-nyse = mcal.get_calendar('NYSE')
-trading_days = nyse.valid_days(start_date=start_date, end_date=end_date)
-
-# 将交易日转换为set以便快速查找
-trading_days_set = set(trading_days.date)
-data_days_set = set(df['date'].dt.date)
-
-# 检查是否有缺失的交易日
-missing_days = trading_days_set - data_days_set
+# 对照离线缓存的NYSE交易日历检查缺失的交易日（不再每次运行都调用 pandas_market_calendars）
+check = find_missing_sessions(df['date'].to_numpy(), 'NYSE')
+missing_days = check['missing_dates']
 if missing_days:
     print("\n缺失的交易日:")
-    for day in sorted(missing_days):
+    for day in missing_days:
         print(day)
     print(f"\n总共缺失 {len(missing_days)} 个交易日")
 else:
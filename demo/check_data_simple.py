@@ -1,11 +1,16 @@
+import os
+import sys
+
 import pandas as pd
 from datetime import datetime, timedelta
 
-# 读取QQQ数据
-df = pd.read_csv('QQQ_daily.csv')
+# 从 demo 目录运行时也能导入上一级的 fincurve 包
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fincurve.data import read_prices
 
-# 确保日期列是datetime格式
-df['date'] = pd.to_datetime(df['date'])
+# 读取QQQ数据（经过二进制缓存，日期列已转换为datetime格式）
+df = read_prices('QQQ_daily.csv')
 
 # 获取数据的起始和结束日期
 start_date = df['date'].min()
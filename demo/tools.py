@@ -1,8 +1,17 @@
-import pandas as pd
-from datetime import datetime, timedelta
+import os
+import sys
+
+import numpy as np
+
+# 从 demo 目录运行时也能导入上一级的 fincurve 包
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fincurve.data import load_csv
+from fincurve.trading_calendar import find_missing_sessions
 
 def read_data(file_path):
-    return pd.read_csv(file_path)
+    # 经过二进制缓存读取，日期列已解析
+    return load_csv(file_path)
 
 def check_data(data):
     if data is None:
@@ -11,93 +20,62 @@ def check_data(data):
         return False
     return True
 
-def check_date_continuity(file_path, date_column='date'):
+def check_date_continuity(file_path, date_column='date', exchange='NYSE'):
     """
-    检查CSV文件中的日期是否有断层
-    
+    检查CSV文件中的日期是否有断层（对照交易所日历，只报告真正缺失的交易日）
+
+    交易日历离线生成并缓存（见 fincurve.trading_calendar），周末和休市日不算缺失。
+
     Args:
         file_path (str): CSV文件路径
         date_column (str): 日期列名，默认为'date'
-    
+        exchange (str): 交易所日历名称，默认为'NYSE'
+
     Returns:
         dict: 包含检查结果的字典
     """
     try:
-        # 读取数据
-        df = pd.read_csv(file_path)
-        
-        if df.empty:
+        # 经过二进制缓存读取，日期列已解析
+        df = load_csv(file_path, date_column)
+        if date_column not in df.columns:
             return {
                 'status': 'error',
-                'message': '数据文件为空'
+                'message': f'找不到日期列: {date_column}'
             }
-        
-        # 确保日期列存在
-        if date_column not in df.columns:
+
+        if df.empty:
             return {
                 'status': 'error',
-                'message': f'找不到日期列: {date_column}'
+                'message': '数据文件为空'
             }
-        
-        # 转换日期格式
-        df[date_column] = pd.to_datetime(df[date_column])
-        
-        # 按日期排序
-        df = df.sort_values(date_column)
-        
-        # 获取所有日期
-        dates = df[date_column].dt.date.tolist()
-        
-        # 检查日期断层
-        missing_dates = []
-        gaps = []
-        
-        for i in range(1, len(dates)):
-            current_date = dates[i]
-            previous_date = dates[i-1]
-            
-            # 计算日期差
-            date_diff = (current_date - previous_date).days
-            
-            # 如果日期差大于1天，说明有断层
-            if date_diff > 1:
-                # 找出缺失的日期
-                missing_start = previous_date + timedelta(days=1)
-                missing_end = current_date - timedelta(days=1)
-                
-                gap_info = {
-                    'gap_start': previous_date,
-                    'gap_end': current_date,
-                    'missing_days': date_diff - 1,
-                    'missing_dates': []
-                }
-                
-                # 生成缺失的日期列表
-                temp_date = missing_start
-                while temp_date <= missing_end:
-                    gap_info['missing_dates'].append(temp_date)
-                    temp_date += timedelta(days=1)
-                
-                gaps.append(gap_info)
-                missing_dates.extend(gap_info['missing_dates'])
-        
+
+        # 转换为 datetime64[D] 数组
+        dates = np.sort(df[date_column].to_numpy().astype('datetime64[D]'))
+
+        # 向量化检查日期断层
+        check = find_missing_sessions(dates, exchange)
+        gaps = check['gaps']
+
         # 返回检查结果
         result = {
             'status': 'success',
-            'total_records': len(df),
+            'exchange': exchange,
+            'total_records': len(dates),
             'date_range': {
-                'start': dates[0],
-                'end': dates[-1]
+                'start': dates[0].item(),
+                'end': dates[-1].item()
             },
             'has_gaps': len(gaps) > 0,
             'total_gaps': len(gaps),
-            'total_missing_days': len(missing_dates),
+            'total_missing_days': len(check['missing_dates']),
             'gaps': gaps,
-            'missing_dates': missing_dates
+            'missing_dates': check['missing_dates'],
+            'non_session_dates': check['non_session_dates'],
+            'duplicate_dates': check['duplicate_dates']
         }
-        
+
         return result
-        
+
     except Exception as e:
         return {
             'status': 'error',
@@ -119,11 +97,11 @@ def print_date_check_result(result):
     if result['has_gaps']:
         print(f"\n⚠️  发现日期断层:")
         print(f"   断层数量: {result['total_gaps']}")
-        print(f"   缺失天数: {result['total_missing_days']}")
+        print(f"   缺失交易日: {result['total_missing_days']}")
         
         print(f"\n📅 断层详情:")
         for i, gap in enumerate(result['gaps'], 1):
-            print(f"   断层 {i}: {gap['gap_start']} 到 {gap['gap_end']} (缺失 {gap['missing_days']} 天)")
+            print(f"   断层 {i}: {gap['gap_start']} 到 {gap['gap_end']} (缺失 {gap['missing_days']} 个交易日)")
             if len(gap['missing_dates']) <= 10:  # 如果缺失日期不多，显示具体日期
                 print(f"      缺失日期: {', '.join([str(d) for d in gap['missing_dates']])}")
             else:  # 如果缺失日期很多，只显示前几个
@@ -131,3 +109,9 @@ def print_date_check_result(result):
     else:
         print(f"\n✅ 日期连续，无断层")
 
+    if result.get('non_session_dates'):
+        print(f"\n⚠️  有 {len(result['non_session_dates'])} 个日期不是 {result['exchange']} 交易日: "
+              f"{', '.join([str(d) for d in result['non_session_dates'][:10]])}")
+    if result.get('duplicate_dates'):
+        print(f"\n⚠️  发现重复的日期: {', '.join([str(d) for d in result['duplicate_dates'][:10]])}")
+
@@ -0,0 +1,67 @@
+"""
+定投 / 杠杆回测的数值引擎
+
+各脚本（add_investment_column.py、add_3x_leverage.py 等）只负责读写文件和打印，
+计算逻辑都放在这个包里，方便批量复用。
+
+包内名称按需导入：``import fincurve`` 不会加载 pandas / matplotlib，
+第一次访问 ``fincurve.simulate_dca`` 等属性时才导入对应的子模块。
+"""
+import importlib
+
+# 公开名称 -> 所在子模块
+_EXPORTS = {
+    'INVESTMENT_OUTPUT_COLUMNS': 'analysis',
+    'LEVERAGE_OUTPUT_COLUMNS': 'analysis',
+    'add_investment_columns': 'analysis',
+    'add_leverage_columns': 'analysis',
+    'comparison_stats': 'analysis',
+    'calibrate_leverage': 'calibration',
+    'buy_day_indices': 'dca',
+    'simulate_dca': 'dca',
+    'read_prices': 'data',
+    'ResultCache': 'memo',
+    'run_scenario': 'memo',
+    'annual_to_daily_drag': 'leverage',
+    'leveraged_close': 'leverage',
+    'leveraged_growth': 'leverage',
+    'bootstrap_dca': 'montecarlo',
+    'stationary_bootstrap_indices': 'montecarlo',
+    'plot_close': 'plotting',
+    'align_series': 'portfolio',
+    'portfolio_dca': 'portfolio',
+    'plot_comparison': 'plotting',
+    'repair_prices': 'quality',
+    'validate_prices': 'quality',
+    'ReportRenderer': 'render',
+    'decimate_minmax': 'render',
+    'rolling_dca': 'rolling',
+    'StreamingStats': 'stats',
+    'stream_csv_stats': 'stats',
+    'run_strategy': 'strategy',
+    'BacktestService': 'service',
+    'PriceStore': 'store',
+    'TradingDayIndex': 'schedule',
+    'value_averaging': 'schedule',
+    'leverage_sweep': 'sweep',
+    'leveraged_close_matrix': 'sweep',
+    'max_drawdown_rows': 'sweep',
+    'find_missing_sessions': 'trading_calendar',
+    'get_calendar': 'trading_calendar',
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f'.{module_name}', __name__), name)
+    # 缓存到包命名空间，之后的访问不再经过 __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
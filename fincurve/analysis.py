@@ -0,0 +1,111 @@
+"""
+各脚本共用的 DataFrame 级分析函数
+
+这里的函数都是纯函数：输入 DataFrame，返回新的 DataFrame 或 dict，不读写文件。
+"""
+import numpy as np
+
+from . import profiling
+from .dca import simulate_dca
+from .leverage import leveraged_close
+from .stats import StreamingStats
+
+# 原始行情列
+PRICE_COLUMNS = ['date', 'open', 'high', 'low', 'close', 'volume', '涨跌幅(%)']
+
+# 各阶段新增的派生列，紧凑模式下只保存 date + 这些列
+INVESTMENT_DERIVED_COLUMNS = ['investment_total', 'portfolio_value']
+LEVERAGE_DERIVED_COLUMNS = ['3x_return_pct', '3x_close', '3x_portfolio_value']
+
+# add_investment_column.py 的输出列
+INVESTMENT_OUTPUT_COLUMNS = PRICE_COLUMNS + INVESTMENT_DERIVED_COLUMNS
+
+# add_3x_leverage.py 的输出列
+LEVERAGE_OUTPUT_COLUMNS = INVESTMENT_OUTPUT_COLUMNS + LEVERAGE_DERIVED_COLUMNS
+
+
+def add_investment_columns(df, amount=1000.0, day_of_month=26, buy_index=None):
+    """
+    在行情数据上计算按月定投
+
+    Args:
+        df (pd.DataFrame): 按日期升序的行情数据
+        amount (float): 每月投资金额
+        day_of_month (int): 目标定投日
+        buy_index: 预先算好的买入日行号（见 fincurve.schedule），传入时忽略 day_of_month
+
+    Returns:
+        pd.DataFrame: 增加了 monthly_investment、shares_bought、investment_total、
+            cumulative_shares、portfolio_value 列的新 DataFrame
+    """
+    result = simulate_dca(df['close'], df['date'], amount, day_of_month, buy_index)
+    df = df.copy()
+    df['monthly_investment'] = result['monthly_investment']  # 当月投资金额
+    df['shares_bought'] = result['shares_bought']            # 当月购买股数
+    df['investment_total'] = result['investment_total']      # 累计投资总额
+    df['cumulative_shares'] = result['cumulative_shares']    # 累计持有股数
+    df['portfolio_value'] = result['portfolio_value']        # 投资组合价值
+    return df
+
+
+def add_leverage_columns(df, leverage=3.0, amount=1000.0, day_of_month=26, daily_drag=0.0,
+                         buy_index=None):
+    """
+    计算杠杆收盘价以及用杠杆价格定投的结果
+
+    第一天的杠杆收盘价等于原始收盘价，之后按杠杆涨跌幅累乘（涨跌幅缺失时沿用前一天价格）。
+
+    Args:
+        df (pd.DataFrame): 按日期升序、含 close 和 涨跌幅(%) 列的数据
+        leverage (float): 杠杆倍数
+        amount (float): 每月投资金额
+        day_of_month (int): 目标定投日
+        daily_drag (float): 每日费用/融资成本（小数）
+        buy_index: 预先算好的买入日行号（见 fincurve.schedule），传入时忽略 day_of_month
+
+    Returns:
+        pd.DataFrame: 增加了 3x_ 前缀列的新 DataFrame
+    """
+    df = df.copy()
+    df['3x_return_pct'] = df['涨跌幅(%)'] * leverage
+    df['3x_close'] = leveraged_close(df['涨跌幅(%)'], df['close'].iloc[0], leverage, daily_drag)
+
+    result = simulate_dca(df['3x_close'], df['date'], amount, day_of_month, buy_index)
+    df['3x_monthly_investment'] = result['monthly_investment']
+    df['3x_shares_bought'] = result['shares_bought']
+    df['3x_cumulative_investment'] = result['investment_total']
+    df['3x_cumulative_shares'] = result['cumulative_shares']
+    df['3x_portfolio_value'] = result['portfolio_value']
+    return df
+
+
+def comparison_stats(df):
+    """
+    计算原始与杠杆定投的对比统计
+
+    每日定投金额作为资金流入，使波动率和夏普比率不受入金影响。
+
+    Args:
+        df (pd.DataFrame): 与 QQQ_daily_with_3x_leverage.csv 相同列的数据
+
+    Returns:
+        dict: base / leveraged 两组 StreamingStats 结果（另含 total_return），
+            以及 investment_total 和 days
+    """
+    flows = df['investment_total'].diff().fillna(df['investment_total']).to_numpy()
+    total_investment = df['investment_total'].iloc[-1]
+    dates = df['date'].to_numpy().astype('datetime64[D]')
+
+    results = {}
+    for key, column in [('base', 'portfolio_value'), ('leveraged', '3x_portfolio_value')]:
+        stats = StreamingStats()
+        with profiling.stage('analysis.drawdown_stats', rows=len(df)):
+            stats.update_many(df[column].to_numpy(), dates, flows)
+        result = stats.result(base=total_investment)
+        result['total_return'] = result['final_value'] - total_investment
+        result['return_pct'] = (result['final_value'] / total_investment - 1) * 100
+        results[key] = result
+
+    results['investment_total'] = total_investment
+    results['days'] = int((dates[-1] - dates[0]).astype(np.int64))
+    return results
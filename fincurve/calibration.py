@@ -0,0 +1,133 @@
+import numpy as np
+
+from .dca import to_day_array
+
+
+def align_closes(base, leveraged):
+    """
+    取标的和杠杆产品共同的交易日收盘价
+
+    用 np.intersect1d 做一次排序合并，两边的涨跌幅因此覆盖完全相同的区间。
+
+    Args:
+        base: 标的数据，含 date/close 列的 DataFrame 或 (dates, close) 元组
+        leveraged: 杠杆产品数据，格式同上
+
+    Returns:
+        tuple: (dates, base_close, leveraged_close) 三个等长数组
+    """
+    def unpack(item):
+        dates, close = item if isinstance(item, tuple) else (item['date'], item['close'])
+        return to_day_array(dates), np.asarray(close, dtype=np.float64)
+
+    base_days, base_close = unpack(base)
+    lev_days, lev_close = unpack(leveraged)
+    dates, base_index, lev_index = np.intersect1d(base_days, lev_days, return_indices=True)
+    return dates, base_close[base_index], lev_close[lev_index]
+
+
+def _simple_regression(x, y):
+    # 按行对 y = alpha + beta * x 做最小二乘，y 可以是 (k, n) 矩阵，返回 alpha、beta 和残差方差
+    x_mean = x.mean()
+    dx = x - x_mean
+    y_mean = y.mean(axis=-1)
+    beta = (y * dx).sum(axis=-1) / (dx * dx).sum()
+    alpha = y_mean - beta * x_mean
+    residual = y - alpha[..., None] - beta[..., None] * x
+    return alpha, beta, (residual * residual).mean(axis=-1)
+
+
+def estimate_price_offset(base_returns_pct, leveraged_close, max_offset=None, steps=201):
+    """
+    估计杠杆产品价格中的常数偏移量
+
+    akshare 的前复权价格是用减法复权的（价格减去累计分红），杠杆 ETF 多次拆股后
+    早期价格很低，减去分红后收益率会被明显放大，拟合出的杠杆倍数也随之偏大。
+    这里在 [0, max_offset] 上取 steps 个候选偏移量，把它们加回价格后一次性
+    （矩阵形式）对所有候选做线性回归，取残差方差最小的一个。
+
+    Args:
+        base_returns_pct: 标的在共同交易日上的涨跌幅（百分比），长度比价格少1
+        leveraged_close: 杠杆产品在共同交易日上的收盘价
+        max_offset (float): 偏移量搜索上限，默认为价格中位数
+        steps (int): 候选个数
+
+    Returns:
+        float: 残差最小的偏移量
+    """
+    if max_offset is None:
+        max_offset = float(np.median(leveraged_close))
+    offsets = np.linspace(0.0, max_offset, steps)
+    prices = leveraged_close + offsets[:, None]
+    returns = np.diff(prices, axis=1) / prices[:, :-1] * 100
+    _, _, variance = _simple_regression(base_returns_pct, returns)
+    return float(offsets[np.argmin(variance)])
+
+
+def calibrate_leverage(base, leveraged, nominal_leverage=3.0, fit_leverage=True, estimate_offset=True,
+                       outlier_sigma=5.0, start_date=None, periods_per_year=252):
+    """
+    用真实杠杆 ETF 的日收益率拟合合成杠杆模型的参数
+
+    模型与 leveraged_growth 一致：杠杆产品涨跌幅 = leverage × 标的涨跌幅 − 每日费用，
+    即对 r_lev = alpha + beta × r_base 做最小二乘，beta 为有效杠杆倍数，
+    −alpha 为每日费用（包含管理费、融资成本和每日再平衡造成的平均损耗）。
+    先拟合一次，剔除残差超过 outlier_sigma 倍标准差的交易日后再拟合一次。
+
+    Args:
+        base: 标的数据，含 date/close 列的 DataFrame 或 (dates, close) 元组
+        leveraged: 真实杠杆产品数据（如修复后的 TQQQ），格式同上
+        nominal_leverage (float): 名义杠杆倍数，fit_leverage=False 时固定使用
+        fit_leverage (bool): 是否同时拟合有效杠杆倍数
+        estimate_offset (bool): 是否先估计减法复权造成的价格偏移量（见 estimate_price_offset）
+        outlier_sigma (float): 剔除异常交易日的残差阈值，None 表示不剔除
+        start_date: 只使用这一天之后的数据
+        periods_per_year (int): 每年交易日数，用于年化
+
+    Returns:
+        dict: leverage、daily_drag（小数，可直接传给 leveraged_close）、annual_drag_pct、
+            tracking_error_pct（年化残差波动）、r_squared、price_offset、
+            n_days、outliers、start_date、end_date
+    """
+    dates, base_close, lev_close = align_closes(base, leveraged)
+    if start_date is not None:
+        keep = dates >= np.datetime64(start_date, 'D')
+        dates, base_close, lev_close = dates[keep], base_close[keep], lev_close[keep]
+    if len(dates) < 3:
+        raise ValueError('共同交易日太少，无法拟合')
+
+    base_returns = np.diff(base_close) / base_close[:-1] * 100
+    offset = estimate_price_offset(base_returns, lev_close) if estimate_offset else 0.0
+    adjusted = lev_close + offset
+    lev_returns = np.diff(adjusted) / adjusted[:-1] * 100
+
+    def fit(mask):
+        x, y = base_returns[mask], lev_returns[mask]
+        if fit_leverage:
+            alpha, beta, _ = _simple_regression(x, y)
+        else:
+            beta = nominal_leverage
+            alpha = (y - beta * x).mean()
+        return float(alpha), float(beta), y - alpha - beta * x
+
+    mask = np.isfinite(base_returns) & np.isfinite(lev_returns)
+    alpha, beta, residual = fit(mask)
+    if outlier_sigma is not None:
+        inliers = np.abs(residual) <= outlier_sigma * residual.std()
+        mask[np.flatnonzero(mask)[~inliers]] = False
+        alpha, beta, residual = fit(mask)
+
+    y = lev_returns[mask]
+    daily_drag = -alpha / 100
+    return {
+        'leverage': beta,
+        'daily_drag': daily_drag,
+        'annual_drag_pct': (1 - (1 - daily_drag) ** periods_per_year) * 100,
+        'tracking_error_pct': float(residual.std() * np.sqrt(periods_per_year)),
+        'r_squared': float(1 - residual.var() / y.var()),
+        'price_offset': offset,
+        'n_days': int(mask.sum()),
+        'outliers': int(len(mask) - mask.sum()),
+        'start_date': str(dates[0]),
+        'end_date': str(dates[-1]),
+    }
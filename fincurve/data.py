@@ -0,0 +1,253 @@
+import hashlib
+import os
+
+import numpy as np
+import pandas as pd
+
+from . import profiling
+
+# 不同数据源的涨跌幅列名
+RETURN_COLUMNS = ['涨跌幅(%)', '涨跌幅']
+
+# 二进制缓存文件后缀，缓存放在CSV旁边：QQQ_daily.csv -> QQQ_daily.cache.npz
+CACHE_SUFFIX = '.cache.npz'
+
+
+def cache_path(file_path):
+    """
+    返回CSV对应的二进制缓存路径
+    """
+    return os.path.splitext(file_path)[0] + CACHE_SUFFIX
+
+
+def file_digest(file_path):
+    """
+    计算文件内容的 sha1，用于判断缓存是否过期
+    """
+    digest = hashlib.sha1()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _save_cache(df, file_path, stat, digest):
+    arrays = {
+        'columns': np.array(df.columns, dtype=str),
+        'mtime_ns': np.int64(stat.st_mtime_ns),
+        'size': np.int64(stat.st_size),
+        'digest': np.array(digest),
+    }
+    for i, column in enumerate(df.columns):
+        values = df[column]
+        if pd.api.types.is_numeric_dtype(values) or pd.api.types.is_datetime64_any_dtype(values):
+            arrays[f'col_{i}'] = values.to_numpy()
+        else:
+            arrays[f'col_{i}'] = values.to_numpy(dtype=str)
+
+    target = cache_path(file_path)
+    tmp = target + '.tmp'
+    try:
+        with open(tmp, 'wb') as f:
+            np.savez(f, **arrays)
+        os.replace(tmp, target)
+    except OSError:
+        # 目录不可写时直接放弃缓存，不影响读取
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+def _load_cache(file_path, stat):
+    """
+    读取缓存；缓存不存在或已过期时返回 None
+
+    mtime 和文件大小都没变时直接使用缓存；否则比较内容哈希，
+    内容没变（例如只是被 touch 过）仍然可用，并顺便刷新缓存里的 mtime。
+    """
+    target = cache_path(file_path)
+    if not os.path.exists(target):
+        return None
+    try:
+        with np.load(target, allow_pickle=False) as npz:
+            arrays = {key: npz[key] for key in npz.files}
+    except (OSError, ValueError, KeyError):
+        return None
+
+    df = pd.DataFrame({str(name): arrays[f'col_{i}'] for i, name in enumerate(arrays['columns'])})
+    if int(arrays['mtime_ns']) == stat.st_mtime_ns and int(arrays['size']) == stat.st_size:
+        return df
+    digest = file_digest(file_path)
+    if str(arrays['digest']) != digest:
+        return None
+    _save_cache(df, file_path, stat, digest)
+    return df
+
+
+def load_csv(file_path, date_column='date', use_cache=True):
+    """
+    读取CSV，并在旁边维护一份列式二进制缓存
+
+    缓存中数值列为 float64/int64，日期列为 datetime64，
+    再次读取时不需要重新解析文本和日期。源文件 mtime 或内容变化时自动重建。
+
+    Args:
+        file_path (str): CSV文件路径
+        date_column (str): 日期列名，默认为'date'
+        use_cache (bool): 是否使用缓存，默认为True
+
+    Returns:
+        pd.DataFrame: 日期列已转换为datetime格式的数据
+    """
+    stat = os.stat(file_path)
+    if use_cache:
+        with profiling.stage('data.load_cache') as timer:
+            df = _load_cache(file_path, stat)
+            if df is not None:
+                timer.add_rows(len(df))
+                return df
+
+    with profiling.stage('data.read_csv') as timer:
+        df = pd.read_csv(file_path)
+        timer.add_rows(len(df))
+    if date_column in df.columns:
+        with profiling.stage('data.to_datetime', rows=len(df)):
+            df[date_column] = pd.to_datetime(df[date_column])
+    if use_cache:
+        with profiling.stage('data.save_cache', rows=len(df)):
+            _save_cache(df, file_path, stat, file_digest(file_path))
+    return df
+
+
+def read_prices(file_path, date_column='date', use_cache=True):
+    """
+    读取行情CSV，解析日期并按日期升序排列
+
+    Args:
+        file_path (str): CSV文件路径
+        date_column (str): 日期列名，默认为'date'
+        use_cache (bool): 是否使用二进制缓存，默认为True
+
+    Returns:
+        pd.DataFrame: 日期已转换为datetime格式的行情数据
+    """
+    df = load_csv(file_path, date_column, use_cache)
+    return df.sort_values(date_column).reset_index(drop=True)
+
+
+def returns_pct(df):
+    """
+    取出每日涨跌幅（百分比）
+
+    优先使用文件自带的涨跌幅列；没有时按收盘价计算。
+    """
+    for column in RETURN_COLUMNS:
+        if column in df.columns:
+            return df[column].to_numpy(dtype=np.float64)
+    return df['close'].pct_change().to_numpy(dtype=np.float64) * 100
+
+
+def _is_text(values):
+    # pandas 3 的字符串列为 StringDtype，旧版本为 object
+    return pd.api.types.is_string_dtype(values) or pd.api.types.is_object_dtype(values)
+
+
+def downcast_frame(df, float_dtype='float32', max_categories=0.5):
+    """
+    压缩 DataFrame 的内存占用
+
+    浮点列转为 float_dtype（取值全为整数的浮点列按整数处理），整数列缩小到能容纳的最小整数类型，
+    重复值多的字符串列（唯一值占比不超过 max_categories）转为 category；日期列不变。
+
+    Args:
+        df (pd.DataFrame): 原始数据
+        float_dtype (str): 浮点列的目标类型，默认为 float32
+        max_categories (float): 转为 category 的唯一值占比上限
+
+    Returns:
+        pd.DataFrame: 压缩后的新 DataFrame
+    """
+    columns = {}
+    for column in df.columns:
+        values = df[column]
+        if pd.api.types.is_float_dtype(values):
+            # 全是整数的浮点列（如成交量）转为整数，避免 float32 损失精度
+            finite = values.notna().all() and np.isfinite(values).all()
+            if finite and len(values) and (values == np.round(values)).all():
+                values = pd.to_numeric(values.astype(np.int64), downcast='integer')
+            else:
+                values = values.astype(float_dtype)
+        elif pd.api.types.is_integer_dtype(values):
+            values = pd.to_numeric(values, downcast='integer')
+        elif _is_text(values) and values.nunique() <= max_categories * len(values):
+            values = values.astype('category')
+        columns[column] = values
+    return pd.DataFrame(columns, index=df.index)
+
+
+def write_frame(df, file_path, float_format='%.7g'):
+    """
+    按紧凑格式保存 DataFrame，格式由扩展名决定
+
+    .csv 用 float_format 控制浮点位数（默认7位有效数字，与 float32 精度相当），
+    不再输出 60.019999999999996 这样的完整 repr；
+    .npz 为压缩的列式二进制文件，按列原样保存 dtype（如 float32、datetime64）。
+
+    Args:
+        df (pd.DataFrame): 要保存的数据
+        file_path (str): 目标路径（.csv 或 .npz）
+        float_format (str): CSV 的浮点格式
+    """
+    if file_path.endswith('.npz'):
+        arrays = {'columns': np.array(df.columns, dtype=str)}
+        for i, column in enumerate(df.columns):
+            values = df[column]
+            if isinstance(values.dtype, pd.CategoricalDtype) or _is_text(values):
+                arrays[f'col_{i}'] = values.to_numpy(dtype=str)
+            else:
+                arrays[f'col_{i}'] = values.to_numpy()
+        np.savez_compressed(file_path, **arrays)
+    else:
+        df.to_csv(file_path, index=False, float_format=float_format)
+
+
+def read_frame(file_path, date_column='date', float_dtype='float32'):
+    """
+    读取 write_frame 保存的文件，数值列按 float_dtype 加载
+
+    Args:
+        file_path (str): .csv 或 .npz 文件路径
+        date_column (str): 日期列名
+        float_dtype (str): 浮点列的类型，None 表示保持文件中的类型
+
+    Returns:
+        pd.DataFrame: 按日期升序的数据
+    """
+    if file_path.endswith('.npz'):
+        with np.load(file_path, allow_pickle=False) as npz:
+            df = pd.DataFrame({str(name): npz[f'col_{i}'] for i, name in enumerate(npz['columns'])})
+    else:
+        df = load_csv(file_path, date_column)
+    if float_dtype is not None:
+        df = downcast_frame(df, float_dtype)
+    return df.sort_values(date_column).reset_index(drop=True)
+
+
+def read_stages(base_path, *derived_paths, date_column='date', float_dtype='float32'):
+    """
+    读取原始行情，并按日期拼上各阶段只保存派生列的紧凑文件
+
+    Args:
+        base_path (str): 原始行情 CSV，例如 QQQ_daily.csv
+        *derived_paths (str): write_frame 保存的派生列文件（每个都含日期列）
+        date_column (str): 日期列名
+        float_dtype (str): 浮点列的类型，None 表示保持 float64
+
+    Returns:
+        pd.DataFrame: 原始行情列 + 各阶段派生列
+    """
+    df = read_prices(base_path, date_column)
+    if float_dtype is not None:
+        df = downcast_frame(df, float_dtype)
+    for path in derived_paths:
+        df = df.merge(read_frame(path, date_column, float_dtype), on=date_column, how='left')
+    return df
@@ -0,0 +1,122 @@
+import numpy as np
+
+from . import profiling
+
+
+def to_day_array(dates):
+    """
+    把日期序列统一转换为 datetime64[D] 数组
+
+    Args:
+        dates: pandas Series / DatetimeIndex / 字符串列表 / datetime64 数组
+
+    Returns:
+        np.ndarray: datetime64[D] 数组
+    """
+    if hasattr(dates, 'to_numpy'):
+        dates = dates.to_numpy()
+    # 已经是 datetime64[D] 的数组（例如内存映射的视图）不会被复制
+    return np.asarray(dates, dtype='datetime64[D]')
+
+
+def month_bounds(days, groups=None):
+    """
+    找出每个月第一行和最后一行的行号
+
+    Args:
+        days: 升序的 datetime64[D] 数组
+        groups: 可选的分组编号（例如资产编号），与 days 等长且相同分组的行相邻；
+            传入时分组变化处也视为新的一段
+
+    Returns:
+        tuple: (starts, ends) 两个行号数组
+    """
+    months = days.astype('datetime64[M]')
+    changed = months[1:] != months[:-1]
+    if groups is not None:
+        changed |= groups[1:] != groups[:-1]
+    starts = np.flatnonzero(np.r_[True, changed])
+    ends = np.r_[starts[1:], len(days)] - 1
+    return starts, ends
+
+
+def buy_day_indices(dates, day_of_month=26, groups=None):
+    """
+    一次性找出每个月的定投日所在行号
+
+    规则与原脚本一致：取当月 day_of_month 号或之后的第一个交易日，
+    如果当月没有这样的交易日，则取当月最后一个交易日。
+
+    Args:
+        dates: 按升序排列的交易日序列
+        day_of_month (int): 目标定投日，默认为26
+        groups: 可选的分组编号。多个资产的日期首尾相接成一个数组时，
+            传入每行所属的资产编号，即可一次求出所有资产各自的定投日
+
+    Returns:
+        np.ndarray: 每个（分组的）每个月定投日的行号（升序）
+    """
+    days = to_day_array(dates)
+    n = len(days)
+    if n == 0:
+        return np.empty(0, dtype=np.intp)
+    descending = days[1:] < days[:-1]
+    if groups is not None:
+        groups = np.asarray(groups)
+        descending &= groups[1:] == groups[:-1]
+    if np.any(descending):
+        raise ValueError('日期必须按升序排列')
+
+    starts, ends = month_bounds(days, groups)
+    day = (days - days.astype('datetime64[M]').astype('datetime64[D]')).astype(np.int64) + 1
+
+    # 不满足条件的行用 n 占位，分组取最小值即为当月第一个满足条件的行
+    candidates = np.where(day >= day_of_month, np.arange(n), n)
+    first = np.minimum.reduceat(candidates, starts)
+    return np.where(first < n, first, ends)
+
+
+def simulate_dca(prices, dates, amount=1000.0, day_of_month=26, buy_index=None):
+    """
+    向量化的按月定投模拟
+
+    Args:
+        prices: 每个交易日的成交价格（通常为收盘价）
+        dates: 与 prices 对应的升序交易日序列
+        amount: 每次投资金额，默认为1000；也可以是与买入日一一对应的数组
+            （例如价值平均法算出的金额，负数表示卖出）
+        day_of_month (int): 目标定投日，默认为26
+        buy_index: 买入日行号（例如 fincurve.schedule 生成的周定投日），
+            传入时忽略 day_of_month
+
+    Returns:
+        dict: 与 prices 等长的数组，包括
+            monthly_investment, shares_bought, investment_total,
+            cumulative_shares, portfolio_value，以及定投日行号 buy_index
+    """
+    with profiling.stage('dca.simulate', rows=len(dates)):
+        prices = np.asarray(prices, dtype=np.float64)
+        if len(prices) != len(dates):
+            raise ValueError('prices 与 dates 长度不一致')
+        if buy_index is None:
+            buy_index = buy_day_indices(dates, day_of_month)
+        else:
+            buy_index = np.asarray(buy_index, dtype=np.intp)
+
+        monthly_investment = np.zeros(len(prices))
+        monthly_investment[buy_index] = amount
+        shares_bought = np.zeros(len(prices))
+        shares_bought[buy_index] = amount / prices[buy_index]
+
+        # 定投日之前沿用上月累计值，之后为本月更新后的累计值，正好是 cumsum
+        investment_total = np.cumsum(monthly_investment)
+        cumulative_shares = np.cumsum(shares_bought)
+
+        return {
+            'buy_index': buy_index,
+            'monthly_investment': monthly_investment,
+            'shares_bought': shares_bought,
+            'investment_total': investment_total,
+            'cumulative_shares': cumulative_shares,
+            'portfolio_value': cumulative_shares * prices,
+        }
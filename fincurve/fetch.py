@@ -0,0 +1,259 @@
+import abc
+import hashlib
+import http.client
+import json
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+# 东方财富接口的中文列名
+EM_COLUMNS = {
+    '日期': 'date', '开盘': 'open', '收盘': 'close', '最高': 'high', '最低': 'low',
+    '成交量': 'volume', '成交额': 'amount',
+}
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'fincurve', 'fetch')
+
+# 网络/IO 类错误才重试；参数错误等确定性错误重试也不会成功
+RETRY_EXCEPTIONS = (OSError, http.client.HTTPException)
+NO_RETRY_EXCEPTIONS = (FileNotFoundError, IsADirectoryError, PermissionError)
+
+
+class PriceSource(abc.ABC):
+    """
+    行情数据源接口
+
+    子类实现 fetch()，返回至少包含 date/open/high/low/close/volume 列的 DataFrame。
+    name 用于缓存键，rate_group() 用于限速分组。
+    """
+
+    name = 'base'
+
+    @abc.abstractmethod
+    def fetch(self, symbol, period='daily', adjust='', start=None, end=None):
+        """
+        下载单个标的的行情
+        """
+
+    def rate_group(self):
+        """
+        限速分组：同一分组的下载器共享请求配额，默认按数据源名称分组
+        """
+        return self.name
+
+
+class AkshareUSDailySource(PriceSource):
+    """
+    美股日线（ak.stock_us_daily），只支持日线，日期区间在本地截取
+    """
+
+    name = 'akshare_us_daily'
+
+    def fetch(self, symbol, period='daily', adjust='', start=None, end=None):
+        import akshare as ak
+
+        if period != 'daily':
+            raise ValueError('stock_us_daily 只支持日线数据')
+        df = ak.stock_us_daily(symbol=symbol, adjust=adjust)
+        df['date'] = pd.to_datetime(df['date'])
+        return _slice_dates(df, start, end)
+
+
+class AkshareETFSource(PriceSource):
+    """
+    东方财富 ETF 历史行情（ak.fund_etf_hist_em），支持 daily/weekly/monthly
+    """
+
+    name = 'akshare_etf_em'
+
+    def fetch(self, symbol, period='daily', adjust='', start=None, end=None):
+        import akshare as ak
+
+        kwargs = {'symbol': symbol, 'period': period, 'adjust': adjust}
+        if start is not None:
+            kwargs['start_date'] = pd.Timestamp(start).strftime('%Y%m%d')
+        if end is not None:
+            kwargs['end_date'] = pd.Timestamp(end).strftime('%Y%m%d')
+        df = ak.fund_etf_hist_em(**kwargs).rename(columns=EM_COLUMNS)
+        df['date'] = pd.to_datetime(df['date'])
+        return df
+
+
+class LocalCSVSource(PriceSource):
+    """
+    从本地目录读取 <symbol>.csv 的数据源，用于测试和离线运行
+    """
+
+    name = 'local_csv'
+
+    def __init__(self, directory):
+        self.directory = directory
+
+    def rate_group(self):
+        # 不同目录互不影响
+        return f'{self.name}:{os.path.abspath(self.directory)}'
+
+    def fetch(self, symbol, period='daily', adjust='', start=None, end=None):
+        df = pd.read_csv(os.path.join(self.directory, symbol + '.csv'))
+        df['date'] = pd.to_datetime(df['date'])
+        return _slice_dates(df, start, end)
+
+
+def _slice_dates(df, start, end):
+    if start is not None:
+        df = df[df['date'] >= pd.Timestamp(start)]
+    if end is not None:
+        df = df[df['date'] <= pd.Timestamp(end)]
+    return df.reset_index(drop=True)
+
+
+class RateLimiter:
+    """
+    线程安全的令牌桶限速器
+
+    Args:
+        rate (float): 每秒允许的请求数
+        burst (int): 允许的突发请求数
+    """
+
+    def __init__(self, rate, burst=1):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class FetchCache:
+    """
+    按 (数据源, 代码, 周期, 复权方式, 日期区间) 寻址的磁盘缓存
+
+    缓存键取 sha1，文件存放在 <目录>/<前两位>/<sha1>.csv。
+    结束日期为空（取到最新）的请求在 max_age 秒后过期，其余请求永久有效。
+    """
+
+    def __init__(self, directory=DEFAULT_CACHE_DIR, max_age=24 * 3600):
+        self.directory = directory
+        self.max_age = max_age
+
+    @staticmethod
+    def key(source, symbol, period, adjust, start, end):
+        parts = [source, symbol, period, adjust,
+                 None if start is None else str(pd.Timestamp(start).date()),
+                 None if end is None else str(pd.Timestamp(end).date())]
+        return hashlib.sha1(json.dumps(parts).encode('utf-8')).hexdigest()
+
+    def path(self, key):
+        return os.path.join(self.directory, key[:2], key + '.csv')
+
+    def get(self, key, open_ended=False):
+        path = self.path(key)
+        if not os.path.exists(path):
+            return None
+        if open_ended and time.time() - os.path.getmtime(path) > self.max_age:
+            return None
+        df = pd.read_csv(path, float_precision='round_trip')
+        df['date'] = pd.to_datetime(df['date'])
+        return df
+
+    def put(self, key, df):
+        path = self.path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = path + f'.{threading.get_ident()}.tmp'
+        df.to_csv(tmp, index=False)
+        os.replace(tmp, path)
+
+
+class BulkFetcher:
+    """
+    并发批量下载器：线程池 + 按数据源限速 + 重试退避 + 磁盘缓存
+
+    Args:
+        source (PriceSource): 数据源
+        cache (FetchCache): 磁盘缓存，None 表示不使用缓存
+        max_workers (int): 线程数
+        rate (float): 每秒请求数上限，限速分组（source.rate_group()）和 rate 都相同的下载器共享配额
+        retries (int): 网络/IO 错误后的重试次数，其他错误直接抛出
+        backoff (float): 第一次重试前的等待秒数，之后每次翻倍并加随机抖动
+        limiter (RateLimiter): 指定使用的限速器，传入时忽略 rate
+    """
+
+    _limiters = {}
+    _limiters_lock = threading.Lock()
+
+    def __init__(self, source, cache=None, max_workers=8, rate=2.0, retries=3, backoff=1.0, limiter=None):
+        self.source = source
+        self.cache = cache
+        self.max_workers = max_workers
+        self.retries = retries
+        self.backoff = backoff
+        if limiter is None:
+            key = (source.rate_group(), rate)
+            with self._limiters_lock:
+                if key not in self._limiters:
+                    self._limiters[key] = RateLimiter(rate, burst=max(1, int(rate)))
+                limiter = self._limiters[key]
+        self.limiter = limiter
+
+    def fetch(self, symbol, period='daily', adjust='', start=None, end=None):
+        """
+        下载单个标的，优先读取缓存
+
+        Returns:
+            pd.DataFrame: 行情数据
+        """
+        key = None
+        if self.cache is not None:
+            key = FetchCache.key(self.source.name, symbol, period, adjust, start, end)
+            df = self.cache.get(key, open_ended=end is None)
+            if df is not None:
+                return df
+
+        for attempt in range(self.retries + 1):
+            self.limiter.acquire()
+            try:
+                df = self.source.fetch(symbol, period=period, adjust=adjust, start=start, end=end)
+                break
+            except RETRY_EXCEPTIONS as exc:
+                if attempt == self.retries or isinstance(exc, NO_RETRY_EXCEPTIONS):
+                    raise
+                time.sleep(self.backoff * (2 ** attempt) * (1 + random.random()))
+
+        if key is not None:
+            self.cache.put(key, df)
+        return df
+
+    def fetch_many(self, symbols, period='daily', adjust='', start=None, end=None):
+        """
+        并发下载多个标的
+
+        Returns:
+            tuple: (代码 -> DataFrame, 代码 -> 异常) 两个字典，单个标的失败不影响其他标的
+        """
+        frames = {}
+        errors = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            futures = {pool.submit(self.fetch, symbol, period, adjust, start, end): symbol
+                       for symbol in symbols}
+            for future, symbol in futures.items():
+                try:
+                    frames[symbol] = future.result()
+                except Exception as e:
+                    errors[symbol] = e
+        return frames, errors
@@ -0,0 +1,265 @@
+import hashlib
+import io
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from .data import RETURN_COLUMNS, read_prices, returns_pct
+from .analysis import LEVERAGE_OUTPUT_COLUMNS
+from .dca import buy_day_indices, simulate_dca, to_day_array
+from .leverage import leveraged_close
+
+# 输出列与 QQQ_daily_with_3x_leverage.csv 相同
+OUTPUT_COLUMNS = LEVERAGE_OUTPUT_COLUMNS
+
+EMPTY_SNAPSHOT = {
+    'cumulative_investment': 0.0,
+    'cumulative_shares': 0.0,
+    'leveraged_cumulative_shares': 0.0,
+    'leveraged_close': None,
+}
+
+
+def state_path_for(output_path):
+    """
+    返回输出CSV对应的状态文件路径
+    """
+    return output_path + '.state.json'
+
+
+def load_state(state_path):
+    if not os.path.exists(state_path):
+        return None
+    with open(state_path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_state(state, state_path):
+    tmp = state_path + '.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(state, f, ensure_ascii=False, indent=2)
+    os.replace(tmp, state_path)
+
+
+def simulate_block(df, params, snapshot):
+    """
+    从某个月初开始继续模拟定投和杠杆
+
+    Args:
+        df (pd.DataFrame): 从月初开始的行情数据（日期升序）
+        params (dict): leverage, amount, day_of_month, daily_drag
+        snapshot (dict): 该月之前的累计状态，格式同 EMPTY_SNAPSHOT
+
+    Returns:
+        dict: 每列对应的数组，键为 OUTPUT_COLUMNS 中的计算列
+    """
+    dates = to_day_array(df['date'])
+    close = df['close'].to_numpy(dtype=np.float64)
+    returns = returns_pct(df)
+    leverage = params['leverage']
+
+    if snapshot['leveraged_close'] is None:
+        # 从头开始：第一天的杠杆收盘价等于原始收盘价
+        lev_close = leveraged_close(returns, close[0], leverage, params['daily_drag'])
+    else:
+        # 接着上一个交易日的杠杆收盘价继续累乘，第一行的涨跌幅也要计入
+        lev_close = leveraged_close(np.r_[np.nan, returns], snapshot['leveraged_close'],
+                                    leverage, params['daily_drag'])[1:]
+
+    base = simulate_dca(close, dates, params['amount'], params['day_of_month'])
+    lev = simulate_dca(lev_close, dates, params['amount'], params['day_of_month'])
+    cumulative_shares = base['cumulative_shares'] + snapshot['cumulative_shares']
+    lev_shares = lev['cumulative_shares'] + snapshot['leveraged_cumulative_shares']
+
+    return {
+        'investment_total': base['investment_total'] + snapshot['cumulative_investment'],
+        'cumulative_shares': cumulative_shares,
+        'portfolio_value': cumulative_shares * close,
+        '3x_return_pct': returns * leverage,
+        '3x_close': lev_close,
+        '3x_cumulative_shares': lev_shares,
+        '3x_portfolio_value': lev_shares * lev_close,
+        'monthly_investment': base['monthly_investment'],
+    }
+
+
+def _line_digest(line):
+    return hashlib.sha1(line).hexdigest()
+
+
+def read_input_rows(input_path, offset=None):
+    """
+    从字节位置 offset 开始读取行情CSV（表头总是从文件开头读取）
+
+    Args:
+        input_path (str): 行情CSV路径
+        offset (int): 起始字节位置，None 表示表头之后的第一行
+
+    Returns:
+        tuple: (df, lines, starts)。df 的日期已转换为 datetime；lines 为每行的原始字节，
+            starts 为每行在文件中的字节位置。文件不是按日期升序排列或没有涨跌幅列时
+            无法按字节位置续读，此时退回到完整读取并排序，lines 和 starts 为 None
+    """
+    with open(input_path, 'rb') as f:
+        header = f.readline()
+        if offset is None:
+            offset = f.tell()
+        f.seek(offset)
+        data = f.read()
+
+    lines, starts, position = [], [], offset
+    for line in data.splitlines(keepends=True):
+        if line.strip():
+            lines.append(line)
+            starts.append(position)
+        position += len(line)
+
+    df = pd.read_csv(io.BytesIO(header + b''.join(lines)))
+    df['date'] = pd.to_datetime(df['date'])
+    days = to_day_array(df['date'])
+    if (len(df) != len(lines) or np.any(days[1:] <= days[:-1])
+            or not any(column in df.columns for column in RETURN_COLUMNS)):
+        return read_prices(input_path), None, None
+    return df, lines, starts
+
+
+def _state_is_usable(state, params, input_path, output_path):
+    if state is None or state.get('params') != params or state.get('input_offset') is None:
+        return False
+    # 输出文件被其他脚本（如 add_3x_leverage.py）重写后，记录的字节位置不再有效
+    if not os.path.exists(output_path):
+        return False
+    stat = os.stat(output_path)
+    if (stat.st_size, stat.st_mtime_ns) != (state.get('output_size'), state.get('output_mtime_ns')):
+        return False
+    # 行情文件的第一行和当月第一行必须与上次相同，才能从记录的位置续读
+    with open(input_path, 'rb') as f:
+        f.readline()
+        if _line_digest(f.readline()) != state.get('input_first_line'):
+            return False
+        f.seek(state['input_offset'])
+        return _line_digest(f.readline()) == state.get('input_month_line')
+
+
+def update_leverage_csv(input_path, output_path, leverage=3.0, amount=1000.0,
+                        day_of_month=26, daily_drag=0.0, full=False):
+    """
+    增量更新定投 + 杠杆结果CSV
+
+    状态文件（<输出文件>.state.json）记录最后处理的日期、当月是否已定投、
+    累计股数、累计投资和最后的杠杆收盘价，以及当月第一行在行情文件和输出文件中的
+    字节位置。
+
+    每次只需要从当月月初开始重新计算：定投日规则（26号之后第一个交易日，
+    没有则取月末）在月份结束前可能变化，所以当月已写出的行会被截断重写，
+    更早的行不再读取或改动。行情文件也只从当月第一行的字节位置开始读取，
+    整体开销为 O(新增行数 + 一个月)。
+
+    输出文件的大小或修改时间与上次记录不同（例如被 add_3x_leverage.py 重写），
+    或行情文件的第一行、当月第一行有变化时，自动全量重建。
+    其他位置的历史修订无法检测，请使用 full=True 全量重建。
+
+    Args:
+        input_path (str): 行情CSV路径（如 QQQ_daily.csv）
+        output_path (str): 输出CSV路径
+        leverage (float): 杠杆倍数
+        amount (float): 每月投资金额
+        day_of_month (int): 目标定投日
+        daily_drag (float): 每日费用/融资成本（小数）
+        full (bool): 是否强制全量重建
+
+    Returns:
+        dict: 新增行数 new_rows、是否全量重建 rebuilt，以及最新状态 state
+    """
+    params = {'leverage': leverage, 'amount': amount,
+              'day_of_month': day_of_month, 'daily_drag': daily_drag}
+    state_path = state_path_for(output_path)
+    state = None if full else load_state(state_path)
+
+    rebuilt = not _state_is_usable(state, params, input_path, output_path)
+    if rebuilt:
+        block, lines_in, starts = read_input_rows(input_path)
+        snapshot = dict(EMPTY_SNAPSHOT)
+        offset = 0
+        new_rows = len(block)
+        first_date = str(to_day_array(block['date'][:1])[0])
+        first_line = None if lines_in is None else _line_digest(lines_in[0])
+    else:
+        # 从当月第一行开始读取行情
+        block, lines_in, starts = read_input_rows(input_path, state['input_offset'])
+        if starts is None:
+            return update_leverage_csv(input_path, output_path, leverage, amount, day_of_month,
+                                       daily_drag, full=True)
+        new_rows = int(np.count_nonzero(to_day_array(block['date']) > np.datetime64(state['last_date'], 'D')))
+        if new_rows == 0:
+            return {'new_rows': 0, 'rebuilt': False, 'state': state}
+        snapshot = state['snapshot']
+        offset = state['output_offset']
+        first_date = state['first_date']
+        first_line = state['input_first_line']
+
+    result = simulate_block(block, params, snapshot)
+
+    out = block[[column for column in OUTPUT_COLUMNS[:7] if column in block.columns]].copy()
+    for column in OUTPUT_COLUMNS[7:]:
+        out[column] = result[column]
+
+    text = out.to_csv(index=False, header=rebuilt, lineterminator='\n')
+    lines = [line.encode('utf-8') for line in text.splitlines(keepends=True)]
+    header = b''
+    if rebuilt:
+        header, lines = lines[0], lines[1:]
+        offset = len(header)
+
+    # 最后一个月第一行在 block 中的位置，以及它在输出文件中的字节位置
+    block_dates = to_day_array(block['date'])
+    block_months = block_dates.astype('datetime64[M]')
+    month_row = int(np.searchsorted(block_months, block_months[-1]))
+    month_offset = offset + sum(len(line) for line in lines[:month_row])
+
+    with open(output_path, 'wb' if rebuilt else 'r+b') as f:
+        f.seek(offset)
+        f.truncate()
+        if rebuilt:
+            f.seek(0)
+            f.write(header)
+        f.write(b''.join(lines))
+
+    if month_row > 0:
+        month_snapshot = {
+            'cumulative_investment': float(result['investment_total'][month_row - 1]),
+            'cumulative_shares': float(result['cumulative_shares'][month_row - 1]),
+            'leveraged_cumulative_shares': float(result['3x_cumulative_shares'][month_row - 1]),
+            'leveraged_close': float(result['3x_close'][month_row - 1]),
+        }
+    else:
+        month_snapshot = snapshot
+
+    stat = os.stat(output_path)
+    state = {
+        'params': params,
+        'first_date': first_date,
+        'last_date': str(block_dates[-1]),
+        'month_start': str(block_dates[month_row]),
+        'output_offset': month_offset,
+        'output_size': stat.st_size,
+        'output_mtime_ns': stat.st_mtime_ns,
+        # 行情文件无法按字节位置续读时为 None，下次运行全量重建
+        'input_offset': None if starts is None else starts[month_row],
+        'input_first_line': first_line,
+        'input_month_line': None if lines_in is None else _line_digest(lines_in[month_row]),
+        'snapshot': month_snapshot,
+        # 最后处理日期时的状态，便于查看
+        'last': {
+            'cumulative_investment': float(result['investment_total'][-1]),
+            'cumulative_shares': float(result['cumulative_shares'][-1]),
+            'leveraged_cumulative_shares': float(result['3x_cumulative_shares'][-1]),
+            'leveraged_close': float(result['3x_close'][-1]),
+            # 与 simulate_dca 相同的定投日规则（当月没有目标日之后的交易日时取已有的最后一个交易日）
+            'bought_this_month': len(buy_day_indices(block_dates[month_row:], day_of_month)) > 0,
+        },
+    }
+    save_state(state, state_path)
+    return {'new_rows': new_rows, 'rebuilt': rebuilt, 'state': state}
@@ -0,0 +1,306 @@
+import glob
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from .data import file_digest, read_frame, write_frame
+
+DEFAULT_RESULT_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'fincurve', 'results')
+
+# (路径, mtime_ns, 文件大小) -> sha1，文件没变时不必重新计算哈希
+_digests = {}
+_digests_lock = threading.Lock()
+
+
+def data_fingerprint(*paths):
+    """
+    计算输入文件的内容指纹
+
+    每个文件的 sha1 按 (路径, mtime, 大小) 记在进程内，文件被修改后自动重新计算，
+    所以结果缓存会随 CSV 的变化自动失效。
+
+    Args:
+        *paths (str): 输入文件路径
+
+    Returns:
+        str: 所有文件内容的组合指纹
+    """
+    digests = []
+    for path in paths:
+        stat = os.stat(path)
+        marker = (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+        with _digests_lock:
+            digest = _digests.get(marker)
+        if digest is None:
+            digest = file_digest(path)
+            with _digests_lock:
+                _digests[marker] = digest
+        digests.append(digest)
+    return hashlib.sha1('|'.join(digests).encode('ascii')).hexdigest()
+
+
+def code_fingerprint():
+    """
+    fincurve 包全部源码的指纹
+
+    结果缓存的键包含该指纹，修改计算代码（例如修复 simulate_dca）后旧的磁盘缓存自动失效。
+    """
+    package_dir = os.path.dirname(os.path.abspath(__file__))
+    return data_fingerprint(*sorted(glob.glob(os.path.join(package_dir, '*.py'))))
+
+
+class ResultCache:
+    """
+    计算结果缓存：进程内 LRU + 磁盘
+
+    缓存键由 (数据指纹, 计算名称, 参数, 代码版本) 取 sha1 得到，结果为 DataFrame。
+    代码版本默认为 fincurve 包源码的指纹，代码更新后磁盘上的旧结果不会再被使用。
+    先查进程内 LRU（按 DataFrame 占用字节数限制总大小，超出时淘汰最久未用的），
+    再查磁盘 <目录>/<前两位>/<sha1>.npz；磁盘命中后放回 LRU。
+    磁盘缓存总大小超过 max_disk_bytes 时删除最早写入的文件；总大小只在首次写入时
+    遍历目录统计一次，之后按写入的文件累加，超出上限时才再次遍历清理。
+    其他进程写入的文件不在累加值中，所以每写入 rescan_puts 个文件也会重新遍历一次。
+
+    Args:
+        directory (str): 磁盘缓存目录，None 表示只用进程内缓存
+        max_bytes (int): 进程内缓存的总字节数上限
+        max_disk_bytes (int): 磁盘缓存的总字节数上限，None 表示不限制
+        rescan_puts (int): 每写入多少个文件重新统计一次磁盘占用
+    """
+
+    def __init__(self, directory=DEFAULT_RESULT_DIR, max_bytes=256 * 2 ** 20, max_disk_bytes=2 ** 30,
+                 rescan_puts=100):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self.rescan_puts = rescan_puts
+        self._puts_since_scan = 0
+        self._memory = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+        self._disk_bytes = None
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(fingerprint, name, params, version=None):
+        parts = [fingerprint, name, params, version]
+        return hashlib.sha1(json.dumps(parts, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+    def path(self, key):
+        return os.path.join(self.directory, key[:2], key + '.npz')
+
+    def _remember(self, key, df):
+        size = int(df.memory_usage(deep=True).sum())
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._memory:
+                self._memory_bytes -= self._memory.pop(key)[1]
+            self._memory[key] = (df, size)
+            self._memory_bytes += size
+            while self._memory_bytes > self.max_bytes:
+                _, (_, evicted) = self._memory.popitem(last=False)
+                self._memory_bytes -= evicted
+
+    def get(self, key):
+        """
+        取出缓存的 DataFrame（副本），没有时返回 None
+        """
+        with self._lock:
+            item = self._memory.get(key)
+            if item is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return item[0].copy()
+
+        if self.directory is not None and os.path.exists(self.path(key)):
+            try:
+                df = read_frame(self.path(key), float_dtype=None)
+            except (OSError, ValueError, KeyError):
+                df = None
+            if df is not None:
+                self._remember(key, df)
+                with self._lock:
+                    self.disk_hits += 1
+                return df.copy()
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key, df):
+        """
+        保存结果到进程内缓存和磁盘
+        """
+        self._remember(key, df.copy())
+        if self.directory is None:
+            return
+        path = self.path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = path + f'.{threading.get_ident()}.tmp.npz'
+        try:
+            write_frame(df, tmp)
+            os.replace(tmp, path)
+        except OSError:
+            # 目录不可写时只保留进程内缓存
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            return
+        if self.max_disk_bytes is None:
+            return
+        try:
+            size = os.path.getsize(path)
+        except OSError:
+            size = 0
+        with self._lock:
+            self._puts_since_scan += 1
+            known = self._disk_bytes is not None and self._puts_since_scan < self.rescan_puts
+            if known:
+                self._disk_bytes += size
+            over = not known or self._disk_bytes > self.max_disk_bytes
+        if over:
+            self.prune(self.max_disk_bytes)
+
+    def prune(self, max_bytes):
+        """
+        删除最早写入的磁盘缓存文件，直到总大小不超过 max_bytes
+
+        多个进程同时清理时，已被其他进程删除的文件直接跳过。
+
+        Returns:
+            int: 清理后的总字节数
+        """
+        entries = []
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if name.endswith('.npz') and '.tmp' not in name:
+                    path = os.path.join(root, name)
+                    try:
+                        stat = os.stat(path)
+                    except FileNotFoundError:
+                        continue
+                    entries.append((stat.st_mtime_ns, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+        with self._lock:
+            self._disk_bytes = total
+            self._puts_since_scan = 0
+        return total
+
+    def clear(self):
+        """
+        清空进程内缓存（磁盘缓存保留）
+        """
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+
+    def memoize(self, name, paths, params, compute, version=None):
+        """
+        按 (输入文件指纹, name, params, version) 查缓存，未命中时调用 compute() 并保存
+
+        Args:
+            name (str): 计算名称，不同计算的结果互不混淆
+            paths: 输入文件路径列表，任一文件内容变化后旧结果自动失效
+            params (dict): 影响结果的参数，需可 JSON 序列化（其他类型按 str 处理）
+            compute: 无参函数，返回 DataFrame
+            version (str): 计算代码的版本，None 表示使用 code_fingerprint()
+
+        Returns:
+            pd.DataFrame: 计算结果
+        """
+        if version is None:
+            version = code_fingerprint()
+        key = self.key(data_fingerprint(*paths), name, params, version)
+        df = self.get(key)
+        if df is None:
+            df = compute()
+            self.put(key, df)
+        return df
+
+
+_default_cache = None
+
+
+def default_cache():
+    """
+    进程内共享的默认结果缓存
+    """
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = ResultCache()
+    return _default_cache
+
+
+def run_scenario(file_path, leverage=3.0, amount=1000.0, day_of_month=26, daily_drag=0.0,
+                 start_date=None, end_date=None, schedule=None, cache=None):
+    """
+    带缓存的 QQQ / 杠杆定投对比情景
+
+    等价于 add_investment_column.py -> add_3x_leverage.py 两步的计算结果，
+    按 (CSV 内容, 杠杆倍数, 定投金额, 定投日规则, 日期区间, 每日费用) 缓存。
+    同一情景重复调用（包括参数扫描中重叠的情景）直接返回缓存结果，
+    CSV 被修改后自动重新计算。
+
+    Args:
+        file_path (str): 行情 CSV，例如 QQQ_daily.csv
+        leverage (float): 杠杆倍数
+        amount (float): 每次定投金额
+        day_of_month (int): 每月定投日（schedule 为 None 时使用）
+        daily_drag (float): 每日费用/融资成本（小数）
+        start_date: 起始日期（含），None 表示从头开始
+        end_date: 结束日期（含），None 表示到最后
+        schedule (tuple): 可选的定投日规则，(TradingDayIndex 方法名, 参数 dict)，
+            例如 ('weekly', {'weekday': 0})
+        cache (ResultCache): 使用的缓存，None 表示默认缓存
+
+    Returns:
+        pd.DataFrame: 与 QQQ_daily_with_3x_leverage.csv 相同的列，另含 3x_cumulative_investment
+    """
+    from .analysis import LEVERAGE_OUTPUT_COLUMNS, add_investment_columns, add_leverage_columns
+    from .data import read_prices
+    from .schedule import TradingDayIndex
+
+    def compute():
+        df = read_prices(file_path)
+        days = df['date'].to_numpy().astype('datetime64[D]')
+        keep = np.ones(len(df), dtype=bool)
+        if start_date is not None:
+            keep &= days >= np.datetime64(pd.Timestamp(start_date).date(), 'D')
+        if end_date is not None:
+            keep &= days <= np.datetime64(pd.Timestamp(end_date).date(), 'D')
+        df = df[keep].reset_index(drop=True)
+        if df.empty:
+            raise ValueError(f'{file_path} 在 {start_date} 至 {end_date} 之间没有数据')
+
+        buy_index = None
+        if schedule is not None:
+            rule, kwargs = schedule
+            buy_index = getattr(TradingDayIndex(df['date']), rule)(**kwargs)
+        df = add_investment_columns(df, amount, day_of_month, buy_index)
+        df = add_leverage_columns(df, leverage, amount, day_of_month, daily_drag, buy_index)
+        return df[LEVERAGE_OUTPUT_COLUMNS + ['3x_cumulative_investment']]
+
+    params = {
+        'leverage': float(leverage), 'amount': float(amount), 'day_of_month': int(day_of_month),
+        'daily_drag': float(daily_drag),
+        'start_date': None if start_date is None else str(pd.Timestamp(start_date).date()),
+        'end_date': None if end_date is None else str(pd.Timestamp(end_date).date()),
+        'schedule': schedule,
+    }
+    cache = cache if cache is not None else default_cache()
+    return cache.memoize('leverage_scenario', [file_path], params, compute)
@@ -0,0 +1,139 @@
+import numpy as np
+
+from .dca import buy_day_indices, to_day_array
+from .leverage import leveraged_growth
+from .sweep import max_drawdown_rows
+
+DEFAULT_PERCENTILES = (5, 25, 50, 75, 95)
+
+
+def stationary_bootstrap_indices(n_source, n_paths, n_days, mean_block=20, rng=None):
+    """
+    生成平稳块自助法（Politis-Romano stationary bootstrap）的抽样行号
+
+    每一天以 1/mean_block 的概率开始一个新块（起点在样本中均匀抽取），
+    否则沿用上一天的下一行；超过样本末尾时回到开头（循环块）。
+    块长服从几何分布，保留了收益率序列的短期相关性和波动聚集。
+
+    Args:
+        n_source (int): 原始收益率样本个数
+        n_paths (int): 路径条数
+        n_days (int): 每条路径的天数
+        mean_block (float): 平均块长（交易日），1 表示普通的逐日自助法
+        rng (np.random.Generator): 随机数生成器
+
+    Returns:
+        np.ndarray: 形状为 (n_paths, n_days) 的行号矩阵
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+    new_block = rng.random((n_paths, n_days)) < 1.0 / mean_block
+    new_block[:, 0] = True
+    starts = rng.integers(0, n_source, size=(n_paths, n_days))
+
+    # 每一天所在块的起始列：对块起点的列号做前向最大值
+    columns = np.arange(n_days)
+    block_start = np.maximum.accumulate(np.where(new_block, columns, 0), axis=1)
+    start_index = np.take_along_axis(starts, block_start, axis=1)
+    return (start_index + (columns - block_start)) % n_source
+
+
+def bootstrap_dca(returns_pct, dates, n_paths=10_000, leverages=(1.0, 3.0), amount=1000.0,
+                  day_of_month=26, daily_drag=0.0, mean_block=20, seed=0, chunk_size=500,
+                  percentiles=DEFAULT_PERCENTILES, max_abs_return=50.0):
+    """
+    用平稳块自助法生成大量合成收益率路径，批量计算杠杆定投结果的分布
+
+    每条合成路径与历史数据等长，沿用历史交易日历确定每月定投日。
+    路径第一天是起点，没有涨跌幅，所以每条路径只抽取 交易日数-1 个收益率。
+    同一批路径上的所有杠杆倍数共用一份抽样，各杠杆的结果可以逐条路径对比。
+    路径按 chunk_size 分块生成和计算，峰值内存约为
+    chunk_size × 交易日数 × 8 字节 × 数个数组，与 n_paths 无关。
+    seed 和 chunk_size 相同时结果完全可复现。
+
+    Args:
+        returns_pct: 标的每日涨跌幅（百分比）。第一行没有前一天可比，不参与抽样；
+            缺失值会被剔除后再抽样
+        dates: 升序交易日序列，与 returns_pct 等长
+        n_paths (int): 合成路径条数
+        leverages: 杠杆倍数列表
+        amount (float): 每月定投金额
+        day_of_month (int): 目标定投日
+        daily_drag (float): 每日费用/融资成本（小数）
+        mean_block (float): 平均块长（交易日）
+        seed (int): 随机种子
+        chunk_size (int): 每块路径数
+        percentiles: 需要汇总的百分位
+        max_abs_return (float): 异常涨跌幅阈值（百分比），与 repair_prices 相同。
+            抽样池中有超过阈值的收益率时报错：单个异常值会被反复抽到，放大所有路径的结果
+
+    Returns:
+        dict:
+            summary: DataFrame，每个杠杆倍数 × 百分位一行，包含最终价值、
+                收益倍数和最大回撤（百分比，负数）
+            final_value: (路径数, 杠杆个数) 的最终组合价值
+            max_drawdown_pct: (路径数, 杠杆个数) 的最大回撤
+            investment_total: 累计投入金额
+    """
+    import pandas as pd
+
+    returns_pct = np.asarray(returns_pct, dtype=np.float64)
+    if len(returns_pct) != len(dates):
+        raise ValueError('returns_pct 与 dates 长度不一致')
+    source = returns_pct[1:]
+    keep = ~np.isnan(source)
+    source = source[keep]
+    if len(source) == 0:
+        raise ValueError('没有可用的涨跌幅数据')
+    outliers = np.abs(source) > max_abs_return
+    if np.any(outliers):
+        days = to_day_array(dates)[1:][keep][outliers]
+        raise ValueError(f'涨跌幅中有 {len(days)} 个超过 ±{max_abs_return}% 的异常值'
+                         f'（{", ".join(str(day) for day in days[:5])}），'
+                         '请先用 fincurve.quality.repair_prices 修复')
+
+    leverages = np.asarray(leverages, dtype=np.float64)
+    n_days = len(dates)
+    buy_index = buy_day_indices(dates, day_of_month)
+    investment_total = amount * len(buy_index)
+
+    rng = np.random.default_rng(seed)
+    final_value = np.empty((n_paths, len(leverages)))
+    max_drawdown = np.empty((n_paths, len(leverages)))
+
+    for lo in range(0, n_paths, chunk_size):
+        hi = min(lo + chunk_size, n_paths)
+        # 第一列是起点（增长因子固定为1），只需要抽取之后 n_days-1 天的收益率
+        sample = np.empty((hi - lo, n_days))
+        sample[:, 0] = np.nan
+        sample[:, 1:] = source[stationary_bootstrap_indices(len(source), hi - lo, n_days - 1, mean_block, rng)]
+        for j, leverage in enumerate(leverages):
+            # 起始价格取1：定投的最终价值只取决于价格的相对变化
+            prices = np.cumprod(leveraged_growth(sample, leverage, daily_drag), axis=1)
+            shares = np.zeros_like(prices)
+            shares[:, buy_index] = amount / prices[:, buy_index]
+            value = np.cumsum(shares, axis=1, out=shares)
+            value *= prices
+            final_value[lo:hi, j] = value[:, -1]
+            max_drawdown[lo:hi, j] = max_drawdown_rows(value)
+
+    rows = []
+    for j, leverage in enumerate(leverages):
+        finals = np.percentile(final_value[:, j], percentiles)
+        # 回撤为负数，低百分位对应更深的回撤
+        drawdowns = np.percentile(max_drawdown[:, j], percentiles)
+        for p, final, drawdown in zip(percentiles, finals, drawdowns):
+            rows.append({
+                'leverage': leverage,
+                'percentile': p,
+                'final_value': final,
+                'multiple': final / investment_total,
+                'max_drawdown_pct': drawdown,
+            })
+
+    return {
+        'summary': pd.DataFrame(rows),
+        'final_value': final_value,
+        'max_drawdown_pct': max_drawdown,
+        'investment_total': investment_total,
+    }
@@ -0,0 +1,249 @@
+import hashlib
+import inspect
+import json
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from . import profiling
+from .memo import data_fingerprint
+
+DEFAULT_STATE_PATH = 'pipeline.state.json'
+
+
+class Stage:
+    """
+    流水线中的一个阶段
+
+    func(data, **params) 接收 data（输入路径 -> DataFrame），返回 输出路径 -> DataFrame，
+    由流水线写成 CSV 并在内存中交给下游阶段；图片等其他输出由 func 自己写出，
+    返回值中不需要包含。
+
+    Args:
+        name (str): 阶段名称
+        func: 阶段函数
+        inputs: 输入文件路径列表
+        outputs: 输出文件路径列表
+        params (dict): 传给 func 的参数，变化后该阶段视为过期
+    """
+
+    def __init__(self, name, func, inputs=(), outputs=(), params=None):
+        self.name = name
+        self.func = func
+        self.inputs = list(inputs)
+        self.outputs = list(outputs)
+        self.params = params or {}
+
+    def signature(self):
+        # 参数和阶段函数源码的指纹，代码或参数改动后阶段需要重跑
+        try:
+            source = inspect.getsource(self.func)
+        except (OSError, TypeError):
+            source = self.func.__qualname__
+        text = json.dumps([self.params, source], sort_keys=True, default=str)
+        return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+
+class Pipeline:
+    """
+    按输入输出文件声明的 DAG 流水线，只重跑过期的阶段
+
+    阶段之间的依赖由文件路径推出：某阶段的输入是另一阶段的输出时，后者为上游。
+    存在循环依赖时构造即抛出 ValueError。
+    一个阶段在以下情况下过期：输出文件缺失、输入文件内容指纹与上次运行时不同、
+    参数或阶段函数代码有变化，或被 force 指定。没有上游的源阶段（如下载）
+    只有在输出缺失或被 force 时才运行。
+
+    过期判断在阶段的上游全部完成后才做：上游重跑但输出内容没变时，
+    下游不会被连带重跑。相互独立的阶段在线程池中并行执行；
+    同一次运行中上游产出的 DataFrame 直接在内存中传给下游，不经过 CSV 读回。
+    每个阶段运行成功后，输入指纹和签名记录在状态文件中。
+
+    Args:
+        stages: Stage 列表
+        state_path (str): 状态文件路径
+        max_workers (int): 并行线程数
+        loader: 读取上游输出文件的函数，默认为 fincurve.data.read_prices
+    """
+
+    def __init__(self, stages, state_path=DEFAULT_STATE_PATH, max_workers=4, loader=None):
+        self.stages = {stage.name: stage for stage in stages}
+        self.state_path = state_path
+        self.max_workers = max_workers
+        if loader is None:
+            from .data import read_prices as loader
+        self.loader = loader
+
+        self.producers = {}
+        for stage in stages:
+            for path in stage.outputs:
+                if path in self.producers:
+                    raise ValueError(f'{path} 同时是 {self.producers[path]} 和 {stage.name} 的输出')
+                self.producers[path] = stage.name
+        self.upstream = {
+            stage.name: sorted({self.producers[path] for path in stage.inputs if path in self.producers})
+            for stage in stages
+        }
+        # 有循环依赖时调度器永远等不到上游完成，在构造时就报错
+        self._topological(set(self.stages))
+
+    def load_state(self):
+        if not os.path.exists(self.state_path):
+            return {}
+        with open(self.state_path, encoding='utf-8') as f:
+            return json.load(f)
+
+    def save_state(self, state):
+        tmp = self.state_path + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(state, f, ensure_ascii=False, indent=2)
+        os.replace(tmp, self.state_path)
+
+    def selected(self, targets=None):
+        """
+        返回运行 targets 需要的阶段（含所有上游），None 表示全部阶段
+        """
+        if targets is None:
+            return set(self.stages)
+        unknown = set(targets) - set(self.stages)
+        if unknown:
+            raise ValueError(f'未知的阶段: {sorted(unknown)}')
+        selected, pending = set(), list(targets)
+        while pending:
+            name = pending.pop()
+            if name not in selected:
+                selected.add(name)
+                pending.extend(self.upstream[name])
+        return selected
+
+    def stale_reason(self, stage, state, force=()):
+        """
+        判断阶段是否过期，过期时返回原因，否则返回 None
+        """
+        if stage.name in force:
+            return '强制运行'
+        missing = [path for path in stage.outputs if not os.path.exists(path)]
+        if missing:
+            return f'缺少输出 {missing[0]}'
+        if not stage.inputs:
+            return None
+        record = state.get(stage.name)
+        if record is None:
+            return '没有运行记录'
+        if record.get('signature') != stage.signature():
+            return '参数或代码有变化'
+        missing = [path for path in stage.inputs if not os.path.exists(path)]
+        if missing:
+            return f'缺少输入 {missing[0]}'
+        if record.get('inputs') != data_fingerprint(*stage.inputs):
+            return '输入已更新'
+        return None
+
+    def _run_stage(self, stage, memory):
+        with profiling.stage(f'pipeline.{stage.name}') as timer:
+            data = {}
+            for path in stage.inputs:
+                data[path] = memory[path].copy() if path in memory else self.loader(path)
+                timer.add_rows(len(data[path]))
+            frames = stage.func(data, **stage.params) or {}
+            for path, df in frames.items():
+                with profiling.stage('pipeline.to_csv', rows=len(df)):
+                    df.to_csv(path, index=False)
+            return frames
+
+    def run(self, targets=None, force=(), dry_run=False, log=print):
+        """
+        运行流水线
+
+        Args:
+            targets: 只运行这些阶段及其上游，None 表示全部
+            force: 强制运行的阶段名称
+            dry_run (bool): 只按当前文件状态列出会运行的阶段，不执行
+            log: 进度输出函数，None 表示不输出
+
+        Returns:
+            dict: 阶段名称 -> {'status': 'ran' / 'fresh' / 'failed' / 'blocked', ...}
+        """
+        log = log or (lambda message: None)
+        selected = self.selected(targets)
+        force = set(force)
+        state = self.load_state()
+        results = {}
+
+        if dry_run:
+            # 上游过期时下游一定需要检查，这里按最坏情况把它们都算作要运行
+            for name in self._topological(selected):
+                stage = self.stages[name]
+                reason = self.stale_reason(stage, state, force)
+                if reason is None and any(results[up]['status'] == 'ran' for up in self.upstream[name]):
+                    reason = '上游需要重跑'
+                results[name] = {'status': 'ran' if reason else 'fresh', 'reason': reason}
+                log(f"{name:12s} {'将运行' if reason else '已是最新'}{'：' + reason if reason else ''}")
+            return results
+
+        memory = {}
+        remaining = set(selected)
+        running = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while remaining or running:
+                for name in sorted(remaining):
+                    upstream = [up for up in self.upstream[name] if up in selected]
+                    if any(up not in results for up in upstream):
+                        continue
+                    remaining.discard(name)
+                    stage = self.stages[name]
+                    if any(results[up]['status'] in ('failed', 'blocked') for up in upstream):
+                        results[name] = {'status': 'blocked'}
+                        log(f"{name:12s} 跳过：上游失败")
+                        continue
+                    reason = self.stale_reason(stage, state, force)
+                    if reason is None:
+                        results[name] = {'status': 'fresh'}
+                        log(f"{name:12s} 已是最新")
+                        continue
+                    log(f"{name:12s} 开始运行：{reason}")
+                    running[executor.submit(self._run_stage, stage, memory)] = (name, reason, time.perf_counter())
+
+                if not running:
+                    continue
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name, reason, start = running.pop(future)
+                    stage = self.stages[name]
+                    elapsed = time.perf_counter() - start
+                    try:
+                        memory.update(future.result())
+                    except Exception as exc:  # noqa: BLE001 - 记录失败，继续运行不相关的阶段
+                        results[name] = {'status': 'failed', 'error': repr(exc), 'seconds': elapsed}
+                        log(f"{name:12s} 失败（{elapsed:.2f} 秒）：{exc!r}")
+                        continue
+                    state[name] = {
+                        'signature': stage.signature(),
+                        'inputs': data_fingerprint(*stage.inputs) if stage.inputs else None,
+                        'finished': time.strftime('%Y-%m-%d %H:%M:%S'),
+                    }
+                    self.save_state(state)
+                    results[name] = {'status': 'ran', 'reason': reason, 'seconds': elapsed}
+                    log(f"{name:12s} 完成（{elapsed:.2f} 秒）")
+        return results
+
+    def _topological(self, selected):
+        order, visited, visiting = [], set(), []
+
+        def visit(name):
+            if name in visited:
+                return
+            if name in visiting:
+                cycle = visiting[visiting.index(name):] + [name]
+                raise ValueError(f"阶段之间存在循环依赖: {' -> '.join(cycle)}")
+            visiting.append(name)
+            for up in self.upstream[name]:
+                if up in selected:
+                    visit(up)
+            visiting.pop()
+            visited.add(name)
+            order.append(name)
+
+        for name in sorted(selected):
+            visit(name)
+        return order
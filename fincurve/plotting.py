@@ -0,0 +1,160 @@
+"""
+对比图的绘制
+
+matplotlib 只在调用绘图函数时才导入；headless=True 时使用 Agg 后端，不弹出窗口。
+"""
+from . import profiling
+
+
+def get_pyplot(headless=False):
+    """
+    导入 pyplot 并设置中文字体
+
+    Args:
+        headless (bool): 是否使用 Agg 后端（无界面，只保存图片）
+    """
+    import matplotlib
+    if headless:
+        matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+
+    # 设置中文字体支持
+    plt.rcParams['font.sans-serif'] = ['SimHei', 'Microsoft YaHei']
+    plt.rcParams['axes.unicode_minus'] = False
+    return plt
+
+
+def format_year_axis(ax, plt, step=2):
+    # x 轴按年份显示
+    import matplotlib.dates as mdates
+
+    ax.xaxis.set_major_formatter(mdates.DateFormatter('%Y'))
+    ax.xaxis.set_major_locator(mdates.YearLocator(step))
+    ax.xaxis.set_minor_locator(mdates.YearLocator())
+    plt.setp(ax.xaxis.get_majorticklabels(), rotation=45)
+
+
+def comparison_series(df):
+    """
+    两张对比图中每条线的定义
+
+    Returns:
+        list: (子图编号, 数值序列, 颜色, 标签模板, 线型, 线宽)，子图编号 0-3 为四宫格，4 为标准化对比图
+    """
+    investment = df['investment_total']
+    return [
+        (0, df['close'], 'blue', '{name}收盘价', '-', 2),
+        (0, df['3x_close'], 'red', '3倍杠杆{name}收盘价', '-', 2),
+        (1, df['portfolio_value'], 'green', '{name}投资组合价值', '-', 2),
+        (1, df['3x_portfolio_value'], 'orange', '3倍杠杆投资组合价值', '-', 2),
+        (1, investment, 'gray', '累计投资总额', '--', 2),
+        (2, df['portfolio_value'] / investment, 'blue', '{name}收益倍数', '-', 2),
+        (2, df['3x_portfolio_value'] / investment, 'red', '3倍杠杆收益倍数', '-', 2),
+        (3, df['portfolio_value'] - investment, 'green', '{name}绝对收益', '-', 2),
+        (3, df['3x_portfolio_value'] - investment, 'purple', '3倍杠杆绝对收益', '-', 2),
+        (4, df['close'] / df['close'].iloc[0], 'blue', '{name}收盘价 (标准化)', '-', 2),
+        (4, df['3x_close'] / df['3x_close'].iloc[0], 'red', '3倍杠杆{name}收盘价 (标准化)', '-', 2),
+        (4, df['portfolio_value'] / df['portfolio_value'].iloc[0], 'green', '{name}投资组合价值 (标准化)', '-', 2),
+        (4, df['3x_portfolio_value'] / df['3x_portfolio_value'].iloc[0], 'orange', '3倍杠杆投资组合价值 (标准化)', '-', 2),
+        (4, investment / investment.iloc[0], 'gray', '累计投资总额 (标准化)', '--', 3),
+    ]
+
+
+def setup_comparison_axes(axes, norm_ax, plt):
+    """
+    设置四宫格和标准化对比图的标题、坐标轴和参考线
+    """
+    titles = ['收盘价对比', '投资组合价值对比', '收益倍数对比（投资组合价值/投资总额）', '绝对收益对比']
+    ylabels = ['价格 (USD)', '价值 (USD)', '收益倍数', '绝对收益 (USD)']
+    for ax, title, ylabel in zip(axes, titles, ylabels):
+        ax.set_title(title, fontsize=14, fontweight='bold')
+        ax.set_ylabel(ylabel, fontsize=12)
+        ax.grid(True, alpha=0.3)
+    # 使用对数坐标，因为3倍杠杆增长很快
+    for ax in axes[:3]:
+        ax.set_yscale('log')
+    axes[2].axhline(y=1, color='black', linestyle='--', alpha=0.5, label='盈亏平衡线')
+    axes[3].axhline(y=0, color='black', linestyle='--', alpha=0.5, label='盈亏平衡线')
+    axes[3].set_xlabel('日期', fontsize=12)
+
+    norm_ax.set_xlabel('日期', fontsize=12)
+    norm_ax.set_ylabel('相对初始值的倍数', fontsize=12)
+    norm_ax.grid(True, alpha=0.3)
+    norm_ax.set_yscale('log')
+
+    for ax in list(axes) + [norm_ax]:
+        format_year_axis(ax, plt)
+
+
+def plot_comparison(df, name='QQQ', comprehensive_path=None, normalized_path=None,
+                    dpi=300, headless=False):
+    """
+    绘制四宫格分析图和标准化对比图（与 plot_comprehensive_chart.py 原先的输出相同）
+
+    Args:
+        df (pd.DataFrame): 与 QQQ_daily_with_3x_leverage.csv 相同列的数据
+        name (str): 标的名称
+        comprehensive_path (str): 四宫格分析图保存路径，None 表示不保存
+        normalized_path (str): 标准化对比图保存路径，None 表示不保存
+        dpi (int): 保存分辨率
+        headless (bool): 为 True 时不调用 show()
+    """
+    plt = get_pyplot(headless)
+
+    fig, axes = plt.subplots(2, 2, figsize=(20, 12))
+    axes = axes.ravel()
+    fig.suptitle(f'{name} vs 3倍杠杆{name} 投资对比分析', fontsize=20, fontweight='bold')
+    norm_fig, norm_ax = plt.subplots(figsize=(16, 10))
+    norm_ax.set_title(f'{name} vs 3倍杠杆{name} 标准化对比图', fontsize=16, fontweight='bold', pad=20)
+    setup_comparison_axes(axes, norm_ax, plt)
+
+    for i, values, color, label, style, width in comparison_series(df):
+        ax = norm_ax if i == 4 else axes[i]
+        ax.plot(df['date'], values, linewidth=width, color=color, alpha=0.8,
+                linestyle=style, label=label.format(name=name))
+    for ax in axes:
+        ax.legend()
+    norm_ax.legend(loc='upper left', fontsize=10)
+
+    for figure, path in [(fig, comprehensive_path), (norm_fig, normalized_path)]:
+        figure.tight_layout()
+        if path:
+            with profiling.stage('plot.savefig'):
+                figure.savefig(path, dpi=dpi, bbox_inches='tight')
+    if not headless:
+        plt.show()
+    plt.close(fig)
+    plt.close(norm_fig)
+
+
+def plot_close(df, name='QQQ', path=None, headless=False):
+    """
+    绘制历史收盘价走势图（plot_qqq_chart.py）
+    """
+    import matplotlib.dates as mdates
+
+    plt = get_pyplot(headless)
+    fig = plt.figure(figsize=(15, 8))
+    plt.plot(df['date'], df['close'], linewidth=1, color='blue', alpha=0.8)
+
+    # 设置图表标题和标签
+    plt.title(f'{name}纳指基金历史收盘价走势图', fontsize=16, fontweight='bold', pad=20)
+    plt.xlabel('日期', fontsize=12)
+    plt.ylabel('收盘价 (USD)', fontsize=12)
+
+    # 设置x轴日期格式
+    plt.gca().xaxis.set_major_formatter(mdates.DateFormatter('%Y-%m'))
+    plt.gca().xaxis.set_major_locator(mdates.YearLocator())
+    plt.gca().xaxis.set_minor_locator(mdates.MonthLocator(interval=6))
+
+    # 旋转x轴标签以避免重叠
+    plt.xticks(rotation=45)
+    plt.grid(True, alpha=0.3)
+    plt.tight_layout()
+
+    if path:
+        with profiling.stage('plot.savefig'):
+            plt.savefig(path, dpi=150, bbox_inches='tight')
+    if not headless:
+        plt.show()
+    plt.close(fig)
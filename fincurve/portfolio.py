@@ -0,0 +1,159 @@
+import numpy as np
+
+from .dca import buy_day_indices, to_day_array
+
+
+def _concat_series(series):
+    # 各资产的日期和价格首尾相接，返回每行所属的资产编号
+    names = list(series)
+    days, values = [], []
+    for name in names:
+        item = series[name]
+        if isinstance(item, tuple):
+            dates, prices = item
+        else:
+            dates, prices = item['date'], item['close']
+        days.append(to_day_array(dates))
+        values.append(np.asarray(prices, dtype=np.float64))
+        if len(days[-1]) != len(values[-1]):
+            raise ValueError(f'{name} 的日期与价格长度不一致')
+    lengths = [len(d) for d in days]
+    asset_ids = np.repeat(np.arange(len(names)), lengths)
+    return names, np.concatenate(days), np.concatenate(values), asset_ids
+
+
+def _align(n_assets, days, values, asset_ids):
+    # 一次排序去重得到合并日期索引，以及每一行在索引中的列号
+    dates, column = np.unique(days, return_inverse=True)
+    matrix = np.full((n_assets, len(dates)), np.nan)
+    matrix[asset_ids, column] = values
+    observed = np.zeros(matrix.shape, dtype=bool)
+    observed[asset_ids, column] = True
+    return dates, column, matrix, observed
+
+
+def forward_fill(matrix, observed):
+    """
+    按行向前填充：每个位置取该行最近一次观测到的值，首次观测之前为 NaN
+
+    Args:
+        matrix (np.ndarray): (资产数, 日期数) 的数值矩阵
+        observed (np.ndarray): 同形状的布尔矩阵，True 表示该位置有观测值
+
+    Returns:
+        np.ndarray: 填充后的新矩阵
+    """
+    columns = np.arange(matrix.shape[1])
+    last = np.maximum.accumulate(np.where(observed, columns, 0), axis=1)
+    filled = np.take_along_axis(matrix, last, axis=1)
+    filled[~np.logical_or.accumulate(observed, axis=1)] = np.nan
+    return filled
+
+
+def align_series(series):
+    """
+    把多个不同日历、不同频率的序列对齐到同一个日期索引
+
+    所有资产的日期拼接后只做一次排序去重（np.unique）得到合并日期索引，
+    每一行的列号由同一次排序得到，不需要逐个资产做 merge。
+
+    Args:
+        series (dict): 资产名 -> 含 date/close 列的 DataFrame，或 (dates, values) 元组
+
+    Returns:
+        dict:
+            assets: 资产名列表
+            dates: 合并后的升序日期（datetime64[D]）
+            values: (资产数, 日期数) 的矩阵，未观测的位置为 NaN
+            observed: 同形状的布尔矩阵
+    """
+    names, days, values, asset_ids = _concat_series(series)
+    dates, _, matrix, observed = _align(len(names), days, values, asset_ids)
+    return {'assets': names, 'dates': dates, 'values': matrix, 'observed': observed}
+
+
+def portfolio_dca(series, weights=None, amount=1000.0, day_of_month=26, renormalize=True,
+                  start_date=None):
+    """
+    多资产按权重定投，日线和月线数据可以混合
+
+    每个资产在自己的交易日历上按与 simulate_dca 相同的规则确定定投日：
+    当月 day_of_month 号或之后的第一个交易日，没有则取当月最后一个交易日。
+    月线数据每月只有一行，定投即在该行成交。所有资产的定投日通过一次
+    分组的 buy_day_indices 求出，持股和投入在合并日期索引上用矩阵 cumsum 计算，
+    组合价值按各资产最近一次观测到的价格（向前填充）估值。
+
+    价格不做汇率换算，跨市场组合相当于假设汇率不变；
+    需要统一币种时请先把价格换算后再传入。
+
+    Args:
+        series (dict): 资产名 -> 含 date/close 列的 DataFrame，或 (dates, prices) 元组，
+            每个资产的日期需按升序排列
+        weights (dict): 资产名 -> 权重，自动归一化；None 表示等权
+        amount (float): 每月定投总金额
+        day_of_month (int): 目标定投日
+        renormalize (bool): 某个月部分资产没有数据（尚未上市等）时，是否把它们的
+            权重按比例分给当月有数据的资产；False 时这部分资金当月不投入
+        start_date: 从这一天起开始定投，None 表示从最早的数据开始
+
+    Returns:
+        dict:
+            assets: 资产名列表
+            dates: 合并后的升序日期（datetime64[D]）
+            prices: (资产数, 日期数) 向前填充后的价格矩阵
+            observed: 同形状的布尔矩阵，True 表示该资产当天有原始数据
+            monthly_investment: 每天投入的总金额
+            investment: (资产数, 日期数) 各资产累计投入
+            shares: (资产数, 日期数) 各资产累计持股
+            value: (资产数, 日期数) 各资产持仓价值
+            investment_total: 组合累计投入
+            portfolio_value: 组合价值
+    """
+    names, days, values, asset_ids = _concat_series(series)
+    dates, column, matrix, observed = _align(len(names), days, values, asset_ids)
+    n_assets, n_days = matrix.shape
+
+    if weights is None:
+        weight = np.ones(n_assets)
+    else:
+        weight = np.array([weights.get(name, 0.0) for name in names], dtype=np.float64)
+    if np.any(weight < 0) or weight.sum() <= 0:
+        raise ValueError('权重必须非负且不能全为0')
+    weight = weight / weight.sum()
+
+    buy = buy_day_indices(days, day_of_month, groups=asset_ids)
+    if start_date is not None:
+        buy = buy[days[buy] >= np.datetime64(start_date, 'D')]
+    buy = buy[weight[asset_ids[buy]] > 0]
+
+    buy_weight = weight[asset_ids[buy]]
+    if renormalize:
+        # 按自然月汇总当月实际参与定投的权重，再按比例放大
+        _, month = np.unique(days[buy].astype('datetime64[M]'), return_inverse=True)
+        buy_weight = buy_weight / np.bincount(month, weights=buy_weight)[month]
+    cash = amount * buy_weight
+
+    cash_matrix = np.zeros((n_assets, n_days))
+    cash_matrix[asset_ids[buy], column[buy]] = cash
+    shares_matrix = np.zeros((n_assets, n_days))
+    shares_matrix[asset_ids[buy], column[buy]] = cash / values[buy]
+
+    prices = forward_fill(matrix, observed)
+
+    investment = np.cumsum(cash_matrix, axis=1)
+    shares = np.cumsum(shares_matrix, axis=1)
+    # 首次观测之前价格为 NaN，但持股为0，价值按0计
+    value = np.where(shares > 0, shares * prices, 0.0)
+
+    return {
+        'assets': names,
+        'dates': dates,
+        'prices': prices,
+        'observed': observed,
+        'monthly_investment': cash_matrix.sum(axis=0),
+        'investment': investment,
+        'shares': shares,
+        'value': value,
+        'investment_total': investment.sum(axis=0),
+        'portfolio_value': value.sum(axis=0),
+    }
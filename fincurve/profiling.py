@@ -0,0 +1,284 @@
+"""
+热点路径的计时、吞吐量和内存采样
+
+默认关闭，关闭时 stage() 只做一次全局开关判断并返回同一个空上下文，开销可以忽略。
+开启方式（任选其一）:
+    - 环境变量 FINCURVE_PROFILE=1（报告写到 fincurve_profile.json）
+      或 FINCURVE_PROFILE=<报告路径>，进程退出时自动写出 JSON 报告
+    - 环境变量 FINCURVE_CPROFILE=auto 时，额外对每个最外层阶段做 cProfile，
+      并把最慢阶段的结果保存为 <报告路径>.prof（可用 pstats / snakeviz 查看）；
+      FINCURVE_CPROFILE=<阶段名> 则只分析该阶段。同一时间只分析一个阶段，
+      其他线程中同时运行的阶段只计时
+    - 在代码中调用 enable()，结束时调用 write_report()
+
+只统计当前进程；进程池子进程中的耗时不计入。
+
+用法:
+    from fincurve import profiling
+
+    with profiling.stage('data.read_csv', rows=len(df)):
+        ...
+"""
+import atexit
+import cProfile
+import datetime
+import io
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+
+DEFAULT_REPORT_PATH = 'fincurve_profile.json'
+
+# 内存采样间隔（秒）
+SAMPLE_INTERVAL = 0.01
+
+_enabled = False
+_lock = threading.Lock()
+# 同一时间只允许一个阶段做 cProfile（Python 3.12 起不能同时启用两个分析器）
+_profile_lock = threading.Lock()
+_local = threading.local()
+_stats = {}
+_active = set()
+_profiles = {}
+_cprofile = None
+_sampler = None
+_started = None
+_peak_rss = 0
+
+
+class _NullStage:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def add_rows(self, rows):
+        pass
+
+
+_NULL_STAGE = _NullStage()
+
+
+def _current_rss():
+    # Linux 下读取 /proc/self/statm 的常驻内存；其他平台退回到进程峰值
+    try:
+        with open('/proc/self/statm', 'rb') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError, IndexError):
+        try:
+            import resource
+        except ImportError:
+            return 0
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == 'darwin' else peak * 1024
+
+
+class _Sampler(threading.Thread):
+    # 后台线程定期采样常驻内存，记到当前正在运行的各个阶段上
+
+    def __init__(self):
+        super().__init__(name='fincurve-profiling', daemon=True)
+        self.stopped = threading.Event()
+
+    def sample(self):
+        global _peak_rss
+        rss = _current_rss()
+        with _lock:
+            _peak_rss = max(_peak_rss, rss)
+            for record in _active:
+                if rss > record.peak_rss:
+                    record.peak_rss = rss
+
+    def run(self):
+        while not self.stopped.wait(SAMPLE_INTERVAL):
+            self.sample()
+
+
+class _Stage:
+    __slots__ = ('name', 'rows', 'start', 'cpu_start', 'peak_rss', 'profile')
+
+    def __init__(self, name, rows):
+        self.name = name
+        self.rows = rows
+        self.peak_rss = 0
+        self.profile = None
+
+    def add_rows(self, rows):
+        self.rows = (self.rows or 0) + rows
+
+    def __enter__(self):
+        depth = getattr(_local, 'depth', 0)
+        if (depth == 0 and _cprofile is not None and _cprofile in ('auto', self.name)
+                and _profile_lock.acquire(blocking=False)):
+            # cProfile 不能嵌套，也不能在多个线程中同时启用：只分析最外层阶段，
+            # 其他线程中同时运行的阶段只计时；分析器被其他工具占用时同样跳过
+            try:
+                self.profile = cProfile.Profile()
+                self.profile.enable()
+            except ValueError:
+                self.profile = None
+                _profile_lock.release()
+        _local.depth = depth + 1
+        self.peak_rss = _current_rss()
+        with _lock:
+            _active.add(self)
+        self.cpu_start = time.thread_time()
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self.start
+        cpu = time.thread_time() - self.cpu_start
+        if self.profile is not None:
+            self.profile.disable()
+            _profile_lock.release()
+        _local.depth -= 1
+        with _lock:
+            _active.discard(self)
+            record = _stats.setdefault(self.name, {
+                'calls': 0, 'seconds': 0.0, 'cpu_seconds': 0.0, 'max_seconds': 0.0,
+                'rows': 0, 'peak_rss_bytes': 0,
+            })
+            record['calls'] += 1
+            record['seconds'] += elapsed
+            record['cpu_seconds'] += cpu
+            record['max_seconds'] = max(record['max_seconds'], elapsed)
+            record['rows'] += self.rows or 0
+            record['peak_rss_bytes'] = max(record['peak_rss_bytes'], self.peak_rss)
+            if self.profile is not None:
+                _profiles.setdefault(self.name, []).append(self.profile)
+        return False
+
+
+def enabled():
+    return _enabled
+
+
+def enable(cprofile=None):
+    """
+    开启统计
+
+    Args:
+        cprofile (str): None 表示不做 cProfile；'auto' 分析所有最外层阶段，
+            报告中保存最慢的一个；也可以指定阶段名称
+    """
+    global _enabled, _cprofile, _sampler, _started
+    with _lock:
+        if _enabled:
+            return
+        _enabled = True
+        _cprofile = cprofile
+        _started = time.perf_counter()
+    _sampler = _Sampler()
+    _sampler.start()
+
+
+def disable():
+    global _enabled, _sampler
+    _enabled = False
+    if _sampler is not None:
+        _sampler.stopped.set()
+        _sampler = None
+
+
+def reset():
+    """
+    清空已有的统计数据
+    """
+    global _started, _peak_rss
+    with _lock:
+        _stats.clear()
+        _profiles.clear()
+        _started = time.perf_counter()
+        _peak_rss = 0
+
+
+def stage(name, rows=None):
+    """
+    统计一个阶段的耗时、CPU 时间、处理行数和内存峰值
+
+    关闭时返回共享的空上下文。
+
+    Args:
+        name (str): 阶段名称，同名阶段累加
+        rows (int): 处理的行数，用于计算吞吐量；也可以在 with 块内调用 add_rows()
+    """
+    if not _enabled:
+        return _NULL_STAGE
+    return _Stage(name, rows)
+
+
+def report():
+    """
+    生成结构化报告（按总耗时从高到低排列各阶段）
+    """
+    if _sampler is not None:
+        _sampler.sample()
+    with _lock:
+        stages = []
+        for name, record in _stats.items():
+            item = dict(record, name=name)
+            item['rows_per_second'] = record['rows'] / record['seconds'] if record['rows'] and record['seconds'] else None
+            stages.append(item)
+        total = time.perf_counter() - _started if _started is not None else 0.0
+        peak = _peak_rss
+    stages.sort(key=lambda item: item['seconds'], reverse=True)
+    return {
+        'created': datetime.datetime.now().isoformat(timespec='seconds'),
+        'argv': sys.argv,
+        'pid': os.getpid(),
+        'wall_seconds': total,
+        'peak_rss_bytes': peak,
+        'stages': stages,
+    }
+
+
+def _dump_cprofile(path):
+    # 把最慢的、做过 cProfile 的阶段保存为 .prof，并返回前20个函数的摘要
+    with _lock:
+        candidates = [(name, _stats[name]['seconds']) for name in _profiles]
+    if not candidates:
+        return None
+    name = max(candidates, key=lambda item: item[1])[0]
+    profiles = _profiles[name]
+    stats = pstats.Stats(profiles[0])
+    for profile in profiles[1:]:
+        stats.add(profile)
+    stats.dump_stats(path)
+
+    text = io.StringIO()
+    stats.stream = text
+    stats.sort_stats('cumulative').print_stats(20)
+    return {'stage': name, 'path': path, 'top': text.getvalue().splitlines()}
+
+
+def write_report(path=DEFAULT_REPORT_PATH):
+    """
+    写出 JSON 报告；开启了 cProfile 时同时写出最慢阶段的 <path>.prof
+
+    Returns:
+        dict: 报告内容
+    """
+    result = report()
+    result['cprofile'] = _dump_cprofile(os.path.splitext(path)[0] + '.prof')
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(result, f, ensure_ascii=False, indent=2)
+    return result
+
+
+def _enable_from_environment():
+    value = os.environ.get('FINCURVE_PROFILE', '')
+    if value.lower() in ('', '0', 'false', 'no'):
+        return
+    path = DEFAULT_REPORT_PATH if value.lower() in ('1', 'true', 'yes') else value
+    enable(os.environ.get('FINCURVE_CPROFILE') or None)
+    atexit.register(write_report, path)
+
+
+_enable_from_environment()
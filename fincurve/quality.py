@@ -0,0 +1,204 @@
+import numpy as np
+import pandas as pd
+
+from .data import RETURN_COLUMNS
+from .trading_calendar import get_calendar
+
+PRICE_COLUMNS = ['open', 'high', 'low', 'close']
+
+# 拆股/合股识别：收盘价和开盘价相对前收盘的比例都接近 1/k 或 k
+SPLIT_RATIOS = np.arange(2, 21)
+SPLIT_TOLERANCE = 0.03
+
+
+def _return_column(df):
+    for column in RETURN_COLUMNS:
+        if column in df.columns:
+            return column
+    return None
+
+
+def detect_splits(df):
+    """
+    识别拆股/合股造成的价格断层
+
+    Returns:
+        np.ndarray: 每行的拆分因子（新股数/旧股数，例如 2:1 拆股为 2），没有拆分的行为 1
+    """
+    close = df['close'].to_numpy(dtype=np.float64)
+    prev = np.r_[np.nan, close[:-1]]
+    factors = np.ones(len(close))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        close_ratio = prev / close
+        open_ratio = prev / df['open'].to_numpy(dtype=np.float64) if 'open' in df.columns else close_ratio
+
+    # 同时考虑拆股（比例 k）和合股（比例 1/k）
+    ratios = np.r_[SPLIT_RATIOS, 1.0 / SPLIT_RATIOS]
+    close_error = np.abs(close_ratio[:, None] / ratios[None, :] - 1)
+    open_error = np.abs(open_ratio[:, None] / ratios[None, :] - 1)
+    hit = (close_error < SPLIT_TOLERANCE) & (open_error < SPLIT_TOLERANCE)
+    rows = np.flatnonzero(hit.any(axis=1))
+    factors[rows] = ratios[hit[rows].argmax(axis=1)]
+    return factors
+
+
+def validate_prices(df, max_abs_return=50.0):
+    """
+    批量检查行情数据质量，全部为向量化计算
+
+    Args:
+        df (pd.DataFrame): 行情数据（按日期升序）
+        max_abs_return (float): 单日涨跌幅绝对值超过该百分比视为异常（拆股除外）
+
+    Returns:
+        dict: 每类问题对应的布尔数组，以及识别出的拆分因子
+    """
+    prices = df[[c for c in PRICE_COLUMNS if c in df.columns]].to_numpy(dtype=np.float64)
+    close = df['close'].to_numpy(dtype=np.float64)
+    factors = detect_splits(df)
+
+    # NaN 单独列为 missing，不算作非正价格，否则会按非正价格截掉之前的全部历史
+    missing = np.isnan(prices).any(axis=1)
+    nonpositive = (prices <= 0).any(axis=1)
+    if {'open', 'high', 'low', 'close'} <= set(df.columns):
+        o, h, l, c = (df[column].to_numpy(dtype=np.float64) for column in PRICE_COLUMNS)
+        ohlc_inconsistent = (h < np.fmax(np.fmax(o, c), l)) | (l > np.fmin(np.fmin(o, c), h))
+    else:
+        ohlc_inconsistent = np.zeros(len(df), dtype=bool)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        recomputed = (close / np.r_[np.nan, close[:-1]] - 1) * 100
+    extreme_returns = (np.abs(recomputed) > max_abs_return) & (factors == 1) & ~nonpositive
+
+    # 文件自带的涨跌幅与收盘价不一致，典型情况是第一行按被删掉的历史计算
+    column = _return_column(df)
+    if column is None:
+        return_mismatch = np.zeros(len(df), dtype=bool)
+    else:
+        stored = df[column].to_numpy(dtype=np.float64)
+        return_mismatch = ~np.isclose(stored, recomputed, rtol=1e-3, atol=1e-2, equal_nan=True)
+        return_mismatch &= ~(np.isnan(stored) & np.isnan(recomputed))
+
+    return {
+        'missing': missing,
+        'nonpositive': nonpositive,
+        'ohlc_inconsistent': ohlc_inconsistent,
+        'extreme_returns': extreme_returns,
+        'return_mismatch': return_mismatch,
+        'split_factors': factors,
+    }
+
+
+def _trim_before_long_gap(dates, max_gap_sessions, exchange):
+    # 最后一个缺失交易日超过 max_gap_sessions 的断层之后的第一行
+    calendar = get_calendar(exchange)
+    missing = np.busday_count(dates[:-1] + 1, dates[1:], busdaycal=calendar)
+    long_gaps = np.flatnonzero(missing > max_gap_sessions)
+    return int(long_gaps[-1]) + 1 if len(long_gaps) else 0
+
+
+def repair_prices(df, start_date=None, max_gap_sessions=None, exchange='NYSE',
+                  max_abs_return=50.0, date_column='date'):
+    """
+    修复或截断有问题的行情数据
+
+    处理顺序：
+      1. 按日期排序，去掉重复日期（保留最后一条）
+      2. 去掉价格缺失（NaN）的行，只删除这些行本身，不影响前后的数据
+      3. 截掉 start_date 之前的数据，以及最后一个长断层（缺失交易日数 > max_gap_sessions）之前的数据
+      4. 截掉最后一个非正价格及之前的数据（例如前复权做减法后出现的负价格）
+      5. 修正 high/low 使其包含 open/close
+      6. 按识别出的拆股因子向前复权（价格除以因子，成交量乘以因子）
+      7. 按收盘价重新计算涨跌幅，第一行为 NaN
+
+    单日涨跌幅异常（extreme_returns）只在报告中列出，不做修改。
+
+    Args:
+        df (pd.DataFrame): 行情数据
+        start_date: 可信数据的起始日期，例如 '2011-04-26'
+        max_gap_sessions (int): 长断层阈值，None 表示不按断层截断
+        exchange (str): 判断断层使用的交易所日历
+        max_abs_return (float): 异常涨跌幅阈值（百分比）
+        date_column (str): 日期列名
+
+    Returns:
+        tuple: (修复后的 DataFrame, 问题报告 dict)
+    """
+    df = df.copy()
+    df[date_column] = pd.to_datetime(df[date_column])
+    df = df.sort_values(date_column)
+    rows_in = len(df)
+    duplicated = df[date_column].duplicated(keep='last').to_numpy()
+    df = df[~duplicated].reset_index(drop=True)
+
+    present = [c for c in PRICE_COLUMNS if c in df.columns]
+    missing = np.isnan(df[present].to_numpy(dtype=np.float64)).any(axis=1)
+    df = df[~missing].reset_index(drop=True)
+
+    issues = validate_prices(df, max_abs_return)
+    dates = df[date_column].to_numpy().astype('datetime64[D]')
+
+    # 需要截掉的前导行数
+    start = 0
+    if start_date is not None:
+        start = int(np.searchsorted(dates, np.datetime64(start_date, 'D')))
+    if max_gap_sessions is not None and len(dates) > 1:
+        start = max(start, _trim_before_long_gap(dates, max_gap_sessions, exchange))
+    bad = np.flatnonzero(issues['nonpositive'])
+    if len(bad):
+        start = max(start, int(bad[-1]) + 1)
+
+    df = df.iloc[start:].reset_index(drop=True)
+    factors = issues['split_factors'][start:].copy()
+    if len(factors):
+        factors[0] = 1.0
+
+    if {'open', 'high', 'low', 'close'} <= set(df.columns):
+        df['high'] = df[PRICE_COLUMNS].max(axis=1)
+        df['low'] = df[PRICE_COLUMNS].min(axis=1)
+
+    # 拆股因子在当天及之后生效，之前的价格要除以之后所有因子的乘积
+    adjust = np.r_[np.cumprod(factors[::-1])[::-1][1:], 1.0]
+    if np.any(factors != 1):
+        df[present] = df[present].to_numpy(dtype=np.float64) / adjust[:, None]
+        if 'volume' in df.columns:
+            df['volume'] = df['volume'].to_numpy(dtype=np.float64) * adjust
+
+    column = _return_column(df) or RETURN_COLUMNS[0]
+    df[column] = df['close'].pct_change() * 100
+
+    report = {
+        'rows_in': rows_in,
+        'rows_out': len(df),
+        'duplicates': int(duplicated.sum()),
+        'missing': int(missing.sum()),
+        'trimmed': start,
+        'nonpositive': int(issues['nonpositive'].sum()),
+        'ohlc_inconsistent': int(issues['ohlc_inconsistent'][start:].sum()),
+        'return_mismatch': int(issues['return_mismatch'][start:].sum()),
+        'splits': [(str(d), float(f)) for d, f in zip(dates[start:][factors != 1], factors[factors != 1])],
+        # 截断后的第一行没有可比的前一天，不计入
+        'extreme_returns': [str(d) for d in dates[start + 1:][issues['extreme_returns'][start + 1:]]],
+    }
+    return df, report
+
+
+def clean_csv(input_path, output_path, **kwargs):
+    """
+    读取原始行情CSV，修复后写出
+
+    Args:
+        input_path (str): 原始CSV路径
+        output_path (str): 修复后CSV路径
+        **kwargs: 传给 repair_prices 的参数
+
+    Returns:
+        dict: 问题报告
+    """
+    date_column = kwargs.get('date_column', 'date')
+    df = pd.read_csv(input_path)
+    clean, report = repair_prices(df, **kwargs)
+    clean[date_column] = clean[date_column].dt.strftime('%Y-%m-%d')
+    clean.to_csv(output_path, index=False, encoding='utf-8-sig')
+    report['file'] = input_path
+    return report
@@ -0,0 +1,121 @@
+import numpy as np
+
+from . import profiling
+from .plotting import comparison_series, get_pyplot, setup_comparison_axes
+
+
+def decimate_minmax(y, width):
+    """
+    把长序列抽稀到输出像素宽度，同时保留每个像素内的最小/最大值包络
+
+    序列按行号均分成 width 个桶，每个桶保留第一个点、最小值点、最大值点和最后一个点，
+    最多 4 * width 个点，画出来与原序列在该分辨率下看不出差别。
+
+    Args:
+        y: 数值序列
+        width (int): 输出宽度（像素数）
+
+    Returns:
+        np.ndarray: 保留下来的行号（升序）
+    """
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    if n <= 4 * width:
+        return np.arange(n)
+
+    edges = np.linspace(0, n, width + 1).astype(np.intp)[:-1]
+    index = np.arange(n)
+    bucket = np.repeat(np.arange(width), np.diff(np.r_[edges, n]))
+
+    low = np.where(np.isnan(y), np.inf, y)
+    high = np.where(np.isnan(y), -np.inf, y)
+    bucket_min = np.minimum.reduceat(low, edges)
+    bucket_max = np.maximum.reduceat(high, edges)
+    argmin = np.minimum.reduceat(np.where(low == bucket_min[bucket], index, n), edges)
+    argmax = np.minimum.reduceat(np.where(high == bucket_max[bucket], index, n), edges)
+    last = np.r_[edges[1:], n] - 1
+
+    keep = np.concatenate([edges, argmin, argmax, last])
+    return np.unique(keep[keep < n])
+
+
+class ReportRenderer:
+    """
+    无界面批量出图：使用 Agg 后端，不调用 show()，多个标的复用同一组 figure/axes
+
+    第一次 render() 时创建线条，之后只替换线条数据并重新缩放坐标轴，
+    每条线都先抽稀到坐标轴的像素宽度，避免 matplotlib 绘制上百万个顶点。
+    输出内容与 plotting.plot_comparison 的两张图相同。
+
+    Args:
+        dpi (int): 保存图片的分辨率
+        decimate (bool): 是否按像素宽度抽稀
+    """
+
+    def __init__(self, dpi=100, decimate=True):
+        plt = get_pyplot(headless=True)
+        self.plt = plt
+        self.dpi = dpi
+        self.decimate = decimate
+        self.lines = None
+
+        self.fig, axes = plt.subplots(2, 2, figsize=(20, 12), dpi=dpi)
+        self.axes = axes.ravel()
+        self.norm_fig, self.norm_ax = plt.subplots(figsize=(16, 10), dpi=dpi)
+
+    def _axis(self, i):
+        return self.norm_ax if i == 4 else self.axes[i]
+
+    def render(self, df, name, comprehensive_path, normalized_path):
+        """
+        渲染一个标的的两张图并保存
+
+        Args:
+            df (pd.DataFrame): 与 QQQ_daily_with_3x_leverage.csv 相同列的数据
+            name (str): 标的名称，用于标题和图例
+            comprehensive_path (str): 四宫格分析图保存路径
+            normalized_path (str): 标准化对比图保存路径
+        """
+        dates = df['date'].to_numpy()
+        first = self.lines is None
+        if first:
+            setup_comparison_axes(self.axes, self.norm_ax, self.plt)
+            self.lines = []
+
+        for k, (i, values, color, label, style, width) in enumerate(comparison_series(df)):
+            values = values.to_numpy(dtype=np.float64)
+            ax = self._axis(i)
+            if self.decimate:
+                keep = decimate_minmax(values, max(int(ax.bbox.width), 1))
+                x, y = dates[keep], values[keep]
+            else:
+                x, y = dates, values
+            if first:
+                line, = ax.plot(x, y, linewidth=width, color=color, alpha=0.8,
+                                linestyle=style, label=label.format(name=name))
+                self.lines.append(line)
+            else:
+                self.lines[k].set_data(x, y)
+                self.lines[k].set_label(label.format(name=name))
+
+        for ax in self.axes:
+            ax.relim()
+            ax.autoscale_view()
+            ax.legend()
+        self.norm_ax.relim()
+        self.norm_ax.autoscale_view()
+        self.norm_ax.legend(loc='upper left', fontsize=10)
+
+        self.fig.suptitle(f'{name} vs 3倍杠杆{name} 投资对比分析', fontsize=20, fontweight='bold')
+        self.norm_ax.set_title(f'{name} vs 3倍杠杆{name} 标准化对比图', fontsize=16, fontweight='bold', pad=20)
+        if first:
+            self.fig.tight_layout()
+            self.norm_fig.tight_layout()
+
+        with profiling.stage('render.savefig'):
+            self.fig.savefig(comprehensive_path, dpi=self.dpi)
+            self.norm_fig.savefig(normalized_path, dpi=self.dpi)
+
+    def close(self):
+        self.plt.close(self.fig)
+        self.plt.close(self.norm_fig)
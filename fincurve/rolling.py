@@ -0,0 +1,81 @@
+import numpy as np
+
+from .dca import buy_day_indices, month_bounds, to_day_array
+
+
+def rolling_dca(prices, dates, horizons=None, amount=1000.0, day_of_month=26, chunk_size=64):
+    """
+    对每一个起始月份、每一个持有期计算定投结果
+
+    每月买入的股数做一次前缀和，任意 [起始月, 起始月 + 持有期) 窗口的
+    持股数都是两个前缀和之差，最终价值为 O(1) 计算。
+    最大回撤需要沿路径计算：对同一个起始月，所有持有期共用一条组合价值路径，
+    先算出运行中的最大回撤，再在各持有期结束日取值。多个起始月按块做二维矩阵运算。
+
+    传入杠杆价格序列（如 leveraged_close 的结果）即可分析杠杆定投，
+    同一条价格路径被所有窗口复用。
+
+    Args:
+        prices: 每个交易日的价格
+        dates: 升序交易日序列
+        horizons: 持有期（月数）列表，默认为 1 到全部月数
+        amount (float): 每月投资金额
+        day_of_month (int): 目标定投日
+        chunk_size (int): 每块处理的起始月份数，用于控制内存
+
+    Returns:
+        dict: final_value、multiple（最终价值/投资总额）、max_drawdown_pct 三个
+            DataFrame，行为起始月份，列为持有期月数；超出数据范围的窗口为 NaN
+    """
+    import pandas as pd
+
+    prices = np.asarray(prices, dtype=np.float64)
+    days = to_day_array(dates)
+    n = len(days)
+    buy_index = buy_day_indices(days, day_of_month)
+    _, month_ends = month_bounds(days)
+    n_months = len(buy_index)
+    if horizons is None:
+        horizons = np.arange(1, n_months + 1)
+    horizons = np.asarray(horizons, dtype=np.int64)
+
+    # 每月买入股数及其前缀和，prefix[k] 为前 k 个月买入的总股数
+    shares = amount / prices[buy_index]
+    prefix = np.r_[0.0, np.cumsum(shares)]
+
+    starts = np.arange(n_months)[:, None]
+    last_month = starts + horizons[None, :] - 1
+    valid = last_month < n_months
+    last_month = np.minimum(last_month, n_months - 1)
+    end_day = month_ends[last_month]
+
+    final_value = (prefix[last_month + 1] - prefix[starts]) * prices[end_day]
+    final_value[~valid] = np.nan
+    invested = horizons[None, :] * amount
+
+    # 每个交易日的累计持股数（含当天买入）
+    bought = np.zeros(n)
+    bought[buy_index] = shares
+    cumulative = np.cumsum(bought)
+
+    max_drawdown = np.full((n_months, len(horizons)), np.nan)
+    columns = np.arange(n)
+    for lo in range(0, n_months, chunk_size):
+        hi = min(lo + chunk_size, n_months)
+        first_day = buy_index[lo:hi, None]
+        held = cumulative[None, :] - prefix[lo:hi, None]
+        values = np.where(columns[None, :] >= first_day, held * prices[None, :], 0.0)
+        peak = np.maximum.accumulate(values, axis=1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            drawdown = np.where(peak > 0, (values - peak) / peak, 0.0)
+        running = np.minimum.accumulate(drawdown, axis=1)
+        max_drawdown[lo:hi] = np.take_along_axis(running, end_day[lo:hi], axis=1) * 100
+    max_drawdown[~valid] = np.nan
+
+    index = pd.PeriodIndex(days[buy_index], freq='M', name='start_month')
+    columns = pd.Index(horizons, name='horizon_months')
+    return {
+        'final_value': pd.DataFrame(final_value, index=index, columns=columns),
+        'multiple': pd.DataFrame(final_value / invested, index=index, columns=columns),
+        'max_drawdown_pct': pd.DataFrame(max_drawdown, index=index, columns=columns),
+    }
@@ -0,0 +1,108 @@
+import glob
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from . import profiling
+from .data import read_prices, returns_pct
+from .dca import simulate_dca, to_day_array
+from .leverage import leveraged_close
+from .sweep import max_drawdown_rows
+
+
+def expand_paths(paths):
+    """
+    把 glob 模式或文件列表展开成去重、排序后的文件列表
+    """
+    if isinstance(paths, str):
+        paths = [paths]
+    files = []
+    for pattern in paths:
+        matched = glob.glob(pattern)
+        files.extend(matched if matched else [pattern])
+    return sorted(set(files))
+
+
+def backtest_file(file_path, leverage=3.0, amount=1000.0, day_of_month=26, daily_drag=0.0):
+    """
+    对单个行情文件运行定投 + 杠杆回测
+
+    只返回紧凑的 numpy 数组和汇总数值，不返回 DataFrame，
+    这样在进程池中传回主进程时序列化开销很小。
+
+    Args:
+        file_path (str): 行情CSV文件路径
+        leverage (float): 杠杆倍数
+        amount (float): 每月投资金额
+        day_of_month (int): 目标定投日
+        daily_drag (float): 每日费用/融资成本（小数）
+
+    Returns:
+        dict: 日期(datetime64[D])、累计投资、原始/杠杆组合价值、杠杆收盘价及汇总指标
+    """
+    with profiling.stage('runner.backtest_file') as timer:
+        df = read_prices(file_path)
+        dates = to_day_array(df['date'])
+        close = df['close'].to_numpy(dtype=np.float64)
+        if not (close > 0).all():
+            # 非正价格会让组合价值和回撤失去意义（例如未修复的 TQQQ 原始数据）
+            raise ValueError(f'{file_path} 含有非正或缺失的收盘价，请先用 fincurve.quality.repair_prices 修复')
+
+        base = simulate_dca(close, dates, amount, day_of_month)
+        lev_close = leveraged_close(returns_pct(df), close[0], leverage, daily_drag)
+        lev = simulate_dca(lev_close, dates, amount, day_of_month)
+
+        invested = base['investment_total'][-1]
+        drawdowns = max_drawdown_rows(np.vstack([base['portfolio_value'], lev['portfolio_value']]))
+        timer.add_rows(len(dates))
+    return {
+        'file': file_path,
+        'dates': dates,
+        'investment_total': base['investment_total'],
+        'portfolio_value': base['portfolio_value'],
+        'leveraged_close': lev_close,
+        'leveraged_portfolio_value': lev['portfolio_value'],
+        'summary': {
+            'rows': len(dates),
+            'investment_total': invested,
+            'final_value': base['portfolio_value'][-1],
+            'leveraged_final_value': lev['portfolio_value'][-1],
+            'max_drawdown_pct': drawdowns[0],
+            'leveraged_max_drawdown_pct': drawdowns[1],
+        },
+    }
+
+
+def _backtest_job(args):
+    file_path, params = args
+    return backtest_file(file_path, **params)
+
+
+def run_backtests(paths, processes=None, chunksize=None, **params):
+    """
+    在多个行情文件上并行运行回测
+
+    Args:
+        paths: glob 模式或文件路径列表
+        processes (int): 进程数，默认使用全部CPU核；为1时在当前进程串行执行
+        chunksize (int): 每次分发给一个进程的文件数，默认按每个进程约4批自动计算
+        **params: 传给 backtest_file 的回测参数
+
+    Returns:
+        dict: 文件路径 -> backtest_file 的结果
+    """
+    files = expand_paths(paths)
+    jobs = [(file_path, params) for file_path in files]
+    if processes is None:
+        processes = os.cpu_count() or 1
+    processes = min(processes, len(jobs))
+
+    if processes <= 1:
+        results = [_backtest_job(job) for job in jobs]
+    else:
+        if chunksize is None:
+            chunksize = max(1, len(jobs) // (processes * 4))
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            results = list(pool.map(_backtest_job, jobs, chunksize=chunksize))
+    return {result['file']: result for result in results}
@@ -0,0 +1,125 @@
+import numpy as np
+
+from .dca import month_bounds, to_day_array
+
+# 1970-01-01 是星期四，加 3 后按 7 整除即为以星期一开始的周编号
+_EPOCH_WEEKDAY_SHIFT = 3
+
+
+def _weekday(days):
+    # 星期一为0，星期日为6
+    return (days.astype(np.int64) + _EPOCH_WEEKDAY_SHIFT) % 7
+
+
+class TradingDayIndex:
+    """
+    一份交易日历上预先计算好的日期索引
+
+    构造时只做一次：日期转换、按月和按周分段。之后各种定投日规则都是
+    对目标日期做一次 np.searchsorted，返回买入日的行号数组，
+    可以直接传给 simulate_dca(buy_index=...) 或作为其他模拟的输入。
+    同一份日历上跑多个情景时应复用同一个对象。
+
+    所有规则的共同约定：取目标日期当天或之后的第一个交易日；
+    如果该交易日已经超出当前周期（月/周），则取本周期最后一个交易日。
+    """
+
+    def __init__(self, dates):
+        """
+        Args:
+            dates: 严格升序的交易日序列
+        """
+        self.days = to_day_array(dates)
+        if np.any(self.days[1:] <= self.days[:-1]):
+            raise ValueError('日期必须严格升序且不能重复')
+        self.month_starts, self.month_ends = month_bounds(self.days)
+        self.months = self.days[self.month_starts].astype('datetime64[M]')
+
+        weeks = (self.days.astype(np.int64) + _EPOCH_WEEKDAY_SHIFT) // 7
+        self.week_starts = np.flatnonzero(np.r_[True, weeks[1:] != weeks[:-1]])
+        self.week_ends = np.r_[self.week_starts[1:], len(self.days)] - 1
+        self.weeks = weeks[self.week_starts]
+
+    def __len__(self):
+        return len(self.days)
+
+    def _on_or_after(self, targets, period_ends):
+        # 目标日期之后的第一个交易日，超出本周期时退回到周期最后一个交易日
+        index = np.searchsorted(self.days, targets)
+        return np.where(index <= period_ends, index, period_ends)
+
+    def monthly(self, day_of_month=26):
+        """
+        每月 day_of_month 号或之后的第一个交易日，与 buy_day_indices 规则相同
+        """
+        targets = self.months.astype('datetime64[D]') + (max(day_of_month, 1) - 1)
+        return self._on_or_after(targets, self.month_ends)
+
+    def nth_weekday(self, n=1, weekday=4):
+        """
+        每月第 n 个星期 weekday（星期一为0），例如 n=3, weekday=4 为每月第三个星期五
+
+        当天不是交易日时顺延到之后的第一个交易日。
+        """
+        if not 1 <= n <= 5:
+            raise ValueError('n 必须在 1 到 5 之间')
+        first = self.months.astype('datetime64[D]')
+        targets = first + (weekday - _weekday(first)) % 7 + 7 * (n - 1)
+        return self._on_or_after(targets, self.month_ends)
+
+    def trading_day_of_month(self, k=0):
+        """
+        每月第 k 个交易日（从0开始），负数表示倒数，例如 -1 为每月最后一个交易日
+
+        当月交易日不足时取最接近的一端。
+        """
+        if k >= 0:
+            return np.minimum(self.month_starts + k, self.month_ends)
+        return np.maximum(self.month_ends + k + 1, self.month_starts)
+
+    def weekly(self, weekday=0, every=1):
+        """
+        每 every 周的星期 weekday（星期一为0）或之后的第一个交易日
+
+        every=2 即双周定投，从数据的第一周开始计数。
+        """
+        if every < 1:
+            raise ValueError('every 必须大于等于1')
+        keep = (self.weeks - self.weeks[0]) % every == 0
+        mondays = (self.weeks[keep] * 7 - _EPOCH_WEEKDAY_SHIFT).astype('datetime64[D]')
+        return self._on_or_after(mondays + weekday, self.week_ends[keep])
+
+    def biweekly(self, weekday=0):
+        """
+        双周定投，等价于 weekly(weekday, every=2)
+        """
+        return self.weekly(weekday, every=2)
+
+
+def value_averaging(prices, buy_index, amount=1000.0, growth=0.0, allow_sell=False):
+    """
+    价值平均法：每期投入使持仓价值达到目标路径，而不是固定金额
+
+    第 k 期（从0开始）的目标价值为 amount × Σ_{j=0..k} (1 + growth)^j，
+    即每期目标增加 amount，并按每期 growth 的速度复利增长。
+    应持股数 = 目标价值 / 当期价格。不允许卖出时持股数只增不减，
+    等于应持股数的前缀最大值，所以整个过程不需要逐期循环。
+
+    Args:
+        prices: 每个交易日的价格
+        buy_index: 买入日行号（例如 TradingDayIndex.monthly() 的结果）
+        amount (float): 目标价值每期增加的金额
+        growth (float): 目标价值每期的增长率（小数）
+        allow_sell (bool): 价值超过目标时是否卖出
+
+    Returns:
+        np.ndarray: 与 buy_index 一一对应的投入金额（卖出为负数），
+            可直接作为 simulate_dca 的 amount
+    """
+    prices = np.asarray(prices, dtype=np.float64)[buy_index]
+    periods = np.arange(len(prices))
+    target = amount * np.cumsum((1.0 + growth) ** periods)
+    shares = target / prices
+    if not allow_sell:
+        shares = np.maximum.accumulate(shares)
+    return np.diff(shares, prepend=0.0) * prices
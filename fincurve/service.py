@@ -0,0 +1,340 @@
+"""
+本地回测查询服务
+
+启动时把各标的行情一次性读入内存（numpy 数组），之后每个查询只做切片和
+向量化计算，不再重复启动解释器、导入 pandas、解析 CSV。HTTP 部分基于
+asyncio 标准库实现，不需要额外依赖；回测计算放在线程池中执行
+（主要耗时在 numpy 中，会释放 GIL），并发请求互不阻塞。
+
+接口（均返回 JSON）:
+    GET  /health
+    GET  /tickers
+    GET  /backtest?ticker=QQQ&leverage=3&amount=1000&schedule=monthly&day_of_month=26
+                  &start=2015-01-01&end=2020-12-31&daily_drag=0&series=0
+    POST /backtest   请求体为同样参数的 JSON 对象
+
+schedule 为 TradingDayIndex 的规则名称，各规则使用的参数:
+    monthly(day_of_month)、nth_weekday(n, weekday)、trading_day_of_month(k)、
+    weekly(weekday, every)、biweekly(weekday)
+"""
+import asyncio
+import glob
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qsl, urlsplit
+
+import numpy as np
+
+from .data import read_prices, returns_pct
+from .dca import simulate_dca, to_day_array
+from .leverage import leveraged_close
+from .quality import repair_prices
+from .schedule import TradingDayIndex
+from .sweep import max_drawdown_rows
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+
+# 定投日规则 -> 该规则接受的参数及默认值
+SCHEDULE_PARAMS = {
+    'monthly': {'day_of_month': 26},
+    'nth_weekday': {'n': 1, 'weekday': 4},
+    'trading_day_of_month': {'k': 0},
+    'weekly': {'weekday': 0, 'every': 1},
+    'biweekly': {'weekday': 0},
+}
+
+# 标的 -> 可信数据的起始日期，加载时传给 repair_prices
+# TQQQ 文件 2014-04-16 之前的价格有误（出现负价格）
+START_DATES = {'TQQQ': '2014-04-16'}
+
+# 请求体大小上限
+MAX_BODY_BYTES = 1 << 20
+
+_REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+            413: 'Payload Too Large', 500: 'Internal Server Error'}
+
+
+class QueryError(ValueError):
+    """
+    查询参数错误，返回 400
+    """
+
+
+def load_series(data_dir='.', pattern='*_daily.csv', start_dates=None):
+    """
+    读取数据目录下的行情文件，文件名第一段作为标的名称（QQQ_daily.csv -> QQQ）
+
+    每个文件都先经过 repair_prices：截掉非正价格及之前的数据、去掉缺失价格的行、
+    按收盘价重新计算涨跌幅，避免未修复的原始数据（如 TQQQ_daily.csv）得到无意义的结果。
+
+    Args:
+        data_dir (str): 行情 CSV 所在目录
+        pattern (str): 文件名模式
+        start_dates (dict): 标的 -> 可信数据的起始日期，默认为 START_DATES
+
+    Returns:
+        dict: 标的名称 -> {'days': datetime64[D], 'close': float64, 'returns_pct': float64}
+    """
+    start_dates = START_DATES if start_dates is None else start_dates
+    series = {}
+    for file_path in sorted(glob.glob(os.path.join(data_dir, pattern))):
+        ticker = os.path.basename(file_path).split('_')[0].upper()
+        df, _ = repair_prices(read_prices(file_path), start_date=start_dates.get(ticker))
+        if len(df) < 2:
+            continue
+        series[ticker] = {
+            'days': to_day_array(df['date']),
+            'close': df['close'].to_numpy(dtype=np.float64),
+            'returns_pct': returns_pct(df),
+        }
+    return series
+
+
+def _number(params, name, default, kind=float):
+    value = params.get(name, default)
+    try:
+        number = kind(value)
+    except (TypeError, ValueError, OverflowError):
+        raise QueryError(f'{name} 不是有效的数值: {value!r}') from None
+    if not np.isfinite(number):
+        raise QueryError(f'{name} 必须是有限的数值: {value!r}')
+    return number
+
+
+def _day(params, name):
+    value = params.get(name)
+    if value in (None, ''):
+        return None
+    try:
+        return np.datetime64(str(value)[:10], 'D')
+    except ValueError:
+        raise QueryError(f'{name} 不是有效的日期: {value!r}') from None
+
+
+def _flag(params, name):
+    value = params.get(name, False)
+    if isinstance(value, str):
+        return value.lower() in ('1', 'true', 'yes')
+    return bool(value)
+
+
+class BacktestService:
+    """
+    常驻内存的回测服务
+
+    Args:
+        series (dict): load_series() 的结果
+        workers (int): 回测线程数
+    """
+
+    def __init__(self, series, workers=4):
+        if not series:
+            raise ValueError('没有可用的行情数据')
+        self.series = series
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='backtest')
+        self.requests = 0
+
+    def tickers(self):
+        return {
+            ticker: {'rows': len(item['days']), 'start': str(item['days'][0]), 'end': str(item['days'][-1])}
+            for ticker, item in self.series.items()
+        }
+
+    def backtest(self, params):
+        """
+        运行一次原始 / 杠杆定投对比回测（同步，在线程池中调用）
+
+        Args:
+            params (dict): 查询参数，见模块说明
+
+        Returns:
+            dict: 参数回显、汇总指标，series 为真时另含逐日序列
+        """
+        start_time = time.perf_counter()
+        ticker = str(params.get('ticker', 'QQQ')).upper()
+        if ticker not in self.series:
+            raise QueryError(f'未知的标的: {ticker}，可用: {sorted(self.series)}')
+        item = self.series[ticker]
+        leverage = _number(params, 'leverage', 3.0)
+        amount = _number(params, 'amount', 1000.0)
+        if amount <= 0:
+            raise QueryError(f'amount 必须大于0: {amount}')
+        daily_drag = _number(params, 'daily_drag', 0.0)
+        rule = params.get('schedule', 'monthly')
+        if not isinstance(rule, str) or rule not in SCHEDULE_PARAMS:
+            raise QueryError(f'未知的定投日规则: {rule}，可用: {sorted(SCHEDULE_PARAMS)}')
+        kwargs = {name: _number(params, name, default, int) for name, default in SCHEDULE_PARAMS[rule].items()}
+
+        days = item['days']
+        start, end = _day(params, 'start'), _day(params, 'end')
+        lo = 0 if start is None else int(np.searchsorted(days, start, side='left'))
+        hi = len(days) if end is None else int(np.searchsorted(days, end, side='right'))
+        if hi - lo < 2:
+            raise QueryError('日期区间内的交易日少于2天')
+        days = days[lo:hi]
+        close = item['close'][lo:hi]
+
+        try:
+            buy_index = getattr(TradingDayIndex(days), rule)(**kwargs)
+        except ValueError as exc:
+            raise QueryError(str(exc)) from None
+        if len(buy_index) == 0:
+            raise QueryError('日期区间内没有定投日')
+        lev_close = leveraged_close(item['returns_pct'][lo:hi], close[0], leverage, daily_drag)
+        base = simulate_dca(close, days, amount, buy_index=buy_index)
+        lev = simulate_dca(lev_close, days, amount, buy_index=buy_index)
+
+        invested = float(base['investment_total'][-1])
+        drawdowns = max_drawdown_rows(np.vstack([base['portfolio_value'], lev['portfolio_value']]))
+        summary = {'investment_total': invested, 'buys': len(buy_index)}
+        for key, result, drawdown in [('base', base, drawdowns[0]), ('leveraged', lev, drawdowns[1])]:
+            final = float(result['portfolio_value'][-1])
+            summary[key] = {
+                'final_value': final,
+                'return_pct': (final / invested - 1) * 100,
+                'max_drawdown_pct': float(drawdown),
+            }
+
+        response = {
+            'ticker': ticker,
+            'leverage': leverage,
+            'amount': amount,
+            'daily_drag': daily_drag,
+            'schedule': {'rule': rule, **kwargs},
+            'start': str(days[0]),
+            'end': str(days[-1]),
+            'rows': len(days),
+            'summary': summary,
+        }
+        if _flag(params, 'series'):
+            response['series'] = {
+                'date': days.astype(str).tolist(),
+                'investment_total': base['investment_total'].tolist(),
+                'portfolio_value': base['portfolio_value'].tolist(),
+                'leveraged_close': lev_close.tolist(),
+                'leveraged_portfolio_value': lev['portfolio_value'].tolist(),
+            }
+        response['seconds'] = time.perf_counter() - start_time
+        return response
+
+    async def dispatch(self, method, target, body):
+        """
+        处理一个请求，返回 (状态码, JSON 对象)
+        """
+        url = urlsplit(target)
+        params = dict(parse_qsl(url.query))
+        if url.path == '/health':
+            return 200, {'status': 'ok', 'tickers': len(self.series), 'requests': self.requests}
+        if url.path == '/tickers':
+            return 200, self.tickers()
+        if url.path != '/backtest':
+            return 404, {'error': f'未知的路径: {url.path}'}
+        if method == 'POST':
+            try:
+                params.update(json.loads(body or b'{}'))
+            except (ValueError, TypeError):
+                return 400, {'error': '请求体不是有效的 JSON 对象'}
+        elif method != 'GET':
+            return 405, {'error': f'不支持的方法: {method}'}
+        loop = asyncio.get_running_loop()
+        try:
+            return 200, await loop.run_in_executor(self.executor, self.backtest, params)
+        except QueryError as exc:
+            return 400, {'error': str(exc)}
+
+    async def handle(self, reader, writer):
+        # 一个连接上可以连续处理多个请求（HTTP/1.1 keep-alive）
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                try:
+                    method, target, version = request_line.decode('latin-1').split()
+                except ValueError:
+                    await self._respond(writer, 400, {'error': '无效的请求行'}, False)
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+
+                try:
+                    length = int(headers.get('content-length') or 0)
+                except ValueError:
+                    await self._respond(writer, 400, {'error': '无效的 Content-Length'}, False)
+                    break
+                if length > MAX_BODY_BYTES:
+                    await self._respond(writer, 413, {'error': '请求体过大'}, False)
+                    break
+                body = await reader.readexactly(length) if length else b''
+                keep_alive = (headers.get('connection', '').lower() != 'close'
+                              and version.upper() == 'HTTP/1.1')
+
+                self.requests += 1
+                try:
+                    status, payload = await self.dispatch(method.upper(), target, body)
+                except Exception as exc:  # noqa: BLE001 - 返回 500，服务继续运行
+                    status, payload = 500, {'error': repr(exc)}
+                await self._respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _respond(writer, status, payload, keep_alive):
+        try:
+            body = json.dumps(payload, ensure_ascii=False, allow_nan=False).encode('utf-8')
+        except ValueError:
+            # NaN / inf 不是合法的 JSON
+            status = 500
+            body = json.dumps({'error': '结果中含有 NaN 或无穷大'}, ensure_ascii=False).encode('utf-8')
+        head = (f'HTTP/1.1 {status} {_REASONS.get(status, "")}\r\n'
+                'Content-Type: application/json; charset=utf-8\r\n'
+                f'Content-Length: {len(body)}\r\n'
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+        writer.write(head.encode('latin-1') + body)
+        await writer.drain()
+
+    async def start(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        """
+        开始监听，返回 asyncio.Server（port=0 时由系统分配端口）
+        """
+        return await asyncio.start_server(self.handle, host, port)
+
+    def close(self):
+        self.executor.shutdown(wait=False)
+
+
+def serve(data_dir='.', host=DEFAULT_HOST, port=DEFAULT_PORT, workers=4, log=print):
+    """
+    读取行情并启动服务，直到被中断
+    """
+    log = log or (lambda message: None)
+    start = time.perf_counter()
+    service = BacktestService(load_series(data_dir), workers)
+    log(f"已加载 {len(service.series)} 个标的（{', '.join(service.series)}），"
+        f"用时 {time.perf_counter() - start:.2f} 秒")
+
+    async def main():
+        server = await service.start(host, port)
+        address = server.sockets[0].getsockname()
+        log(f"服务地址 http://{address[0]}:{address[1]}/")
+        async with server:
+            await server.serve_forever()
+
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.close()
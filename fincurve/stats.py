@@ -0,0 +1,203 @@
+import numpy as np
+
+from . import profiling
+
+
+class StreamingStats:
+    """
+    单次遍历、O(1) 内存的收益/风险统计
+
+    可以逐个（update）或按块（update_many）输入价格或组合价值，
+    随时通过 result() 得到运行峰值、最大回撤（含起止日期）、年化收益率、
+    波动率和夏普比率。块内计算是向量化的，块与块之间只保留少量标量状态，
+    因此可以处理比内存更大的文件，也可以在新K线到达时实时更新。
+
+    最大回撤与 plot_comprehensive_chart.py 原先的 expanding().max() 算法一致，
+    基于原始数值计算；数值为0（例如首次定投之前）的位置不参与。
+    收益率序列可以传入每日的资金流入（定投金额）以剔除入金的影响。
+    """
+
+    def __init__(self, periods_per_year=252, risk_free=0.0):
+        self.periods_per_year = periods_per_year
+        self.risk_free = risk_free
+
+        self.count = 0
+        self.first_value = None
+        self.first_date = None
+        self.last_value = None
+        self.last_date = None
+
+        self.peak = -np.inf
+        self.peak_date = None
+        self.max_drawdown = 0.0
+        self.drawdown_start = None
+        self.drawdown_end = None
+
+        # 日收益率的 Welford 累积量
+        self.n_returns = 0
+        self.mean_return = 0.0
+        self.m2_return = 0.0
+
+    def update(self, value, date=None, flow=0.0):
+        """
+        输入一个新的数值
+        """
+        self.update_many([value], None if date is None else [date], [flow])
+
+    def update_many(self, values, dates=None, flows=None):
+        """
+        输入一块按时间顺序排列的数值
+
+        Args:
+            values: 价格或组合价值
+            dates: 对应日期，可选
+            flows: 对应的当日资金流入（如定投金额），可选
+        """
+        values = np.asarray(values, dtype=np.float64)
+        n = len(values)
+        if n == 0:
+            return
+        if dates is not None:
+            dates = np.asarray(dates, dtype='datetime64[D]')
+
+        if self.count == 0:
+            self.first_value = values[0]
+            self.first_date = None if dates is None else dates[0]
+
+        # 运行峰值：块内累计最大值，并接上之前的峰值
+        running = np.maximum.accumulate(np.maximum(values, self.peak))
+        previous = np.r_[self.peak, running[:-1]]
+        peak_pos = np.maximum.accumulate(np.where(values > previous, np.arange(n), -1))
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            drawdown = np.where(running > 0, (values - running) / running, 0.0)
+        j = int(np.argmin(drawdown))
+        if drawdown[j] < self.max_drawdown:
+            self.max_drawdown = drawdown[j]
+            if dates is not None:
+                self.drawdown_start = self.peak_date if peak_pos[j] < 0 else dates[peak_pos[j]]
+                self.drawdown_end = dates[j]
+
+        if running[-1] > self.peak:
+            self.peak = running[-1]
+            if dates is not None:
+                self.peak_date = dates[peak_pos[-1]]
+
+        # 日收益率，第一块的第一个值没有前值
+        prev_values = np.r_[np.nan if self.last_value is None else self.last_value, values[:-1]]
+        gains = values if flows is None else values - np.asarray(flows, dtype=np.float64)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            returns = gains / prev_values - 1.0
+        returns = returns[np.isfinite(returns) & (prev_values > 0)]
+        self._merge_returns(returns)
+
+        self.count += n
+        self.last_value = values[-1]
+        if dates is not None:
+            self.last_date = dates[-1]
+
+    def _merge_returns(self, returns):
+        # Chan 等人的并行方差合并公式
+        n_b = len(returns)
+        if n_b == 0:
+            return
+        mean_b = returns.mean()
+        m2_b = ((returns - mean_b) ** 2).sum()
+        n_a = self.n_returns
+        total = n_a + n_b
+        delta = mean_b - self.mean_return
+        self.mean_return += delta * n_b / total
+        self.m2_return += m2_b + delta * delta * n_a * n_b / total
+        self.n_returns = total
+
+    def years(self):
+        """
+        统计区间的年数：有日期时按自然日计算，否则按样本数计算
+        """
+        if self.first_date is not None and self.last_date is not None:
+            return (self.last_date - self.first_date).astype(np.int64) / 365.25
+        return max(self.count - 1, 0) / self.periods_per_year
+
+    def cagr(self, base=None):
+        """
+        年化收益率（小数）
+
+        Args:
+            base (float): 计算基数，默认为第一个数值；定投组合可以传入累计投资总额
+        """
+        base = self.first_value if base is None else base
+        years = self.years()
+        if not base or years <= 0 or self.last_value is None:
+            return np.nan
+        return (self.last_value / base) ** (1.0 / years) - 1.0
+
+    def volatility(self):
+        """
+        年化波动率（小数）
+        """
+        if self.n_returns < 2:
+            return np.nan
+        return np.sqrt(self.m2_return / (self.n_returns - 1) * self.periods_per_year)
+
+    def sharpe(self):
+        """
+        年化夏普比率
+        """
+        volatility = self.volatility()
+        if not volatility:
+            return np.nan
+        return (self.mean_return * self.periods_per_year - self.risk_free) / volatility
+
+    def result(self, base=None):
+        """
+        返回当前统计结果
+
+        Args:
+            base (float): 年化收益率的计算基数，见 cagr()
+
+        Returns:
+            dict: 统计结果，百分比字段单位为 %
+        """
+        return {
+            'count': self.count,
+            'start_date': self.first_date,
+            'end_date': self.last_date,
+            'final_value': self.last_value,
+            'peak': self.peak if self.count else None,
+            'peak_date': self.peak_date,
+            'max_drawdown_pct': self.max_drawdown * 100,
+            'drawdown_start': self.drawdown_start,
+            'drawdown_end': self.drawdown_end,
+            'cagr_pct': self.cagr(base) * 100,
+            'volatility_pct': self.volatility() * 100,
+            'sharpe': self.sharpe(),
+        }
+
+
+def stream_csv_stats(file_path, value_column, date_column='date', flow_column=None,
+                     chunksize=100_000, **kwargs):
+    """
+    分块读取CSV并计算统计指标，内存占用与文件大小无关
+
+    Args:
+        file_path (str): CSV文件路径
+        value_column (str): 价格或组合价值列名
+        date_column (str): 日期列名
+        flow_column (str): 资金流入列名，可选
+        chunksize (int): 每块行数
+        **kwargs: 传给 StreamingStats 的参数
+
+    Returns:
+        StreamingStats: 累积完成的统计对象
+    """
+    import pandas as pd
+
+    stats = StreamingStats(**kwargs)
+    usecols = [date_column, value_column] + ([flow_column] if flow_column else [])
+    with profiling.stage('stats.stream_csv') as timer:
+        for chunk in pd.read_csv(file_path, usecols=usecols, chunksize=chunksize):
+            flows = chunk[flow_column].to_numpy() if flow_column else None
+            stats.update_many(chunk[value_column].to_numpy(),
+                              pd.to_datetime(chunk[date_column]).to_numpy(), flows)
+            timer.add_rows(len(chunk))
+    return stats
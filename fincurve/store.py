@@ -0,0 +1,143 @@
+import os
+
+import numpy as np
+
+from .data import RETURN_COLUMNS
+
+# 每个交易日一条定长记录
+RECORD_DTYPE = np.dtype([
+    ('date', '<M8[D]'),
+    ('open', '<f8'),
+    ('high', '<f8'),
+    ('low', '<f8'),
+    ('close', '<f8'),
+    ('volume', '<f8'),
+    ('pct_change', '<f8'),
+])
+
+RECORD_SUFFIX = '.bin'
+
+
+class PriceStore:
+    """
+    基于 numpy.memmap 的只追加行情库
+
+    每个标的一个定长记录文件（<root>/<symbol>.bin），按日期升序存放。
+    读取时返回内存映射视图，按日期区间切片不会复制数据，
+    只有被访问到的页才会从磁盘读入。
+
+    视图的字段可以直接传给定投和杠杆函数，例如：
+        view = store.read('QQQ', '2015-01-01', '2020-12-31')
+        simulate_dca(view['close'], view['date'])
+        leveraged_close(view['pct_change'], view['close'][0], 3.0)
+    """
+
+    def __init__(self, root):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    def path(self, symbol):
+        return os.path.join(self.root, symbol + RECORD_SUFFIX)
+
+    def symbols(self):
+        """
+        列出库中所有标的
+        """
+        return sorted(name[:-len(RECORD_SUFFIX)] for name in os.listdir(self.root)
+                      if name.endswith(RECORD_SUFFIX))
+
+    def open(self, symbol):
+        """
+        以只读方式映射标的的全部记录
+
+        Returns:
+            np.memmap: 结构化记录数组（文件不存在或为空时返回空数组）
+        """
+        path = self.path(symbol)
+        if not os.path.exists(path):
+            return np.empty(0, dtype=RECORD_DTYPE)
+        # 末尾不完整的记录（写入中断）直接忽略
+        count = os.path.getsize(path) // RECORD_DTYPE.itemsize
+        if count == 0:
+            return np.empty(0, dtype=RECORD_DTYPE)
+        return np.memmap(path, dtype=RECORD_DTYPE, mode='r', shape=(count,))
+
+    def read(self, symbol, start=None, end=None):
+        """
+        按日期区间读取记录（包含两端），返回零拷贝视图
+
+        Args:
+            symbol (str): 标的代码
+            start: 起始日期，None 表示从头开始
+            end: 结束日期，None 表示到最后
+
+        Returns:
+            np.ndarray: 内存映射的切片视图
+        """
+        records = self.open(symbol)
+        dates = records['date']
+        lo = 0 if start is None else np.searchsorted(dates, np.datetime64(start, 'D'), side='left')
+        hi = len(records) if end is None else np.searchsorted(dates, np.datetime64(end, 'D'), side='right')
+        return records[lo:hi]
+
+    def last_date(self, symbol):
+        """
+        返回已存储的最后一个交易日，没有数据时返回 None
+        """
+        records = self.open(symbol)
+        return records['date'][-1] if len(records) else None
+
+    def append(self, symbol, records):
+        """
+        追加记录，已存储日期及之前的记录会被跳过
+
+        Args:
+            symbol (str): 标的代码
+            records: RECORD_DTYPE 结构化数组，按日期升序
+
+        Returns:
+            int: 实际追加的记录数
+        """
+        records = np.asarray(records, dtype=RECORD_DTYPE)
+        if np.any(records['date'][1:] <= records['date'][:-1]):
+            raise ValueError('追加的记录必须按日期严格升序')
+
+        last = self.last_date(symbol)
+        if last is not None:
+            records = records[records['date'] > last]
+        if len(records) == 0:
+            return 0
+
+        path = self.path(symbol)
+        with open(path, 'ab') as f:
+            # 截掉上次中断留下的不完整记录，保证文件长度是记录长度的整数倍
+            f.truncate(len(self.open(symbol)) * RECORD_DTYPE.itemsize)
+            f.write(records.tobytes())
+        return len(records)
+
+    def append_frame(self, symbol, df, date_column='date'):
+        """
+        把行情 DataFrame（与 QQQ_daily.csv 相同的列）追加到库中
+
+        Returns:
+            int: 实际追加的记录数
+        """
+        return self.append(symbol, frame_to_records(df, date_column))
+
+
+def frame_to_records(df, date_column='date'):
+    """
+    把行情 DataFrame 转换为定长记录数组，缺失的列填 NaN
+    """
+    df = df.sort_values(date_column)
+    records = np.empty(len(df), dtype=RECORD_DTYPE)
+    records['date'] = df[date_column].to_numpy(dtype='datetime64[D]')
+    for field in ('open', 'high', 'low', 'close', 'volume'):
+        records[field] = df[field].to_numpy(dtype=np.float64) if field in df.columns else np.nan
+
+    records['pct_change'] = np.nan
+    for column in RETURN_COLUMNS:
+        if column in df.columns:
+            records['pct_change'] = df[column].to_numpy(dtype=np.float64)
+            break
+    return records
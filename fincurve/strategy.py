@@ -0,0 +1,156 @@
+import numpy as np
+
+from .dca import buy_day_indices
+
+try:
+    from numba import njit
+except ImportError:  # 没有安装 numba 时退回纯 Python 循环
+    njit = None
+
+NUMBA_AVAILABLE = njit is not None
+
+
+def _strategy_kernel(base, lev, contribution, rebalance, target_weight, defensive_weight,
+                     stop_drawdown, resume_drawdown, dip_drawdown, dip_amount,
+                     out_base_shares, out_lev_shares, out_invested, out_value, out_defensive):
+    # 逐日推进的策略内核，只用标量和下标运算，numba 与纯 Python 都能执行
+    base_shares = 0.0
+    lev_shares = 0.0
+    invested = 0.0
+    base_peak = 0.0
+    lev_peak = 0.0
+    defensive = False
+    dipped = False
+
+    for i in range(len(base)):
+        b = base[i]
+        x = lev[i]
+        if b > base_peak:
+            # 标的创新高，结束本轮下跌，下次跌到阈值可以再次加仓
+            base_peak = b
+            dipped = False
+        if x > lev_peak:
+            lev_peak = x
+
+        # 杠杆价格从高点回撤超过 stop_drawdown 时降杠杆，回撤收窄到 resume_drawdown 以内时恢复
+        switched = False
+        if stop_drawdown > 0.0:
+            drawdown = 1.0 - x / lev_peak
+            if not defensive and drawdown >= stop_drawdown:
+                defensive = True
+                switched = True
+            elif defensive and drawdown <= resume_drawdown:
+                defensive = False
+                switched = True
+        weight = defensive_weight if defensive else target_weight
+
+        cash = contribution[i]
+        if dip_amount > 0.0 and not dipped and 1.0 - b / base_peak >= dip_drawdown:
+            cash += dip_amount
+            dipped = True
+        invested += cash
+
+        if rebalance[i] or switched:
+            total = base_shares * b + lev_shares * x + cash
+            lev_shares = total * weight / x
+            base_shares = total * (1.0 - weight) / b
+        elif cash > 0.0:
+            lev_shares += cash * weight / x
+            base_shares += cash * (1.0 - weight) / b
+
+        out_base_shares[i] = base_shares
+        out_lev_shares[i] = lev_shares
+        out_invested[i] = invested
+        out_value[i] = base_shares * b + lev_shares * x
+        out_defensive[i] = defensive
+
+
+if NUMBA_AVAILABLE:
+    _compiled_kernel = njit(cache=True)(_strategy_kernel)
+else:
+    _compiled_kernel = None
+
+
+def _run_kernel(base, lev, contribution, rebalance, *params):
+    n = len(base)
+    if _compiled_kernel is not None:
+        outputs = [np.empty(n) for _ in range(4)] + [np.empty(n, dtype=np.bool_)]
+        _compiled_kernel(base, lev, contribution, rebalance, *params, *outputs)
+        return outputs
+    # 纯 Python 回退：在列表上循环比逐个读写 numpy 标量快一个数量级
+    outputs = [[0.0] * n for _ in range(4)] + [[False] * n]
+    _strategy_kernel(base.tolist(), lev.tolist(), contribution.tolist(), rebalance.tolist(),
+                     *params, *outputs)
+    return [np.asarray(out, dtype=np.float64) for out in outputs[:4]] + [np.asarray(outputs[4], dtype=bool)]
+
+
+def run_strategy(base_prices, leveraged_prices, dates, amount=1000.0, day_of_month=26,
+                 target_weight=1.0, rebalance_months=1, stop_drawdown=None, resume_drawdown=0.0,
+                 defensive_weight=0.0, dip_drawdown=None, dip_amount=0.0):
+    """
+    在标的和杠杆产品之间按路径相关规则定投
+
+    每月定投日投入 amount，按目标权重分配到杠杆产品（weight）和标的（1 - weight）。
+    支持三类可组合的规则：
+        - 定期再平衡：每 rebalance_months 个定投日把整个组合调回目标权重
+        - 回撤降杠杆：杠杆价格从高点回撤达到 stop_drawdown 时，立即把杠杆权重调到
+          defensive_weight；回撤收窄到 resume_drawdown 以内时调回 target_weight
+        - 下跌加仓：标的从高点下跌达到 dip_drawdown 时额外投入 dip_amount，
+          每轮下跌（直到标的创新高前）只加仓一次
+
+    所有交易都按当日收盘价成交。安装了 numba 时内核会被编译，
+    否则使用等价的纯 Python 循环。
+
+    Args:
+        base_prices: 标的每日收盘价（如 QQQ）
+        leveraged_prices: 杠杆产品每日收盘价（如 leveraged_close 的结果）
+        dates: 升序交易日序列
+        amount (float): 每月定投金额，默认为1000
+        day_of_month (int): 目标定投日，默认为26
+        target_weight (float): 杠杆产品的目标权重，1 表示全部买杠杆产品
+        rebalance_months (int): 每隔几个定投日再平衡一次，0 表示从不再平衡
+        stop_drawdown (float): 触发降杠杆的回撤比例（例如 0.3），None 表示不启用
+        resume_drawdown (float): 恢复目标权重的回撤比例，默认 0 即杠杆价格回到前高
+        defensive_weight (float): 降杠杆期间的杠杆产品权重
+        dip_drawdown (float): 触发加仓的标的下跌比例（例如 0.2），None 表示不启用
+        dip_amount (float): 每轮下跌额外投入的金额
+
+    Returns:
+        dict: 与价格等长的数组，包括 monthly_investment（含加仓）、investment_total、
+            base_shares、leveraged_shares、portfolio_value、leveraged_weight、
+            defensive（是否处于降杠杆状态），以及定投日行号 buy_index
+    """
+    base = np.ascontiguousarray(base_prices, dtype=np.float64)
+    lev = np.ascontiguousarray(leveraged_prices, dtype=np.float64)
+    if not len(base) == len(lev) == len(dates):
+        raise ValueError('base_prices、leveraged_prices 与 dates 长度不一致')
+    if not 0.0 <= target_weight <= 1.0 or not 0.0 <= defensive_weight <= 1.0:
+        raise ValueError('权重必须在 0 到 1 之间')
+    if dip_drawdown is not None and dip_drawdown <= 0:
+        raise ValueError('dip_drawdown 必须大于 0')
+
+    buy_index = buy_day_indices(dates, day_of_month)
+    contribution = np.zeros(len(base))
+    contribution[buy_index] = amount
+    rebalance = np.zeros(len(base), dtype=np.bool_)
+    if rebalance_months:
+        rebalance[buy_index[::rebalance_months]] = True
+
+    base_shares, lev_shares, invested, value, defensive = _run_kernel(
+        base, lev, contribution, rebalance,
+        float(target_weight), float(defensive_weight),
+        float(stop_drawdown or 0.0), float(resume_drawdown),
+        float(dip_drawdown or 0.0), float(dip_amount if dip_drawdown is not None else 0.0))
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        weight = np.where(value > 0, lev_shares * lev / value, np.nan)
+    return {
+        'buy_index': buy_index,
+        'monthly_investment': np.diff(invested, prepend=0.0),
+        'investment_total': invested,
+        'base_shares': base_shares,
+        'leveraged_shares': lev_shares,
+        'portfolio_value': value,
+        'leveraged_weight': weight,
+        'defensive': defensive,
+    }
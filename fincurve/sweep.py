@@ -0,0 +1,116 @@
+import numpy as np
+
+from . import profiling
+
+from .dca import buy_day_indices, to_day_array
+from .leverage import leveraged_growth
+
+
+def leveraged_close_matrix(returns_pct, start_price, leverages, daily_drag=0.0):
+    """
+    一次计算多个杠杆倍数的收盘价序列
+
+    Args:
+        returns_pct: 标的每日涨跌幅（百分比）
+        start_price (float): 第一天的收盘价
+        leverages: 杠杆倍数列表
+        daily_drag (float): 每日费用/融资成本（小数）
+
+    Returns:
+        np.ndarray: 形状为 (杠杆个数, 交易日数) 的价格矩阵
+    """
+    leverages = np.asarray(leverages, dtype=np.float64).reshape(-1, 1)
+    growth = leveraged_growth(returns_pct, leverages, daily_drag)
+    return start_price * np.cumprod(growth, axis=1)
+
+
+def max_drawdown_rows(values):
+    """
+    按行计算最大回撤（百分比，负数）
+
+    组合价值在首次定投前为0，这些位置不参与回撤计算。
+    """
+    with profiling.stage('sweep.max_drawdown', rows=np.size(values)):
+        values = np.atleast_2d(values)
+        peak = np.maximum.accumulate(values, axis=1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            drawdown = np.where(peak > 0, (values - peak) / peak, 0.0)
+        return drawdown.min(axis=1) * 100
+
+
+def leverage_sweep(returns_pct, dates, start_price, leverages,
+                   amounts=1000.0, days_of_month=26, daily_drag=0.0):
+    """
+    杠杆倍数 × 定投金额 × 定投日 的网格回测
+
+    所有情景的杠杆价格和组合价值一次性以 (情景数, 交易日数) 矩阵计算，
+    不再逐个情景重跑定投循环。
+
+    Args:
+        returns_pct: 标的每日涨跌幅（百分比）
+        dates: 升序交易日序列
+        start_price (float): 第一天的收盘价
+        leverages: 杠杆倍数列表，例如 np.arange(1.0, 4.01, 0.1)
+        amounts: 每月投资金额，单个数值或列表
+        days_of_month: 目标定投日，单个数值或列表
+        daily_drag (float): 每日费用/融资成本（小数）
+
+    Returns:
+        dict: 包含
+            summary: 每个情景一行的汇总表（最终价值、总收益率、年化收益率、最大回撤）
+            prices: (杠杆个数, 交易日数) 杠杆价格矩阵
+            portfolio_value: (情景数, 交易日数) 组合价值矩阵
+            investment_total: (情景数, 交易日数) 累计投资矩阵
+    """
+    import pandas as pd
+
+    days = to_day_array(dates)
+    leverages = np.atleast_1d(np.asarray(leverages, dtype=np.float64))
+    amounts = np.atleast_1d(np.asarray(amounts, dtype=np.float64))
+    days_of_month = np.atleast_1d(np.asarray(days_of_month, dtype=np.int64))
+    n = len(days)
+
+    prices = leveraged_close_matrix(returns_pct, start_price, leverages, daily_drag)
+
+    # 每个定投日规则对应一行 0/1 买入标记
+    buy_mask = np.zeros((len(days_of_month), n))
+    for row, day in enumerate(days_of_month):
+        buy_mask[row, buy_day_indices(days, day)] = 1.0
+
+    # 展开网格：情景顺序为 杠杆 → 金额 → 定投日
+    lev_idx, amt_idx, dom_idx = np.meshgrid(
+        np.arange(len(leverages)), np.arange(len(amounts)),
+        np.arange(len(days_of_month)), indexing='ij')
+    lev_idx, amt_idx, dom_idx = lev_idx.ravel(), amt_idx.ravel(), dom_idx.ravel()
+
+    scenario_prices = prices[lev_idx]
+    scenario_amounts = amounts[amt_idx][:, None]
+    shares_bought = scenario_amounts * buy_mask[dom_idx] / scenario_prices
+    cumulative_shares = np.cumsum(shares_bought, axis=1)
+    portfolio_value = cumulative_shares * scenario_prices
+    investment_total = scenario_amounts * np.cumsum(buy_mask, axis=1)[dom_idx]
+
+    final_value = portfolio_value[:, -1]
+    invested = investment_total[:, -1]
+    span_days = (days[-1] - days[0]).astype(np.int64)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ratio = final_value / invested
+        cagr = (ratio ** (365.25 / span_days) - 1) * 100 if span_days > 0 else ratio * np.nan
+
+    summary = pd.DataFrame({
+        'leverage': leverages[lev_idx],
+        'amount': amounts[amt_idx],
+        'day_of_month': days_of_month[dom_idx],
+        'investment_total': invested,
+        'final_value': final_value,
+        'total_return_pct': (ratio - 1) * 100,
+        'cagr_pct': cagr,
+        'max_drawdown_pct': max_drawdown_rows(portfolio_value),
+    })
+
+    return {
+        'summary': summary,
+        'prices': prices,
+        'portfolio_value': portfolio_value,
+        'investment_total': investment_total,
+    }
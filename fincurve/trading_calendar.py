@@ -0,0 +1,180 @@
+import datetime
+import functools
+import os
+
+import numpy as np
+
+# 离线生成的交易日历缓存目录，每个交易所一个假日文件：<目录>/<交易所>.npy
+CALENDAR_DIR = os.path.join(os.path.dirname(__file__), 'calendars')
+
+# 默认覆盖的年份范围
+FIRST_YEAR = 1990
+LAST_YEAR = 2040
+
+# NYSE 临时休市日（国葬、飓风、9/11 等），无法由规则推出
+NYSE_SPECIAL_CLOSURES = [
+    '1994-04-27', '2001-09-11', '2001-09-12', '2001-09-13', '2001-09-14',
+    '2004-06-11', '2007-01-02', '2012-10-29', '2012-10-30', '2018-12-05',
+    '2025-01-09',
+]
+
+
+def _easter(year):
+    # 公历复活节（匿名算法）
+    a = year % 19
+    b, c = divmod(year, 100)
+    d, e = divmod(b, 4)
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    month, day = divmod(h + l - 7 * m + 114, 31)
+    return datetime.date(year, month, day + 1)
+
+
+def _nth_weekday(year, month, weekday, n):
+    # 当月第 n 个星期几，n 为负数时从月末倒数
+    if n > 0:
+        first = datetime.date(year, month, 1)
+        return first + datetime.timedelta(days=(weekday - first.weekday()) % 7 + 7 * (n - 1))
+    next_month = datetime.date(year + month // 12, month % 12 + 1, 1)
+    last = next_month - datetime.timedelta(days=1)
+    return last - datetime.timedelta(days=(last.weekday() - weekday) % 7 + 7 * (-n - 1))
+
+
+def _observed(day):
+    # 周六的假日提前到周五，周日的假日顺延到周一
+    if day.weekday() == 5:
+        return day - datetime.timedelta(days=1)
+    if day.weekday() == 6:
+        return day + datetime.timedelta(days=1)
+    return day
+
+
+def nyse_holidays(first_year=FIRST_YEAR, last_year=LAST_YEAR):
+    """
+    按规则生成 NYSE 休市日（只含工作日）
+
+    Returns:
+        np.ndarray: 升序的 datetime64[D] 数组
+    """
+    holidays = []
+    for year in range(first_year, last_year + 1):
+        new_year = datetime.date(year, 1, 1)
+        # 元旦逢周六时 NYSE 不在前一个周五补休
+        if new_year.weekday() != 5:
+            holidays.append(_observed(new_year))
+        if year >= 1998:
+            holidays.append(_nth_weekday(year, 1, 0, 3))   # 马丁·路德·金纪念日
+        holidays.append(_nth_weekday(year, 2, 0, 3))       # 总统日
+        holidays.append(_easter(year) - datetime.timedelta(days=2))  # 耶稣受难日
+        holidays.append(_nth_weekday(year, 5, 0, -1))      # 阵亡将士纪念日
+        if year >= 2022:
+            holidays.append(_observed(datetime.date(year, 6, 19)))  # 六月节
+        holidays.append(_observed(datetime.date(year, 7, 4)))       # 独立日
+        holidays.append(_nth_weekday(year, 9, 0, 1))       # 劳动节
+        holidays.append(_nth_weekday(year, 11, 3, 4))      # 感恩节
+        holidays.append(_observed(datetime.date(year, 12, 25)))     # 圣诞节
+
+    special = np.array(NYSE_SPECIAL_CLOSURES, dtype='datetime64[D]')
+    years = special.astype('datetime64[Y]').astype(np.int64) + 1970
+    days = np.union1d(np.array(holidays, dtype='datetime64[D]'),
+                      special[(years >= first_year) & (years <= last_year)])
+    return days[np.is_busday(days)]
+
+
+def build_calendar(exchange, first_year=FIRST_YEAR, last_year=LAST_YEAR, calendar_dir=CALENDAR_DIR):
+    """
+    离线生成交易所的休市日文件
+
+    NYSE 按内置规则生成；其他交易所（如 'SSE'）需要安装 pandas_market_calendars，
+    只在生成缓存时调用一次，之后检查日期时不再需要它。
+
+    Returns:
+        np.ndarray: 休市日（datetime64[D]）
+    """
+    if exchange == 'NYSE':
+        holidays = nyse_holidays(first_year, last_year)
+    else:
+        import pandas_market_calendars as mcal
+
+        start, end = f'{first_year}-01-01', f'{last_year}-12-31'
+        sessions = mcal.get_calendar(exchange).valid_days(start_date=start, end_date=end)
+        sessions = np.asarray(sessions.tz_localize(None).values, dtype='datetime64[D]')
+        weekdays = np.arange(np.datetime64(start), np.datetime64(end) + 1, dtype='datetime64[D]')
+        weekdays = weekdays[np.is_busday(weekdays)]
+        holidays = np.setdiff1d(weekdays, sessions)
+
+    os.makedirs(calendar_dir, exist_ok=True)
+    np.save(os.path.join(calendar_dir, exchange + '.npy'), holidays)
+    get_calendar.cache_clear()
+    return holidays
+
+
+@functools.lru_cache(maxsize=None)
+def get_calendar(exchange='NYSE'):
+    """
+    读取交易所日历，返回 numpy 工作日日历（周一到周五，去掉休市日）
+
+    优先读取离线生成的缓存文件；NYSE 没有缓存时按规则生成并写入缓存。
+    """
+    path = os.path.join(CALENDAR_DIR, exchange + '.npy')
+    if os.path.exists(path):
+        holidays = np.load(path)
+    elif exchange == 'NYSE':
+        try:
+            holidays = build_calendar(exchange)
+        except OSError:
+            holidays = nyse_holidays()
+    else:
+        raise ValueError(f'没有找到 {exchange} 的交易日历，请先运行 build_calendar({exchange!r})')
+    return np.busdaycalendar(holidays=holidays)
+
+
+def find_missing_sessions(dates, exchange='NYSE'):
+    """
+    对照交易所日历找出缺失的交易日
+
+    相邻两个数据日期之间缺失的交易日数由 np.busday_count 一次性算出，
+    周末和休市日不计入；只有真正缺失交易日的区间才会展开具体日期。
+
+    Args:
+        dates: 数据中的日期
+        exchange (str): 交易所日历名称，默认为'NYSE'
+
+    Returns:
+        dict: gaps（断层列表）、missing_dates（全部缺失交易日）、
+            non_session_dates（落在休市日的数据日期）、duplicate_dates（重复日期）
+    """
+    calendar = get_calendar(exchange)
+    days = np.sort(np.asarray(dates, dtype='datetime64[D]'))
+    diffs = np.diff(days)
+
+    duplicate_dates = days[1:][diffs == np.timedelta64(0, 'D')]
+    non_session_dates = np.unique(days[~np.is_busday(days, busdaycal=calendar)])
+
+    # 相邻日期之间（不含两端）的交易日数
+    missing_counts = np.busday_count(days[:-1] + 1, days[1:], busdaycal=calendar)
+    missing_counts[diffs <= np.timedelta64(1, 'D')] = 0
+
+    gaps = []
+    missing_dates = []
+    for i in np.flatnonzero(missing_counts > 0):
+        span = np.arange(days[i] + 1, days[i + 1], dtype='datetime64[D]')
+        missing = span[np.is_busday(span, busdaycal=calendar)].tolist()
+        gaps.append({
+            'gap_start': days[i].item(),
+            'gap_end': days[i + 1].item(),
+            'missing_days': int(missing_counts[i]),
+            'missing_dates': missing,
+        })
+        missing_dates.extend(missing)
+
+    return {
+        'gaps': gaps,
+        'missing_dates': missing_dates,
+        'non_session_dates': non_session_dates.tolist(),
+        'duplicate_dates': duplicate_dates.tolist(),
+    }
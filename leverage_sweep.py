@@ -0,0 +1,37 @@
+import numpy as np
+
+from fincurve import leverage_sweep
+from fincurve.data import read_prices
+
+
+def main():
+    # 读取数据（日期已转换为datetime格式并按升序排列）
+    df = read_prices('QQQ_daily.csv')
+
+    # 网格参数
+    leverages = np.round(np.arange(1.0, 4.01, 0.1), 2)  # 1.0 到 4.0 倍，步长0.1
+    amounts = [1000.0]                                 # 每月投资金额
+    days_of_month = [1, 10, 26]                        # 每月定投日
+    daily_drag = 0.0                                   # 每日费用/融资成本
+
+    # 所有情景一次性以矩阵形式计算
+    result = leverage_sweep(df['涨跌幅(%)'], df['date'], df.loc[0, 'close'],
+                            leverages, amounts, days_of_month, daily_drag)
+    summary = result['summary']
+
+    # 保存汇总表
+    summary.to_csv('QQQ_leverage_sweep.csv', index=False)
+
+    print("处理完成！已生成 QQQ_leverage_sweep.csv 文件")
+    print(f"\n数据时间范围: {df['date'].min().strftime('%Y-%m-%d')} 至 {df['date'].max().strftime('%Y-%m-%d')}")
+    print(f"情景数量: {len(summary)} 个")
+
+    print(f"\n按最终价值排序的前10个情景:")
+    print(summary.sort_values('final_value', ascending=False).head(10).to_string(index=False))
+
+    print(f"\n按最大回撤排序的前10个情景（回撤最小）:")
+    print(summary.sort_values('max_drawdown_pct', ascending=False).head(10).to_string(index=False))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+import sys
+import time
+
+import numpy as np
+
+from fincurve import bootstrap_dca
+from fincurve.data import read_prices, returns_pct
+from fincurve.quality import repair_prices
+
+
+def main():
+    # 用法: python montecarlo_dca.py [路径条数] [随机种子]
+    n_paths = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    seed = int(sys.argv[2]) if len(sys.argv) > 2 else 0
+
+    # 读取数据（日期已转换为datetime格式并按升序排列）
+    # 抽样前按收盘价重新计算涨跌幅，避免文件中残留的异常值被反复抽到
+    df, report = repair_prices(read_prices('QQQ_daily.csv'))
+    if report['extreme_returns']:
+        print(f"异常涨跌幅: {', '.join(report['extreme_returns'])}")
+
+    # 模拟参数
+    leverages = [1.0, 3.0]   # 对比的杠杆倍数
+    daily_drag = 0.0         # 每日费用/融资成本
+    mean_block = 20          # 平均块长（交易日）
+
+    start = time.perf_counter()
+    result = bootstrap_dca(returns_pct(df), df['date'], n_paths, leverages,
+                           daily_drag=daily_drag, mean_block=mean_block, seed=seed)
+    elapsed = time.perf_counter() - start
+
+    summary = result['summary']
+    final_value = result['final_value']
+    investment_total = result['investment_total']
+
+    print(f"数据时间范围: {df['date'].min().strftime('%Y-%m-%d')} 至 {df['date'].max().strftime('%Y-%m-%d')}")
+    print(f"合成路径: {n_paths:,} 条，平均块长 {mean_block} 个交易日，随机种子 {seed}，用时 {elapsed:.2f} 秒")
+    print(f"每条路径累计投资总额: ${investment_total:,.2f}")
+
+    print(f"\n最终价值、收益倍数和最大回撤的分位数:")
+    print(summary.to_string(index=False, float_format=lambda v: f'{v:,.2f}'))
+
+    # 逐条路径对比3倍杠杆与1倍的收益
+    gain = final_value - investment_total
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ratio = gain[:, 1] / gain[:, 0]
+    print(f"\n【3倍杠杆 vs 原始QQQ】")
+    print(f"3倍杠杆最终价值高于原始QQQ的概率: {np.mean(final_value[:, 1] > final_value[:, 0]) * 100:.1f}%")
+    print(f"3倍杠杆亏损（最终价值低于投资总额）的概率: {np.mean(final_value[:, 1] < investment_total) * 100:.1f}%")
+    both_gain = gain[:, 0] > 0
+    print(f"两者都盈利时，3倍杠杆收益是QQQ收益的倍数（5% / 50% / 95% 分位）: "
+          f"{' / '.join(f'{v:.2f}x' for v in np.percentile(ratio[both_gain], [5, 50, 95]))}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,51 @@
+import pandas as pd
+
+from fincurve import portfolio_dca, repair_prices
+from fincurve.data import read_prices
+
+
+def main():
+    # 读取数据（日期已转换为datetime格式并按升序排列）
+    # TQQQ 文件 2014-04-16 之前的价格有误（出现负价格），先截掉
+    tqqq, _ = repair_prices(read_prices('TQQQ_daily.csv'), start_date='2014-04-16')
+    assets = {
+        'QQQ': read_prices('QQQ_daily.csv'),
+        'TQQQ': tqqq,
+        '159941': read_prices('159941_monthly.csv'),  # 月线数据
+    }
+
+    # 定投参数
+    weights = {'QQQ': 0.5, 'TQQQ': 0.3, '159941': 0.2}
+    monthly_investment = 1000.0
+    target_day = 26
+
+    # 所有资产对齐到同一日期索引后一次性计算
+    # 注意：不做汇率换算，159941 的人民币价格按固定汇率看待
+    result = portfolio_dca(assets, weights, monthly_investment, target_day)
+
+    dates = pd.to_datetime(result['dates'])
+    summary = pd.DataFrame({
+        'asset': result['assets'],
+        'weight': [weights[name] for name in result['assets']],
+        'first_date': [dates[observed.argmax()].strftime('%Y-%m-%d') for observed in result['observed']],
+        'investment_total': result['investment'][:, -1],
+        'final_value': result['value'][:, -1],
+    })
+    summary['return_pct'] = (summary['final_value'] / summary['investment_total'] - 1) * 100
+
+    investment_total = result['investment_total'][-1]
+    portfolio_value = result['portfolio_value'][-1]
+
+    print(f"合并日期索引: {dates[0].strftime('%Y-%m-%d')} 至 {dates[-1].strftime('%Y-%m-%d')}，共 {len(dates)} 天")
+    print(f"\n各资产定投表现:")
+    print(summary.to_string(index=False, float_format=lambda v: f'{v:,.2f}'))
+
+    print(f"\n【组合定投表现】")
+    print(f"累计投资总额: ${investment_total:,.2f}")
+    print(f"最终投资组合价值: ${portfolio_value:,.2f}")
+    print(f"总收益: ${portfolio_value - investment_total:,.2f}")
+    print(f"收益率: {(portfolio_value / investment_total - 1) * 100:.2f}%")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,34 @@
+import os
+import sys
+import time
+
+from fincurve.data import read_prices
+from fincurve.render import ReportRenderer
+from fincurve.runner import expand_paths
+
+
+def main():
+    # 用法: python render_reports.py ["*_daily_with_3x_leverage.csv"] [输出目录]
+    # 无界面批量出图：Agg 后端，不弹出窗口，所有标的复用同一组 figure/axes
+    pattern = sys.argv[1] if len(sys.argv) > 1 else '*_daily_with_3x_leverage.csv'
+    output_dir = sys.argv[2] if len(sys.argv) > 2 else 'reports'
+    os.makedirs(output_dir, exist_ok=True)
+
+    renderer = ReportRenderer(dpi=100)
+    start = time.perf_counter()
+    files = expand_paths(pattern)
+    for file_path in files:
+        # 文件名的第一段作为标的名称，例如 QQQ_daily_with_3x_leverage.csv -> QQQ
+        name = os.path.basename(file_path).split('_')[0]
+        df = read_prices(file_path)
+        renderer.render(df, name,
+                        os.path.join(output_dir, f'{name}_vs_3x_comprehensive_analysis.png'),
+                        os.path.join(output_dir, f'{name}_vs_3x_normalized_comparison.png'))
+        print(f"已生成 {name} 的图表")
+    renderer.close()
+
+    print(f"\n共 {len(files)} 个标的，用时 {time.perf_counter() - start:.2f} 秒，图表保存在 {output_dir}/")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,45 @@
+from fincurve import leveraged_close
+from fincurve.data import read_prices, returns_pct
+from fincurve.rolling import rolling_dca
+
+
+def main():
+    # 读取数据（日期已转换为datetime格式并按升序排列）
+    df = read_prices('QQQ_daily.csv')
+
+    # 定投参数
+    monthly_investment = 1000.0
+    target_day = 26
+    leverage = 3.0
+
+    # 3倍杠杆价格路径只计算一次，所有起始月份和持有期共用
+    x3_close = leveraged_close(returns_pct(df), df.loc[0, 'close'], leverage)
+
+    qqq = rolling_dca(df['close'], df['date'], amount=monthly_investment, day_of_month=target_day)
+    x3 = rolling_dca(x3_close, df['date'], amount=monthly_investment, day_of_month=target_day)
+
+    # 保存 起始月份 × 持有期 矩阵，可直接用于热力图
+    qqq['multiple'].to_csv('QQQ_rolling_dca_multiple.csv')
+    x3['multiple'].to_csv('QQQ_3x_rolling_dca_multiple.csv')
+    x3['max_drawdown_pct'].to_csv('QQQ_3x_rolling_dca_max_drawdown.csv')
+
+    print("处理完成！已生成以下文件:")
+    print("- QQQ_rolling_dca_multiple.csv (QQQ 收益倍数矩阵)")
+    print("- QQQ_3x_rolling_dca_multiple.csv (3倍杠杆收益倍数矩阵)")
+    print("- QQQ_3x_rolling_dca_max_drawdown.csv (3倍杠杆最大回撤矩阵)")
+
+    # 不同持有年限下，所有起始月份的收益倍数分布
+    print(f"\n各持有期收益倍数分布（所有起始月份）:")
+    for years in [1, 3, 5, 10]:
+        months = years * 12
+        if months not in qqq['multiple'].columns:
+            continue
+        qqq_multiple = qqq['multiple'][months].dropna()
+        x3_multiple = x3['multiple'][months].dropna()
+        print(f"持有{years}年: QQQ 中位数 {qqq_multiple.median():.2f}x (最差 {qqq_multiple.min():.2f}x), "
+              f"3倍杠杆 中位数 {x3_multiple.median():.2f}x (最差 {x3_multiple.min():.2f}x), "
+              f"3倍杠杆跑赢比例 {(x3_multiple > qqq_multiple).mean() * 100:.1f}%")
+
+
+if __name__ == '__main__':
+    main()
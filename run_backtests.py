@@ -0,0 +1,37 @@
+import sys
+
+import pandas as pd
+
+from fincurve.data import read_prices
+from fincurve.runner import expand_paths, run_backtests
+
+
+def main():
+    # 用法: python run_backtests.py "data/*.csv" [进程数]
+    pattern = sys.argv[1] if len(sys.argv) > 1 else 'QQQ_daily.csv'
+    processes = int(sys.argv[2]) if len(sys.argv) > 2 else None
+
+    # 回测参数
+    leverage = 3.0
+    monthly_investment = 1000.0
+    target_day = 26
+
+    # 含非正收盘价的文件（如未修复的 TQQQ_daily.csv）需要先用 repair_prices 修复，这里跳过
+    files = []
+    for path in expand_paths(pattern):
+        if (read_prices(path)['close'] > 0).all():
+            files.append(path)
+        else:
+            print(f"跳过 {path}: 含有非正或缺失的收盘价，请先用 fincurve.quality.repair_prices 修复")
+
+    results = run_backtests(files, processes=processes, leverage=leverage,
+                            amount=monthly_investment, day_of_month=target_day)
+
+    summary = pd.DataFrame([dict(file=path, **result['summary']) for path, result in results.items()])
+
+    print(f"回测文件数: {len(summary)} 个")
+    print(summary.to_string(index=False))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,139 @@
+"""
+QQQ 分析流水线：只重跑过期的阶段
+
+阶段（箭头为数据流向）:
+    fetch      -> QQQ_daily_raw.csv, QQQ_daily.csv          （下载并修复，需要网络）
+    investment -> QQQ_daily_with_investment.csv             （add_investment_column.py）
+    leverage   -> QQQ_daily_with_3x_leverage.csv            （add_3x_leverage.py）
+    chart      -> QQQ_vs_3x_*.png                           （plot_comprehensive_chart.py）
+    sweep      -> QQQ_leverage_sweep.csv                    （leverage_sweep.py）
+    rolling    -> QQQ_*rolling_dca_*.csv                    （rolling_dca_analysis.py）
+
+fetch 只有在 QQQ_daily.csv 不存在或用 --force fetch 时才会运行；
+其余阶段在输入内容、参数或代码变化时重跑。sweep / rolling 与 investment
+链相互独立，会并行执行。
+
+用法:
+    python run_pipeline.py                    # 运行所有过期阶段
+    python run_pipeline.py chart              # 只更新图表及其上游
+    python run_pipeline.py --dry-run          # 只列出会运行的阶段
+    python run_pipeline.py --force fetch      # 重新下载数据并更新所有下游
+    python run_pipeline.py --profile          # 各阶段耗时/吞吐量/内存写入 fincurve_profile.json
+"""
+import argparse
+import sys
+
+import numpy as np
+
+from fincurve import profiling
+from fincurve.analysis import INVESTMENT_OUTPUT_COLUMNS, LEVERAGE_OUTPUT_COLUMNS
+from fincurve.pipeline import Pipeline, Stage
+
+# 定投和杠杆参数
+PARAMS = {'leverage': 3.0, 'amount': 1000.0, 'day_of_month': 26}
+
+
+def fetch(data, symbol, start_date):
+    from fincurve.fetch import AkshareUSDailySource, BulkFetcher, FetchCache
+    from fincurve.quality import repair_prices
+
+    df = BulkFetcher(AkshareUSDailySource(), FetchCache()).fetch(symbol, adjust='')
+    df['涨跌幅(%)'] = df['close'].pct_change() * 100
+    df.to_csv(f'{symbol}_daily_raw.csv', index=False, encoding='utf-8-sig')
+    clean, _ = repair_prices(df, start_date=start_date)
+    return {f'{symbol}_daily.csv': clean}
+
+
+def investment(data, amount, day_of_month):
+    from fincurve.analysis import add_investment_columns
+
+    df = add_investment_columns(data['QQQ_daily.csv'], amount, day_of_month)
+    return {'QQQ_daily_with_investment.csv': df[INVESTMENT_OUTPUT_COLUMNS]}
+
+
+def leverage(data, leverage, amount, day_of_month):
+    from fincurve.analysis import add_leverage_columns
+
+    df = add_leverage_columns(data['QQQ_daily_with_investment.csv'], leverage, amount, day_of_month)
+    return {'QQQ_daily_with_3x_leverage.csv': df[LEVERAGE_OUTPUT_COLUMNS]}
+
+
+def chart(data):
+    from fincurve.plotting import plot_comparison
+
+    plot_comparison(data['QQQ_daily_with_3x_leverage.csv'], 'QQQ', 'QQQ_vs_3x_comprehensive_analysis.png',
+                    'QQQ_vs_3x_normalized_comparison.png', dpi=300, headless=True)
+
+
+def sweep(data, leverages, days_of_month):
+    from fincurve.sweep import leverage_sweep
+
+    df = data['QQQ_daily.csv']
+    result = leverage_sweep(df['涨跌幅(%)'], df['date'], df.loc[0, 'close'],
+                            np.asarray(leverages), [1000.0], days_of_month)
+    return {'QQQ_leverage_sweep.csv': result['summary']}
+
+
+def rolling(data, leverage, amount, day_of_month):
+    from fincurve.data import returns_pct
+    from fincurve.leverage import leveraged_close
+    from fincurve.rolling import rolling_dca
+
+    df = data['QQQ_daily.csv']
+    x3_close = leveraged_close(returns_pct(df), df.loc[0, 'close'], leverage)
+    qqq = rolling_dca(df['close'], df['date'], amount=amount, day_of_month=day_of_month)
+    x3 = rolling_dca(x3_close, df['date'], amount=amount, day_of_month=day_of_month)
+    return {
+        'QQQ_rolling_dca_multiple.csv': qqq['multiple'].reset_index(),
+        'QQQ_3x_rolling_dca_multiple.csv': x3['multiple'].reset_index(),
+        'QQQ_3x_rolling_dca_max_drawdown.csv': x3['max_drawdown_pct'].reset_index(),
+    }
+
+
+def build_pipeline(workers=4):
+    stages = [
+        Stage('fetch', fetch, outputs=['QQQ_daily_raw.csv', 'QQQ_daily.csv'],
+              params={'symbol': 'QQQ', 'start_date': '2011-04-26'}),
+        Stage('investment', investment, inputs=['QQQ_daily.csv'],
+              outputs=['QQQ_daily_with_investment.csv'],
+              params={'amount': PARAMS['amount'], 'day_of_month': PARAMS['day_of_month']}),
+        Stage('leverage', leverage, inputs=['QQQ_daily_with_investment.csv'],
+              outputs=['QQQ_daily_with_3x_leverage.csv'], params=PARAMS),
+        Stage('chart', chart, inputs=['QQQ_daily_with_3x_leverage.csv'],
+              outputs=['QQQ_vs_3x_comprehensive_analysis.png', 'QQQ_vs_3x_normalized_comparison.png']),
+        Stage('sweep', sweep, inputs=['QQQ_daily.csv'], outputs=['QQQ_leverage_sweep.csv'],
+              params={'leverages': np.round(np.arange(1.0, 4.01, 0.1), 2).tolist(),
+                      'days_of_month': [1, 10, 26]}),
+        Stage('rolling', rolling, inputs=['QQQ_daily.csv'],
+              outputs=['QQQ_rolling_dca_multiple.csv', 'QQQ_3x_rolling_dca_multiple.csv',
+                       'QQQ_3x_rolling_dca_max_drawdown.csv'], params=PARAMS),
+    ]
+    return Pipeline(stages, max_workers=workers)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='只重跑过期阶段的分析流水线')
+    parser.add_argument('targets', nargs='*', help='只运行这些阶段及其上游，默认全部')
+    parser.add_argument('--force', nargs='+', default=[], help='强制运行的阶段')
+    parser.add_argument('--dry-run', action='store_true', help='只列出会运行的阶段')
+    parser.add_argument('--workers', type=int, default=4, help='并行线程数')
+    parser.add_argument('--profile', nargs='?', const=profiling.DEFAULT_REPORT_PATH,
+                        help='写出性能报告（JSON），默认 fincurve_profile.json')
+    parser.add_argument('--cprofile', nargs='?', const='auto',
+                        help='同时对最慢的阶段（或指定阶段）做 cProfile，结果保存为 .prof')
+    args = parser.parse_args()
+
+    if args.profile or args.cprofile:
+        profiling.enable(args.cprofile)
+    pipeline = build_pipeline(args.workers)
+    results = pipeline.run(args.targets or None, args.force, args.dry_run)
+    if args.profile or args.cprofile:
+        path = args.profile or profiling.DEFAULT_REPORT_PATH
+        profiling.write_report(path)
+        print(f"性能报告已保存到 {path}")
+    if any(result['status'] in ('failed', 'blocked') for result in results.values()):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+import pandas as pd
+
+from fincurve import TradingDayIndex, leveraged_close, simulate_dca, value_averaging
+from fincurve.data import read_prices, returns_pct
+
+
+def main():
+    # 读取数据（日期已转换为datetime格式并按升序排列）
+    df = read_prices('QQQ_daily.csv')
+    prices = {
+        'QQQ': df['close'].to_numpy(),
+        '3x': leveraged_close(returns_pct(df), df.loc[0, 'close'], 3.0),
+    }
+
+    # 交易日索引只构建一次，所有定投日规则都在它上面查表
+    index = TradingDayIndex(df['date'])
+    monthly = index.monthly(26)
+
+    # 定投日规则 -> (买入日行号, 每次投入金额)
+    # 每期金额按每月1000美元折算，使各规则的投入节奏可比
+    schedules = {
+        '每月26号': (monthly, 1000.0),
+        '每月第一个交易日': (index.trading_day_of_month(0), 1000.0),
+        '每月第三个星期五': (index.nth_weekday(3, 4), 1000.0),
+        '每周一': (index.weekly(0), 1000.0 * 12 / 52),
+        '每两周周一': (index.biweekly(0), 1000.0 * 12 / 26),
+    }
+
+    rows = []
+    for asset, close in prices.items():
+        for name, (buy_index, amount) in schedules.items():
+            result = simulate_dca(close, df['date'], amount, buy_index=buy_index)
+            rows.append({'asset': asset, 'schedule': name, 'buys': len(buy_index),
+                         'investment_total': result['investment_total'][-1],
+                         'final_value': result['portfolio_value'][-1]})
+
+        # 价值平均法：目标价值每月增加1000美元，只买不卖
+        amounts = value_averaging(close, monthly, 1000.0)
+        result = simulate_dca(close, df['date'], amounts, buy_index=monthly)
+        rows.append({'asset': asset, 'schedule': '价值平均（每月26号）', 'buys': int((amounts > 0).sum()),
+                     'investment_total': result['investment_total'][-1],
+                     'final_value': result['portfolio_value'][-1]})
+
+    table = pd.DataFrame(rows)
+    table['multiple'] = table['final_value'] / table['investment_total']
+
+    print(f"数据时间范围: {df['date'].min().strftime('%Y-%m-%d')} 至 {df['date'].max().strftime('%Y-%m-%d')}")
+    print(table.to_string(index=False, float_format=lambda v: f'{v:,.2f}'))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,31 @@
+"""
+本地回测查询服务：行情只读取一次，之后每个查询毫秒级返回 JSON
+
+用法:
+    python serve_backtests.py                       # 读取当前目录的 *_daily.csv，监听 127.0.0.1:8765
+    python serve_backtests.py --data-dir data --port 9000 --workers 8
+
+查询示例:
+    curl "http://127.0.0.1:8765/tickers"
+    curl "http://127.0.0.1:8765/backtest?ticker=QQQ&leverage=3&amount=1000&day_of_month=26"
+    curl "http://127.0.0.1:8765/backtest?ticker=QQQ&schedule=weekly&weekday=0&amount=230&start=2015-01-01"
+    curl -X POST http://127.0.0.1:8765/backtest -d '{"leverage": 2, "schedule": "nth_weekday", "n": 3}'
+"""
+import argparse
+
+from fincurve.service import DEFAULT_HOST, DEFAULT_PORT, serve
+
+
+def main():
+    parser = argparse.ArgumentParser(description='本地回测查询服务')
+    parser.add_argument('--data-dir', default='.', help='行情 CSV 所在目录（读取 *_daily.csv）')
+    parser.add_argument('--host', default=DEFAULT_HOST, help='监听地址')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help='监听端口')
+    parser.add_argument('--workers', type=int, default=4, help='回测线程数')
+    args = parser.parse_args()
+
+    serve(args.data_dir, args.host, args.port, args.workers)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+import pandas as pd
+
+from fincurve import leveraged_close, run_strategy
+from fincurve.data import read_prices, returns_pct
+from fincurve.stats import StreamingStats
+from fincurve.strategy import NUMBA_AVAILABLE
+
+
+def main():
+    # 读取数据（日期已转换为datetime格式并按升序排列）
+    df = read_prices('QQQ_daily.csv')
+
+    # 3倍杠杆收盘价
+    leverage = 3.0
+    daily_drag = 0.0
+    leveraged = leveraged_close(returns_pct(df), df.loc[0, 'close'], leverage, daily_drag)
+
+    # 每个策略的参数，未列出的参数使用 run_strategy 的默认值
+    strategies = {
+        '全部QQQ': {'target_weight': 0.0},
+        '全部3倍杠杆': {'target_weight': 1.0},
+        '50/50 每月再平衡': {'target_weight': 0.5},
+        '50/50 每季度再平衡': {'target_weight': 0.5, 'rebalance_months': 3},
+        '3倍杠杆 回撤30%降杠杆': {'target_weight': 1.0, 'stop_drawdown': 0.3},
+        '3倍杠杆 下跌20%加仓': {'target_weight': 1.0, 'dip_drawdown': 0.2, 'dip_amount': 5000.0},
+        '50/50 降杠杆+加仓': {'target_weight': 0.5, 'stop_drawdown': 0.3,
+                            'dip_drawdown': 0.2, 'dip_amount': 5000.0},
+    }
+
+    rows = []
+    for name, params in strategies.items():
+        result = run_strategy(df['close'], leveraged, df['date'], **params)
+        stats = StreamingStats()
+        stats.update_many(result['portfolio_value'], df['date'], flows=result['monthly_investment'])
+        summary = stats.result(base=result['investment_total'][-1])
+        rows.append({
+            'strategy': name,
+            'investment_total': result['investment_total'][-1],
+            'final_value': result['portfolio_value'][-1],
+            'return_pct': (result['portfolio_value'][-1] / result['investment_total'][-1] - 1) * 100,
+            'max_drawdown_pct': summary['max_drawdown_pct'],
+            'defensive_days': int(result['defensive'].sum()),
+        })
+
+    table = pd.DataFrame(rows)
+    print(f"数据时间范围: {df['date'].min().strftime('%Y-%m-%d')} 至 {df['date'].max().strftime('%Y-%m-%d')}")
+    print(f"策略内核: {'numba 编译' if NUMBA_AVAILABLE else '纯 Python'}")
+    print(table.to_string(index=False, float_format=lambda v: f'{v:,.2f}'))
+
+
+if __name__ == '__main__':
+    main()
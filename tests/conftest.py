@@ -0,0 +1,5 @@
+import os
+import sys
+
+# 从仓库根目录之外运行 pytest 时也能导入 fincurve 包
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
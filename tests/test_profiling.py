@@ -0,0 +1,56 @@
+import threading
+import time
+
+import pytest
+
+from fincurve import profiling
+
+
+@pytest.fixture
+def cprofile_auto():
+    profiling.reset()
+    profiling.enable(cprofile='auto')
+    yield
+    profiling.disable()
+    profiling.reset()
+
+
+def test_concurrent_stages_profile_one_at_a_time(cprofile_auto):
+    barrier = threading.Barrier(2)
+    errors = []
+
+    def run(name):
+        try:
+            with profiling.stage(name):
+                barrier.wait(timeout=5)
+                time.sleep(0.05)
+                barrier.wait(timeout=5)
+        except Exception as exc:  # noqa: BLE001
+            errors.append(exc)
+
+    threads = [threading.Thread(target=run, args=(name,)) for name in ('stage.a', 'stage.b')]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    stages = {item['name']: item for item in profiling.report()['stages']}
+    assert stages['stage.a']['calls'] == stages['stage.b']['calls'] == 1
+    # 两个阶段同时运行，只有一个做了 cProfile
+    assert sum(len(profiles) for profiles in profiling._profiles.values()) == 1
+    assert not profiling._profile_lock.locked()
+
+
+def test_profiler_busy_falls_back_to_timing(cprofile_auto, monkeypatch):
+    class BusyProfile:
+        def enable(self):
+            raise ValueError('Another profiling tool is already active')
+
+    monkeypatch.setattr(profiling.cProfile, 'Profile', BusyProfile)
+    with profiling.stage('stage.busy'):
+        assert profiling._local.depth == 1
+    assert profiling._local.depth == 0
+    assert profiling._profiles == {}
+    assert not profiling._profile_lock.locked()
+    assert profiling.report()['stages'][0]['calls'] == 1
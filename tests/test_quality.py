@@ -0,0 +1,43 @@
+import numpy as np
+import pandas as pd
+
+from fincurve.quality import repair_prices, validate_prices
+
+
+def _prices(n=10):
+    close = 100.0 + np.arange(n)
+    return pd.DataFrame({
+        'date': pd.bdate_range('2020-01-01', periods=n).strftime('%Y-%m-%d'),
+        'open': close, 'high': close + 1, 'low': close - 1, 'close': close,
+    })
+
+
+def test_nan_is_not_nonpositive():
+    df = _prices()
+    df.loc[6, 'close'] = np.nan
+    issues = validate_prices(df)
+    assert not issues['nonpositive'].any()
+    assert issues['missing'].tolist() == [i == 6 for i in range(10)]
+
+
+def test_repair_drops_only_the_nan_row():
+    df = _prices()
+    df.loc[6, 'close'] = np.nan
+    clean, report = repair_prices(df)
+    assert report['missing'] == 1
+    assert report['trimmed'] == 0
+    assert len(clean) == 9
+    assert not clean['close'].isna().any()
+    # 删除的行前后按相邻的收盘价重新计算涨跌幅
+    assert np.isclose(clean['涨跌幅(%)'].iloc[6], (107 / 105 - 1) * 100)
+
+
+def test_repair_trims_before_last_nonpositive_row():
+    df = _prices()
+    df.loc[3, 'low'] = -1.0
+    df.loc[7, 'open'] = np.nan
+    clean, report = repair_prices(df)
+    assert report['nonpositive'] == 1
+    assert report['trimmed'] == 4
+    assert clean['date'].iloc[0] == pd.Timestamp(df['date'].iloc[4])
+    assert len(clean) == 5
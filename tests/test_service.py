@@ -0,0 +1,48 @@
+import asyncio
+import json
+import os
+
+import pytest
+
+from fincurve.service import BacktestService, load_series
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture(scope='module')
+def service():
+    service = BacktestService(load_series(ROOT))
+    yield service
+    service.close()
+
+
+async def _get(service, target):
+    server = await service.start('127.0.0.1', 0)
+    port = server.sockets[0].getsockname()[1]
+    try:
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        writer.write(f'GET {target} HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\n\r\n'.encode())
+        await writer.drain()
+        response = await reader.read()
+        writer.close()
+    finally:
+        server.close()
+        await server.wait_closed()
+    head, _, body = response.partition(b'\r\n\r\n')
+    return int(head.split()[1]), json.loads(body)
+
+
+def test_tqqq_is_repaired_on_load(service):
+    days = service.series['TQQQ']['days']
+    assert str(days[0]) >= '2014-04-16'
+    assert (service.series['TQQQ']['close'] > 0).all()
+
+
+def test_backtest_tqqq(service):
+    status, result = asyncio.run(_get(service, '/backtest?ticker=TQQQ&leverage=1'))
+    assert status == 200
+    assert result['start'] >= '2014-04-16'
+    for key in ('base', 'leveraged'):
+        summary = result['summary'][key]
+        assert summary['final_value'] > 0
+        assert -100 <= summary['max_drawdown_pct'] <= 0
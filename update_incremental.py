@@ -0,0 +1,36 @@
+import sys
+
+from fincurve.incremental import update_leverage_csv
+
+
+def main():
+    # 用法: python update_incremental.py [--full]
+    # 每日刷新 QQQ_daily.csv 后运行，只处理新增的交易日并追加到输出文件
+    full = '--full' in sys.argv
+
+    # 定投和杠杆参数
+    leverage = 3.0
+    monthly_investment = 1000.0
+    target_day = 26
+
+    result = update_leverage_csv('QQQ_daily.csv', 'QQQ_daily_with_3x_leverage.csv',
+                                 leverage=leverage, amount=monthly_investment,
+                                 day_of_month=target_day, full=full)
+    state = result['state']
+
+    if result['rebuilt']:
+        print("已全量重建 QQQ_daily_with_3x_leverage.csv")
+    elif result['new_rows'] == 0:
+        print("没有新的交易日，无需更新")
+    else:
+        print(f"已追加 {result['new_rows']} 个交易日到 QQQ_daily_with_3x_leverage.csv")
+
+    print(f"\n最后处理日期: {state['last_date']}")
+    print(f"本月是否已定投: {'是' if state['last']['bought_this_month'] else '否'}")
+    print(f"累计投资总额: ${state['last']['cumulative_investment']:,.2f}")
+    print(f"累计持有股数: {state['last']['cumulative_shares']:.4f}")
+    print(f"最新3倍杠杆收盘价: {state['last']['leveraged_close']:.4f}")
+
+
+if __name__ == '__main__':
+    main()